@@ -0,0 +1,320 @@
+"""API JSON de precificação (asyncio, sem dependências externas).
+
+Expõe as mesmas regras de pricing.py e o mesmo documento TXT do app para
+integrações (CRM). Os pedidos seguem o formato do orcamentos_lote.py
+(JSONL): campos do cabeçalho, despesas/impostos/margem e a lista "itens".
+
+Endpoints:
+    GET  /saude        -> {"status": "ok", "catalogo": versão}
+    POST /precificar   -> itens precificados e resumo financeiro
+    POST /documento    -> o mesmo resumo e o TXT do orçamento
+
+Os pedidos passam pela mesma validação do orcamentos_lote.py: campo com
+tipo errado, quantidade abaixo do mínimo do app ou despesas/impostos/
+margem negativos recebem 400 com o nome do campo.
+
+Pedidos que chegam juntos são agrupados em micro-lotes: a precificação de
+um lote usa um único snapshot do catálogo, e cada lote de documentos vira
+uma só tarefa no pool de processos. O pool tem tamanho fixo e um número
+limitado de lotes em andamento; com a fila cheia a API responde 503.
+
+Uso:
+    python api.py --porta 8765 -j 2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import orcamentos_lote
+from catalogo import catalogo_atual
+
+_LOGGER = logging.getLogger(__name__)
+
+PORTA_PADRAO = int(os.environ.get("TANKAR_API_PORTA", "8765"))
+# Pedidos por micro-lote e espera (s) para juntar pedidos concorrentes
+LOTE_MAX = 64
+ESPERA_LOTE = float(os.environ.get("TANKAR_API_ESPERA_MS", "0")) / 1000
+# Pedidos aguardando lote; acima disso, 503
+FILA_MAX = 2048
+# Lotes de documentos em andamento por processo do pool
+LOTES_POR_WORKER = 2
+CORPO_MAX = 1 << 20
+
+_STATUS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+class ErroHTTP(Exception):
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+    def __reduce__(self):
+        # Volta dos processos do pool com o status
+        return ErroHTTP, (self.status, str(self))
+
+# =========================
+# Precificação e documento
+# =========================
+def _financeiro_json(fin: dict) -> dict:
+    return {k: v for k, v in fin.items() if k != "centavos"}
+
+def _resumo(itens, fin: dict, catalogo) -> dict:
+    return {
+        "itens": [
+            {"servico": it["servico"], "descricao": it["descricao"], "detalhes": it["detalhes"], "subtotal": it["subtotal"]}
+            for it in itens
+        ],
+        "financeiro": _financeiro_json(fin),
+        "catalogo": catalogo.versao,
+    }
+
+def _erro_pedido(e: Exception) -> ErroHTTP:
+    if isinstance(e, KeyError):
+        return ErroHTTP(400, f"Pedido inválido: valor desconhecido {e}")
+    if not isinstance(e, (ValueError, TypeError)):
+        _LOGGER.warning("Pedido recusado por %s: %s", type(e).__name__, e)
+    return ErroHTTP(400, f"Pedido inválido: {e}")
+
+def _validar(pedido) -> dict:
+    # Mesmas regras do orcamentos_lote.py (tipos e mínimos do cabeçalho); os
+    # itens são conferidos ao precificar, também pelo código compartilhado
+    orcamentos_lote.validar_pedido(pedido)
+    pedido.setdefault("orcamento", "api")
+    return pedido
+
+def _precificar_lote(pedidos) -> list:
+    # Um snapshot do catálogo para o lote; erro em um pedido (qualquer
+    # exceção) vira 400 só dele e não derruba os outros
+    cat = catalogo_atual()
+    resultados = []
+    for pedido in pedidos:
+        try:
+            itens, fin = orcamentos_lote.precificar_pedido(_validar(pedido), cat)
+            resultados.append(_resumo(itens, fin, cat))
+        except Exception as e:
+            resultados.append(_erro_pedido(e))
+    return resultados
+
+def _documentos_lote(pedidos, agora: datetime) -> list:
+    # Executado no pool: resumo + TXT de cada pedido, precificado uma vez só
+    cat = catalogo_atual()
+    resultados = []
+    for pedido in pedidos:
+        try:
+            itens, fin = orcamentos_lote.precificar_pedido(_validar(pedido), cat)
+            resumo = _resumo(itens, fin, cat)
+            nome, dados, _ = orcamentos_lote.renderizar_pedido(pedido, agora, (itens, fin))
+            resumo.update(arquivo=nome, txt=dados.decode("utf-8"))
+            resultados.append(resumo)
+        except Exception as e:
+            resultados.append(_erro_pedido(e))
+    return resultados
+
+def _aquecer():
+    catalogo_atual()
+
+# =========================
+# Micro-lotes
+# =========================
+class Lotes:
+    """Junta pedidos concorrentes e entrega cada lote de uma vez a `despachar`.
+
+    despachar(payloads, futuros) é uma corrotina que resolve os futuros
+    (pode retornar antes disso, deixando o trabalho em andamento).
+    """
+
+    def __init__(self, despachar, lote_max: int = LOTE_MAX, espera: float = ESPERA_LOTE):
+        self._despachar = despachar
+        self._lote_max = lote_max
+        self._espera = espera
+        self._fila = asyncio.Queue(FILA_MAX)
+        self._tarefa = None
+        self.lotes = 0
+        self.pedidos = 0
+
+    async def pedir(self, payload):
+        if self._tarefa is None:
+            self._tarefa = asyncio.get_running_loop().create_task(self._consumir())
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self._fila.put_nowait((payload, futuro))
+        except asyncio.QueueFull:
+            raise ErroHTTP(503, "Fila cheia, tente novamente") from None
+        return await futuro
+
+    async def _consumir(self):
+        while True:
+            lote = [await self._fila.get()]
+            # Um ciclo do loop (ou ESPERA_LOTE) para os pedidos que chegaram juntos
+            await asyncio.sleep(self._espera)
+            while len(lote) < self._lote_max and not self._fila.empty():
+                lote.append(self._fila.get_nowait())
+            self.lotes += 1
+            self.pedidos += len(lote)
+            payloads = [p for p, _ in lote]
+            futuros = [f for _, f in lote]
+            try:
+                await self._despachar(payloads, futuros)
+            except Exception as e:  # falha do lote inteiro
+                _LOGGER.exception("Falha ao processar lote")
+                _resolver(futuros, [e] * len(futuros))
+
+def _resolver(futuros, resultados):
+    for futuro, r in zip(futuros, resultados):
+        if futuro.done():
+            continue  # cliente desconectou
+        if isinstance(r, BaseException):
+            futuro.set_exception(r)
+        else:
+            futuro.set_result(r)
+
+# =========================
+# Servidor HTTP/1.1 mínimo (keep-alive, corpo com Content-Length)
+# =========================
+class ServidorAPI:
+    def __init__(self, workers: int = None, lote_max: int = LOTE_MAX, espera: float = ESPERA_LOTE):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._pool = None
+        self._vagas = None
+        self._precos = Lotes(self._despachar_precos, lote_max, espera)
+        self._documentos = Lotes(self._despachar_documentos, lote_max, espera)
+
+    async def _despachar_precos(self, payloads, futuros):
+        _resolver(futuros, _precificar_lote(payloads))
+
+    async def _despachar_documentos(self, payloads, futuros):
+        # Espera vaga no pool (no máximo LOTES_POR_WORKER lotes por processo);
+        # enquanto isso os pedidos seguintes acumulam na fila
+        await self._vagas.acquire()
+        tarefa = asyncio.get_running_loop().run_in_executor(self._pool, _documentos_lote, payloads, datetime.now())
+
+        def concluir(t):
+            self._vagas.release()
+            if t.exception() is not None:
+                _resolver(futuros, [t.exception()] * len(futuros))
+            else:
+                _resolver(futuros, t.result())
+
+        tarefa.add_done_callback(concluir)
+
+    async def _rotear(self, metodo: str, caminho: str, corpo: bytes):
+        if caminho == "/saude":
+            if metodo != "GET":
+                raise ErroHTTP(405, "Use GET")
+            return {"status": "ok", "catalogo": catalogo_atual().versao}
+        if caminho in ("/precificar", "/documento"):
+            if metodo != "POST":
+                raise ErroHTTP(405, "Use POST")
+            try:
+                pedido = json.loads(corpo or b"{}")
+            except ValueError as e:
+                raise ErroHTTP(400, f"JSON inválido: {e}") from None
+            lotes = self._precos if caminho == "/precificar" else self._documentos
+            return await lotes.pedir(pedido)
+        raise ErroHTTP(404, "Endpoint desconhecido")
+
+    async def _atender(self, reader, writer):
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                try:
+                    metodo, alvo, versao = linha.decode("latin-1").split()
+                except ValueError:
+                    break
+                cabecalhos = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = h.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                conexao = cabecalhos.get("connection", "").lower()
+                manter = conexao != "close" if versao == "HTTP/1.1" else conexao == "keep-alive"
+
+                t0 = time.perf_counter()
+                try:
+                    if "transfer-encoding" in cabecalhos:
+                        manter = False
+                        raise ErroHTTP(411, "Envie o corpo com Content-Length")
+                    try:
+                        tamanho = int(cabecalhos.get("content-length", "0") or 0)
+                    except ValueError:
+                        tamanho = -1
+                    if tamanho < 0:
+                        # Sem saber onde o corpo termina, a conexão não serve mais
+                        manter = False
+                        raise ErroHTTP(400, "Content-Length inválido")
+                    if tamanho > CORPO_MAX:
+                        manter = False
+                        raise ErroHTTP(413, f"Corpo acima de {CORPO_MAX} bytes")
+                    corpo = await reader.readexactly(tamanho) if tamanho else b""
+                    status, resposta = 200, await self._rotear(metodo, alvo.split("?")[0], corpo)
+                except ErroHTTP as e:
+                    status, resposta = e.status, {"erro": str(e)}
+                except Exception as e:
+                    _LOGGER.exception("Erro ao atender %s %s", metodo, alvo)
+                    status, resposta = 500, {"erro": f"Erro interno: {e}"}
+
+                dados = json.dumps(resposta, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_STATUS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(dados)}\r\n"
+                    f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode("latin-1") + dados
+                )
+                await writer.drain()
+                _LOGGER.debug("%s %s %d %.1f ms", metodo, alvo, status, (time.perf_counter() - t0) * 1000)
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def servir(self, endereco: str = "127.0.0.1", porta: int = PORTA_PADRAO, pronto=None):
+        # "spawn": não copia o loop de eventos em andamento para os processos
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_aquecer
+        )
+        self._vagas = asyncio.Semaphore(self.workers * LOTES_POR_WORKER)
+        servidor = await asyncio.start_server(self._atender, endereco, porta, limit=CORPO_MAX)
+        _LOGGER.info("API em http://%s:%s (%d processos de renderização)", endereco, porta, self.workers)
+        if pronto is not None:
+            pronto(servidor)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+            lotes = self._precos.lotes + self._documentos.lotes
+            if lotes:
+                pedidos = self._precos.pedidos + self._documentos.pedidos
+                _LOGGER.info("%d pedidos em %d lotes (%.1f por lote)", pedidos, lotes, pedidos / lotes)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API JSON de precificação TANKAR.")
+    parser.add_argument("--endereco", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processos para renderizar documentos")
+    parser.add_argument("--lote", type=int, default=LOTE_MAX, help="pedidos por micro-lote (1 desliga o agrupamento)")
+    parser.add_argument("--espera-ms", type=float, default=ESPERA_LOTE * 1000, help="espera para juntar pedidos")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(ServidorAPI(args.workers, args.lote, args.espera_ms / 1000).servir(args.endereco, args.porta))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
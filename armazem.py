@@ -0,0 +1,519 @@
+# =========================
+# Armazém de orçamentos (SQLite em modo WAL)
+# =========================
+# Cada orçamento salvo guarda cabeçalho, entradas financeiras, itens e o
+# texto gerado. Leituras usam um pool de conexões; gravações vão para uma
+# fila e são aplicadas por uma thread gravadora em transações agrupadas,
+# então salvar não segura o rerun. Valores em centavos inteiros.
+#
+# As descrições de item e as observações finais já usadas ficam num índice
+# invertido (FTS5) por serviço, atualizado a cada item incluído e a cada
+# orçamento salvo, para sugerir textos em vez de redigitá-los.
+
+import atexit
+import hashlib
+import os
+import queue
+import re
+import sqlite3
+import threading
+import unicodedata
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+
+from pricing import MEDIDAS, ItemOrcamento
+
+CAMINHO_PADRAO = os.environ.get(
+    "TANKAR_BANCO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "orcamentos.db")
+)
+# Quantas gravações entram numa mesma transação e quanto esperar por elas
+LOTE_MAX = 256
+ESPERA_LOTE = 0.005
+# "Serviço" das observações finais no índice de textos
+TEXTOS_OBSERVACOES = "Observações finais"
+# Palavras consideradas numa busca de textos
+TEXTOS_TERMOS_MAX = 8
+# Inícios de palavra até este tamanho usam o índice de prefixos do FTS; os
+# maiores viram um OR das palavras já vistas (até TEXTOS_EXPANSAO_MAX)
+TEXTOS_PREFIXO_INDEXADO = 3
+TEXTOS_EXPANSAO_MAX = 32
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS orcamentos (
+    id                 INTEGER PRIMARY KEY,
+    criado_em          TEXT NOT NULL,
+    atualizado_em      TEXT NOT NULL,
+    cliente_nome       TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    cliente_contato    TEXT NOT NULL DEFAULT '',
+    consultor_nome     TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    validade_dias      INTEGER NOT NULL DEFAULT 7,
+    observacoes_finais TEXT NOT NULL DEFAULT '',
+    despesas_centavos  INTEGER NOT NULL DEFAULT 0,
+    impostos_pct       REAL NOT NULL DEFAULT 0,
+    margem_pct         REAL NOT NULL DEFAULT 0,
+    n_itens            INTEGER NOT NULL DEFAULT 0,
+    subtotal_centavos  INTEGER NOT NULL DEFAULT 0,
+    total_centavos     INTEGER NOT NULL DEFAULT 0,
+    texto              TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS itens (
+    orcamento_id       INTEGER NOT NULL REFERENCES orcamentos(id) ON DELETE CASCADE,
+    posicao            INTEGER NOT NULL,
+    servico            TEXT NOT NULL,
+    descricao          TEXT NOT NULL DEFAULT '',
+    detalhes           TEXT NOT NULL DEFAULT '',
+    subtotal_centavos  INTEGER NOT NULL DEFAULT 0,
+    horas              INTEGER,
+    andares            INTEGER,
+    funcionarios       INTEGER,
+    PRIMARY KEY (orcamento_id, posicao)
+) WITHOUT ROWID;
+-- Serviços de cada orçamento (sem repetição), na ordem de criação: a busca
+-- por serviço percorre este índice já ordenado em vez de ordenar os itens
+CREATE TABLE IF NOT EXISTS servicos_orcamento (
+    servico            TEXT NOT NULL,
+    criado_em          TEXT NOT NULL,
+    orcamento_id       INTEGER NOT NULL REFERENCES orcamentos(id) ON DELETE CASCADE,
+    PRIMARY KEY (servico, criado_em, orcamento_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_orcamentos_criado ON orcamentos(criado_em, id);
+-- Exportação incremental (exportacao.py) parte da última gravação exportada
+CREATE INDEX IF NOT EXISTS idx_orcamentos_atualizado ON orcamentos(atualizado_em, id);
+CREATE INDEX IF NOT EXISTS idx_orcamentos_cliente ON orcamentos(cliente_nome, criado_em, id);
+CREATE INDEX IF NOT EXISTS idx_orcamentos_consultor ON orcamentos(consultor_nome, criado_em, id);
+CREATE INDEX IF NOT EXISTS idx_servicos_orcamento ON servicos_orcamento(orcamento_id);
+-- Textos já usados, um por (serviço, texto). Usar de novo apaga e insere
+-- outra vez: o id maior é o uso mais recente, que é a ordem das sugestões.
+-- `grupo` é o serviço como uma palavra só, para filtrar dentro do FTS.
+CREATE TABLE IF NOT EXISTS textos (
+    id                 INTEGER PRIMARY KEY,
+    chave              INTEGER NOT NULL UNIQUE,
+    grupo              TEXT NOT NULL,
+    texto              TEXT NOT NULL,
+    usado_em           TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS textos_busca USING fts5(
+    grupo, texto, content='textos', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+);
+CREATE TRIGGER IF NOT EXISTS textos_inclusao AFTER INSERT ON textos BEGIN
+    INSERT INTO textos_busca (rowid, grupo, texto) VALUES (new.id, new.grupo, new.texto);
+END;
+CREATE TRIGGER IF NOT EXISTS textos_exclusao AFTER DELETE ON textos BEGIN
+    INSERT INTO textos_busca (textos_busca, rowid, grupo, texto) VALUES ('delete', old.id, old.grupo, old.texto);
+END;
+-- Palavras já indexadas, para expandir um início de palavra sem varrer o FTS
+CREATE TABLE IF NOT EXISTS textos_termos (
+    termo              TEXT PRIMARY KEY
+) WITHOUT ROWID;
+"""
+# Versão do esquema (PRAGMA user_version): 1 = índice de textos preenchido;
+# 2 = itens com as quantidades (horas, andares, funcionários) em colunas
+_VERSAO_ESQUEMA = 2
+# Como os precificadores escreviam as quantidades em `detalhes` ("Horas: 8 ×",
+# "Horas adic.: 2 ×", "Andares: 12", "Funcionários: 150"); só para preencher
+# as colunas dos itens salvos antes da versão 2
+_MEDIDAS_DETALHES = re.compile(r"(Horas(?: adic\.)?|Andares|Funcionários): (\d+)")
+_NOMES_MEDIDAS = {"Horas": "horas", "Horas adic.": "horas", "Andares": "andares", "Funcionários": "funcionarios"}
+
+_COLUNAS_RESUMO = "o.id, o.criado_em, o.cliente_nome, o.consultor_nome, o.n_itens, o.total_centavos"
+
+def _conectar(caminho: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+def _padrao_prefixo(texto: str) -> str:
+    # Prefixo para LIKE, escapando os curingas do próprio texto
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def servico_base(servico: str) -> str:
+    # "Design de Rede — Wireless" -> "Design de Rede"
+    return servico.partition(" — ")[0]
+
+def _termos(texto: str) -> list:
+    # As palavras como o tokenizador do FTS as vê: minúsculas e sem acentos
+    sem_acento = "".join(c for c in unicodedata.normalize("NFKD", texto.lower()) if not unicodedata.combining(c))
+    return re.findall(r"[^\W_]+", sem_acento)
+
+def _grupo_texto(servico: str) -> str:
+    # "Gestão Industrial" -> "gestaoindustrial" (um único token no FTS)
+    return "".join(_termos(servico_base(servico)))
+
+def _chave_texto(grupo: str, texto: str) -> int:
+    # Chave única curta em vez de um índice sobre o texto inteiro
+    digest = hashlib.blake2b(f"{grupo}\0{texto}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+def _expressao_prefixo(conn, prefixo: str):
+    # Prefixo longo no FTS junta todas as ocorrências antes de devolver a
+    # primeira linha; um OR de palavras inteiras é percorrido sob demanda e
+    # para nas primeiras sugestões. None: nenhuma palavra com esse início.
+    if len(prefixo) <= TEXTOS_PREFIXO_INDEXADO:
+        return f'"{prefixo}"*'
+    termos = [r[0] for r in conn.execute(
+        "SELECT termo FROM textos_termos WHERE termo >= ? AND termo < ? LIMIT ?",
+        (prefixo, prefixo + "\U0010ffff", TEXTOS_EXPANSAO_MAX + 1),
+    )]
+    if not termos:
+        return None
+    if len(termos) > TEXTOS_EXPANSAO_MAX:
+        return f'"{prefixo}"*'
+    return "(" + " OR ".join(f'"{t}"' for t in termos) + ")"
+
+class ArmazemOrcamentos:
+    def __init__(self, caminho: str = CAMINHO_PADRAO, tamanho_pool: int = 4):
+        self.caminho = caminho
+        conn = _conectar(caminho)
+        conn.executescript(_ESQUEMA)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _VERSAO_ESQUEMA:
+            _migrar(conn)
+        conn.close()
+        self._pool = queue.LifoQueue()
+        for _ in range(tamanho_pool):
+            self._pool.put(_conectar(caminho))
+        self._fila = queue.Queue()
+        self._gravadora = threading.Thread(target=self._gravar, name="armazem-gravadora", daemon=True)
+        self._gravadora.start()
+        atexit.register(self.fechar)
+
+    # --- leitura ---
+    @contextmanager
+    def conexao(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def buscar(self, cliente: str = "", consultor: str = "", servico: str = "",
+               limite: int = 20, cursor=None):
+        """Página de orçamentos, do mais recente para o mais antigo.
+
+        `cliente` filtra por prefixo e `consultor` pelo nome exato (ambos
+        sem diferenciar maiúsculas); `servico` pelo nome base do serviço
+        de algum item (ex.: pricing.SERVICO_SURVEY). Retorna (linhas,
+        cursor da próxima página ou None). A paginação é por chave
+        (criado_em, id), então qualquer página custa o mesmo.
+        """
+        if servico:
+            # Parte do índice de serviços, que já vem na ordem da listagem
+            sql = (f"SELECT {_COLUNAS_RESUMO} FROM servicos_orcamento s "
+                   "JOIN orcamentos o ON o.id = s.orcamento_id")
+            condicoes, params = ["s.servico = ?"], [servico_base(servico)]
+            chave = ("s.criado_em", "s.orcamento_id")
+        else:
+            sql = f"SELECT {_COLUNAS_RESUMO} FROM orcamentos o"
+            condicoes, params = [], []
+            chave = ("o.criado_em", "o.id")
+        if cliente.strip():
+            condicoes.append("o.cliente_nome LIKE ? ESCAPE '\\'")
+            params.append(_padrao_prefixo(cliente.strip()))
+        if consultor.strip():
+            condicoes.append("o.consultor_nome = ?")
+            params.append(consultor.strip())
+        if cursor is not None:
+            condicoes.append(f"({chave[0]}, {chave[1]}) < (?, ?)")
+            params += list(cursor)
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += f" ORDER BY {chave[0]} DESC, {chave[1]} DESC LIMIT ?"
+        params.append(limite + 1)
+
+        with self.conexao() as conn:
+            linhas = [dict(r) for r in conn.execute(sql, params)]
+        proximo = None
+        if len(linhas) > limite:
+            linhas = linhas[:limite]
+            proximo = (linhas[-1]["criado_em"], linhas[-1]["id"])
+        return linhas, proximo
+
+    def carregar(self, orcamento_id: int) -> dict:
+        with self.conexao() as conn:
+            linha = conn.execute("SELECT * FROM orcamentos WHERE id = ?", (orcamento_id,)).fetchone()
+            if linha is None:
+                raise KeyError(orcamento_id)
+            itens = conn.execute(
+                "SELECT servico, descricao, detalhes, subtotal_centavos, horas, andares, funcionarios FROM itens "
+                "WHERE orcamento_id = ? ORDER BY posicao", (orcamento_id,)
+            ).fetchall()
+        dados = dict(linha)
+        dados["despesas"] = dados.pop("despesas_centavos") / 100
+        dados["itens"] = [ItemOrcamento(s, d, det, c / 100, *medidas) for s, d, det, c, *medidas in itens]
+        return dados
+
+    def contar(self) -> int:
+        with self.conexao() as conn:
+            return conn.execute("SELECT count(*) FROM orcamentos").fetchone()[0]
+
+    def sugerir_textos(self, consulta: str, servico: str, limite: int = 5) -> list:
+        """Textos já usados em `servico` que contêm todas as palavras da consulta.
+
+        A última palavra vale como prefixo; maiúsculas e acentos são
+        ignorados. Do uso mais recente para o mais antigo; consulta vazia
+        traz os últimos usados. `servico` aceita o nome com variante
+        ("Design de Rede — Wireless") ou TEXTOS_OBSERVACOES.
+        """
+        # Todas as palavras; a última como prefixo enquanto ainda está sendo digitada
+        termos = [f'"{t}"' for t in _termos(consulta)[:TEXTOS_TERMOS_MAX]]
+        with self.conexao() as conn:
+            if termos and not consulta[-1:].isspace():
+                termos[-1] = _expressao_prefixo(conn, termos[-1].strip('"'))
+                if termos[-1] is None:
+                    return []
+            expressao = f'grupo : "{_grupo_texto(servico)}"'
+            if termos:
+                expressao += f" AND texto : ({' AND '.join(termos)})"
+            return [r[0] for r in conn.execute(
+                "SELECT texto FROM textos WHERE id IN ("
+                "SELECT rowid FROM textos_busca WHERE textos_busca MATCH ? ORDER BY rowid DESC LIMIT ?"
+                ") ORDER BY id DESC",
+                (expressao, limite),
+            )]
+
+    # --- gravação ---
+    def salvar(self, itens, cabecalho: dict, fin: dict, texto: str = "", orcamento_id: int = None) -> Future:
+        """Enfileira a gravação e devolve um Future com o id do orçamento.
+
+        Com `orcamento_id`, regrava aquele orçamento (cabeçalho e itens).
+        `orcamento_id` também pode ser o Future de um salvar() anterior ainda
+        na fila: esta gravação vai depois dela, sem bloquear quem chamou, e
+        regrava o orçamento que ela criar (ou cria outro, se ela falhar).
+        """
+        if isinstance(orcamento_id, Future):
+            return self._salvar_depois(orcamento_id, itens, cabecalho, fin, texto)
+        agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        itens = [ItemOrcamento.de(it) for it in itens]
+        registro = dict(
+            id=orcamento_id,
+            criado_em=agora,
+            atualizado_em=agora,
+            cliente_nome=cabecalho.get("cliente_nome", ""),
+            cliente_contato=cabecalho.get("cliente_contato", ""),
+            consultor_nome=cabecalho.get("consultor_nome", ""),
+            validade_dias=int(cabecalho.get("validade_dias", 7)),
+            observacoes_finais=cabecalho.get("observacoes_finais", ""),
+            despesas_centavos=fin["centavos"]["despesas"],
+            impostos_pct=fin["impostos_pct"],
+            margem_pct=fin["margem_pct"],
+            n_itens=len(itens),
+            subtotal_centavos=fin["centavos"]["subtotal"],
+            total_centavos=fin["centavos"]["total"],
+            texto=texto,
+        )
+        return self._enfileirar(_gravar_orcamento, registro, itens)
+
+    def _salvar_depois(self, anterior: Future, itens, cabecalho: dict, fin: dict, texto: str) -> Future:
+        futuro = Future()
+        itens = list(itens)
+
+        def _repassar(gravacao: Future):
+            if gravacao.exception() is not None:
+                futuro.set_exception(gravacao.exception())
+            else:
+                futuro.set_result(gravacao.result())
+
+        def _encadear(gravacao: Future):
+            # Roda na thread gravadora quando a anterior termina
+            orcamento_id = None if gravacao.exception() is not None else gravacao.result()
+            try:
+                self.salvar(itens, cabecalho, fin, texto, orcamento_id).add_done_callback(_repassar)
+            except Exception as e:
+                futuro.set_exception(e)
+
+        anterior.add_done_callback(_encadear)
+        return futuro
+
+    def registrar_textos(self, itens) -> Future:
+        """Indexa as descrições dos itens para sugestões, sem salvar o orçamento."""
+        agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        pares = [(it.servico, it.descricao) for it in map(ItemOrcamento.de, itens)]
+        return self._enfileirar(_registrar_textos, pares, agora)
+
+    def _enfileirar(self, funcao, *args) -> Future:
+        # A thread gravadora chama funcao(conn, *args) dentro da transação do lote
+        futuro = Future()
+        self._fila.put((funcao, args, futuro))
+        return futuro
+
+    def _gravar(self):
+        conn = _conectar(self.caminho)
+        while True:
+            pedido = self._fila.get()
+            if pedido is None:
+                break
+            lote = [pedido]
+            fim = False
+            while len(lote) < LOTE_MAX:
+                try:
+                    pedido = self._fila.get(timeout=ESPERA_LOTE)
+                except queue.Empty:
+                    break
+                if pedido is None:
+                    fim = True
+                    break
+                lote.append(pedido)
+            self._aplicar_lote(conn, lote)
+            if fim:
+                break
+        conn.close()
+
+    def _aplicar_lote(self, conn, lote):
+        # Uma transação por lote; cada gravação num savepoint para que um
+        # erro derrube só ela mesma
+        resultados = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for funcao, args, _ in lote:
+                conn.execute("SAVEPOINT gravacao")
+                try:
+                    resultados.append((True, funcao(conn, *args)))
+                    conn.execute("RELEASE gravacao")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO gravacao")
+                    conn.execute("RELEASE gravacao")
+                    resultados.append((False, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            # Qualquer falha fora das gravações desfaz o lote inteiro, mas a
+            # thread segue viva e todo Future recebe uma resposta
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+            resultados = [(False, e)] * len(lote)
+        for (_, _, futuro), (ok, valor) in zip(lote, resultados):
+            if ok:
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(valor)
+
+    def fechar(self):
+        # Aplica o que ainda está na fila antes de fechar as conexões
+        if self._gravadora.is_alive():
+            self._fila.put(None)
+            self._gravadora.join()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+# Armazém compartilhado pelo processo (todas as sessões do app)
+_padrao = None
+_lock_padrao = threading.Lock()
+
+def armazem_padrao() -> ArmazemOrcamentos:
+    global _padrao
+    if _padrao is None:
+        with _lock_padrao:
+            if _padrao is None:
+                _padrao = ArmazemOrcamentos()
+    return _padrao
+
+def _gravar_orcamento(conn, registro: dict, itens) -> int:
+    colunas = [c for c in registro if c != "id"]
+    if registro["id"] is None:
+        cur = conn.execute(
+            f"INSERT INTO orcamentos ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+            [registro[c] for c in colunas],
+        )
+        orcamento_id = cur.lastrowid
+        criado_em = registro["criado_em"]
+    else:
+        # Regravação mantém a data de criação original
+        colunas.remove("criado_em")
+        orcamento_id = registro["id"]
+        cur = conn.execute(
+            f"UPDATE orcamentos SET {', '.join(c + ' = ?' for c in colunas)} WHERE id = ?",
+            [registro[c] for c in colunas] + [orcamento_id],
+        )
+        if cur.rowcount == 0:
+            raise KeyError(orcamento_id)
+        criado_em = conn.execute("SELECT criado_em FROM orcamentos WHERE id = ?", (orcamento_id,)).fetchone()[0]
+        conn.execute("DELETE FROM itens WHERE orcamento_id = ?", (orcamento_id,))
+        conn.execute("DELETE FROM servicos_orcamento WHERE orcamento_id = ?", (orcamento_id,))
+    conn.executemany(
+        "INSERT INTO itens (orcamento_id, posicao, servico, descricao, detalhes, subtotal_centavos, "
+        "horas, andares, funcionarios) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (orcamento_id, pos, it.servico, it.descricao, it.detalhes, it.centavos,
+             it.horas, it.andares, it.funcionarios)
+            for pos, it in enumerate(itens)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO servicos_orcamento (servico, criado_em, orcamento_id) VALUES (?, ?, ?)",
+        [(servico, criado_em, orcamento_id) for servico in {servico_base(it.servico) for it in itens}],
+    )
+    _registrar_textos(
+        conn,
+        [(it.servico, it.descricao) for it in itens] + [(TEXTOS_OBSERVACOES, registro["observacoes_finais"])],
+        registro["atualizado_em"],
+    )
+    return orcamento_id
+
+def _registrar_textos(conn, pares, usado_em: str):
+    # pares: (serviço, texto). Um texto já indexado sai e entra de novo
+    # para ficar com o maior id (uso mais recente).
+    linhas = {}
+    for servico, texto in pares:
+        texto = (texto or "").strip()
+        if texto:
+            grupo = _grupo_texto(servico)
+            linhas[_chave_texto(grupo, texto)] = (grupo, texto)
+    termos = set()
+    for chave, (grupo, texto) in linhas.items():
+        conn.execute("DELETE FROM textos WHERE chave = ?", (chave,))
+        conn.execute(
+            "INSERT INTO textos (chave, grupo, texto, usado_em) VALUES (?, ?, ?, ?)",
+            (chave, grupo, texto, usado_em),
+        )
+        termos.update(_termos(texto))
+    conn.executemany("INSERT OR IGNORE INTO textos_termos (termo) VALUES (?)", ((t,) for t in termos))
+
+def _migrar(conn):
+    # Atualiza bancos de versões anteriores do esquema numa transação só
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        versao = conn.execute("PRAGMA user_version").fetchone()[0]
+        if versao < 1:
+            _indexar_textos_salvos(conn)
+        if versao < 2:
+            _preencher_medidas(conn)
+        # Se outro processo já migrou, versao já é a atual e nada muda
+        conn.execute(f"PRAGMA user_version = {_VERSAO_ESQUEMA}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+def _indexar_textos_salvos(conn):
+    # Bancos de antes do índice de textos: indexa os orçamentos já salvos,
+    # do mais antigo para o mais recente
+    orcamentos = conn.execute(
+        "SELECT id, atualizado_em, observacoes_finais FROM orcamentos ORDER BY atualizado_em, id"
+    ).fetchall()
+    for orcamento_id, atualizado_em, observacoes in orcamentos:
+        itens = conn.execute(
+            "SELECT servico, descricao FROM itens WHERE orcamento_id = ? ORDER BY posicao", (orcamento_id,)
+        ).fetchall()
+        _registrar_textos(conn, [tuple(r) for r in itens] + [(TEXTOS_OBSERVACOES, observacoes)], atualizado_em)
+
+def _preencher_medidas(conn):
+    # Bancos de antes das colunas de quantidades: cria as colunas e preenche
+    # os itens já salvos a partir do texto de detalhes
+    existentes = {linha[1] for linha in conn.execute("PRAGMA table_info(itens)")}
+    for coluna in MEDIDAS:
+        if coluna not in existentes:
+            conn.execute(f"ALTER TABLE itens ADD COLUMN {coluna} INTEGER")
+    linhas = []
+    for orcamento_id, posicao, detalhes in conn.execute("SELECT orcamento_id, posicao, detalhes FROM itens"):
+        medidas = {_NOMES_MEDIDAS[nome]: int(n) for nome, n in _MEDIDAS_DETALHES.findall(detalhes)}
+        if medidas:
+            linhas.append((*(medidas.get(m) for m in MEDIDAS), orcamento_id, posicao))
+    conn.executemany(
+        "UPDATE itens SET horas = ?, andares = ?, funcionarios = ? WHERE orcamento_id = ? AND posicao = ?", linhas
+    )
@@ -0,0 +1,124 @@
+# =========================
+# Ativos estáticos do app (CSS, cabeçalho, logo, cartões de preço)
+# =========================
+# Montados uma vez por processo e compartilhados por todas as sessões:
+# um rerun só busca a string pronta no cache (lru_cache custa menos de
+# 1 µs; st.cache_resource, ~0,5 ms por chamada dentro do script).
+import base64
+import io
+import os
+from functools import lru_cache
+
+from pricing import format_brl
+
+@lru_cache(maxsize=None)
+def css_tema(dark: bool) -> str:
+    blue = "#0B3C5D"
+    green = "#0B8457"
+    bg_light = "#ffffff"
+    bg_dark = "#0f1420"
+    text_light = "#0B3C5D"
+    text_dark = "#e8eef3"
+    card_light = "#f9fbfd"
+    card_dark = "#151c2b"
+    border_light = "#e8eef3"
+    border_dark = "#22304a"
+
+    if dark:
+        app_bg = bg_dark; text = text_dark; card = card_dark; border = border_dark; hr = "#243251"
+    else:
+        app_bg = bg_light; text = text_light; card = card_light; border = border_light; hr = "#e6eef5"
+
+    return f"""
+    <style>
+    .stApp {{ background: {app_bg}; }}
+    /* Aumenta o padding superior para o título não ficar colado no topo */
+    .block-container {{ padding-top: 2.2rem; }}
+
+    .header-band {{
+      display: flex; align-items: center; gap: 14px;
+      background: linear-gradient(90deg, {blue}, {green});
+      border-radius: 16px; padding: 16px 18px; color: white; margin-bottom: 14px;
+      box-shadow: 0 4px 18px rgba(0,0,0,0.15);
+    }}
+    .header-band img {{ height: 48px; border-radius: 8px; background: #fff; }}
+    h1, h2, h3, h4, h5, h6, label, .stMarkdown p {{ color: {text}; }}
+    hr {{ border: 0; height: 1px; background: {hr}; margin: 0.8rem 0 1rem; }}
+    .card {{
+      border: 1px solid {border}; border-radius: 12px; padding: 12px 14px; background: {card};
+    }}
+    .badge {{
+      display: inline-block; padding: 2px 8px; border-radius: 999px;
+      background: {blue}; color: #fff; font-size: 12px; font-weight: 600;
+    }}
+    .stButton>button {{
+      background: {green}; color: white; border: 0; border-radius: 10px;
+      padding: 0.6rem 1.0rem; font-weight: 600;
+      box-shadow: 0 4px 12px rgba(11,132,87,0.25); transition: all .15s ease;
+    }}
+    .stButton>button:hover {{ filter: brightness(1.05); transform: translateY(-1px); }}
+    </style>
+    """
+
+# Logo do cabeçalho: versão reduzida gerada uma vez (python ativos.py) e
+# embutida em base64. O original de 1165x765 fica só como fonte.
+_PASTA = os.path.dirname(os.path.abspath(__file__))
+LOGO_ORIGINAL = os.path.join(_PASTA, "tankar_logo.png")
+LOGO_CABECALHO = os.path.join(_PASTA, "tankar_logo_cabecalho.jpg")
+LOGO_ALTURA_PX = 96  # 2x a altura exibida, para telas de alta densidade
+
+def reduzir_logo(origem: str = LOGO_ORIGINAL) -> bytes:
+    # Pillow só é importado aqui: custa ~130 ms na partida a frio
+    from PIL import Image
+
+    with Image.open(origem) as img:
+        img = img.convert("RGB")
+        img.thumbnail((LOGO_ALTURA_PX * 4, LOGO_ALTURA_PX))
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+@lru_cache(maxsize=1)
+def logo_data_uri() -> str:
+    try:
+        with open(LOGO_CABECALHO, "rb") as f:
+            dados = f.read()
+    except OSError:
+        try:
+            dados = reduzir_logo()
+        except OSError:
+            return ""
+    return "data:image/jpeg;base64," + base64.b64encode(dados).decode("ascii")
+
+@lru_cache(maxsize=1)
+def html_cabecalho() -> str:
+    logo = logo_data_uri()
+    img = f'<img src="{logo}" alt="Tankar"/>' if logo else ""
+    return (
+        f'<div class="header-band">{img}<div><h2 style="margin:0;">TANKAR IT QUOTE TOOL</h2>'
+        '<div class="badge">Orçamentos Multisserviço</div></div></div>'
+    )
+
+# Cartões de preço: dependem só dos valores do catálogo em uso
+@lru_cache(maxsize=64)
+def card_implementacao(analise_fixa: float, hora_adicional: float) -> str:
+    return (
+        f'<div class="card">Análise inicial obrigatória: <b>{format_brl(analise_fixa)}</b>. '
+        f'Horas adicionais a <b>{format_brl(hora_adicional)}</b>. '
+        f'<br/><i>Custos de transporte serão calculados separadamente.</i></div>'
+    )
+
+@lru_cache(maxsize=64)
+def card_survey(analise_fixa: float, por_andar: float, limite: int, acima_limite: float) -> str:
+    return (
+        f'<div class="card">Base: <b>{format_brl(analise_fixa)}</b>. '
+        f'Para prédios, some <b>{format_brl(por_andar)}/andar</b> (1–{limite} andares) '
+        f'ou <b>{format_brl(acima_limite)}</b> para mais de {limite} andares. '
+        f'Metragem por andar também soma por andar.</div>'
+    )
+
+if __name__ == "__main__":
+    # Regera o logo reduzido do cabeçalho a partir do original
+    with open(LOGO_CABECALHO, "wb") as f:
+        f.write(reduzir_logo())
+    print(f"{LOGO_CABECALHO}: {os.path.getsize(LOGO_CABECALHO)} bytes")
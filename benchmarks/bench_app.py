@@ -0,0 +1,223 @@
+"""Suíte de desempenho do app inteiro, dirigida pelo AppTest do Streamlit.
+
+Para cada tamanho de orçamento (10, 100 e 1000 itens) roda uma sessão
+roteirizada: passa por todos os serviços, inclui um item pelo formulário,
+duplica e exclui, troca de página, altera o financeiro e o cabeçalho
+(o que regenera a exportação) e salva no histórico. Registra latência de
+cada rerun (percentis), quantidade de widgets/elementos na tela e pico de
+memória Python (tracemalloc, numa passada separada para não distorcer os
+tempos).
+
+O AppTest sempre executa o script inteiro, então os números são de rerun
+completo; o ganho dos fragmentos é medido em bench_fragmentos.py.
+
+Uso:
+    python benchmarks/bench_app.py --salvar-base      # grava a referência
+    python benchmarks/bench_app.py                    # compara; sai com 1 se regrediu
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+# Histórico num banco descartável, nunca no orcamentos.db do app
+os.environ.setdefault("TANKAR_BANCO", os.path.join(tempfile.mkdtemp(), "bench_app.db"))
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.element_tree import Block  # noqa: E402
+
+import pricing  # noqa: E402
+from orcamento import Orcamento  # noqa: E402
+
+TAMANHOS = (10, 100, 1000)
+BASE_PADRAO = os.path.join(RAIZ, "benchmarks", "base_app.json")
+# Folga antes de acusar regressão (latência e memória; reruns variam uns 20%
+# entre execuções na mesma máquina); widgets e elementos não podem aumentar
+TOLERANCIA = 0.30
+
+
+def _itens(n):
+    metragens = list(pricing.WS_METRAGENS)
+    fabricas = [
+        lambda i: pricing.preco_consultoria(2 + i % 30, f"Site {i}: suporte e melhorias na rede"),
+        lambda i: pricing.preco_implementacao(i % 12, f"Site {i}: ampliação da rede wireless"),
+        lambda i: pricing.preco_survey(1 + i % 14, metragens[i % len(metragens)], f"Prédio {i}"),
+        lambda i: pricing.preco_design(4 + i % 40, "Híbrida", f"Projeto {i}"),
+        lambda i: pricing.preco_gestao_industrial(10 + i % 300, f"Planta {i}", ["Redução de custos"]),
+        lambda i: pricing.preco_curso(pricing.CURSOS_OPCOES[i % len(pricing.CURSOS_OPCOES)], f"Turma {i}"),
+        lambda i: pricing.preco_equipamentos(),
+    ]
+    return [fabricas[i % len(fabricas)](i) for i in range(n)]
+
+
+def _botao(at, rotulo=None, chave=None):
+    for b in at.button:
+        if (chave is not None and b.key == chave) or (rotulo is not None and b.label.startswith(rotulo)):
+            return b
+    raise LookupError(rotulo or chave)
+
+
+def _contar(at):
+    widgets = elementos = 0
+    for no in at._tree:
+        if isinstance(no, Block):
+            continue
+        elementos += 1
+        if getattr(no, "id", None) or getattr(getattr(no, "proto", None), "id", None):
+            widgets += 1
+    return widgets, elementos
+
+
+def _nova_sessao(n):
+    at = AppTest.from_file(os.path.join(RAIZ, "quote.py"), default_timeout=120)
+    at.session_state["orcamento"] = Orcamento(_itens(n))
+    at.session_state["cliente_nome"] = "Cliente Benchmark"
+    at.session_state["consultor_nome"] = "Consultor Benchmark"
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return at
+
+
+def _roteiro(at, rodadas):
+    """Executa as interações e devolve [(passo, ms), ...]."""
+    tempos = []
+
+    def rerun(passo):
+        t0 = time.perf_counter()
+        at.run()
+        tempos.append((passo, (time.perf_counter() - t0) * 1000))
+        if at.exception:
+            raise RuntimeError(f"{passo}: {at.exception}")
+
+    for r in range(rodadas):
+        servicos = next(s for s in at.selectbox if s.label == "Serviço:")
+        for opcao in servicos.options[1:]:
+            next(s for s in at.selectbox if s.label == "Serviço:").set_value(opcao)
+            rerun("servico")
+
+        next(s for s in at.selectbox if s.label == "Serviço:").set_value(pricing.SERVICO_CONSULTORIA)
+        rerun("servico")
+        at.text_area[0].set_value(f"Rodada {r}: levantamento da rede")
+        _botao(at, "➕ Incluir item").click()
+        rerun("incluir")
+
+        _botao(at, chave="dup_0").click()
+        rerun("duplicar")
+        _botao(at, chave="del_0").click()
+        rerun("excluir")
+
+        paginas = [n for n in at.number_input if n.key == "itens_pagina"]
+        if paginas:
+            paginas[0].set_value(2 if paginas[0].value == 1 else 1)
+            rerun("paginar")
+
+        for chave, valor in (("finance_despesas", 1500.0 + r), ("finance_impostos", 12.5), ("finance_margem", 8.0 + r)):
+            at.number_input(key=chave).set_value(valor)
+            rerun("financeiro")
+
+        # Cabeçalho novo muda a impressão digital e regenera o TXT
+        at.text_input(key="cliente_nome").set_value(f"Cliente Benchmark {r}")
+        _botao(at, "💾 Salvar dados").click()
+        rerun("exportar")
+
+        _botao(at, "🗄️ Salvar no histórico").click()
+        rerun("historico")
+    return tempos
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def medir(n, rodadas):
+    at = _nova_sessao(n)
+    widgets, elementos = _contar(at)
+    tempos = _roteiro(at, rodadas)
+    valores = [ms for _, ms in tempos]
+    por_passo = {}
+    for passo, ms in tempos:
+        por_passo.setdefault(passo, []).append(ms)
+
+    tracemalloc.start()
+    _roteiro(_nova_sessao(n), 1)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "reruns": len(valores),
+        "p50_ms": round(_percentil(valores, 50), 2),
+        "p90_ms": round(_percentil(valores, 90), 2),
+        "p99_ms": round(_percentil(valores, 99), 2),
+        "max_ms": round(max(valores), 2),
+        "mediana_por_passo_ms": {p: round(statistics.median(v), 2) for p, v in por_passo.items()},
+        "widgets": widgets,
+        "elementos": elementos,
+        "pico_memoria_mb": round(pico / 2**20, 2),
+    }
+
+
+def comparar(atual, base, tolerancia):
+    """Lista de regressões de `atual` em relação a `base`."""
+    regressoes = []
+    for n, r in atual.items():
+        b = base.get(n)
+        if b is None:
+            continue
+        for chave in ("p50_ms", "p90_ms", "pico_memoria_mb"):
+            if r[chave] > b[chave] * (1 + tolerancia):
+                regressoes.append(f"N={n}: {chave} {b[chave]} -> {r[chave]} (+{r[chave] / b[chave] - 1:.0%})")
+        for chave in ("widgets", "elementos"):
+            if r[chave] > b[chave]:
+                regressoes.append(f"N={n}: {chave} {b[chave]} -> {r[chave]}")
+    return regressoes
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS), help="quantidades de itens")
+    ap.add_argument("--rodadas", type=int, default=3, help="repetições do roteiro por tamanho")
+    ap.add_argument("--base", default=BASE_PADRAO, help="arquivo JSON de referência")
+    ap.add_argument("--salvar-base", action="store_true", help="grava os resultados como nova referência")
+    ap.add_argument("--tolerancia", type=float, default=TOLERANCIA, help="folga relativa (0.30 = 30%%)")
+    args = ap.parse_args()
+
+    resultados = {}
+    for n in args.tamanhos:
+        r = resultados[str(n)] = medir(n, args.rodadas)
+        print(f"N={n:>5}: {r['reruns']} reruns | p50 {r['p50_ms']:8.1f} ms | p90 {r['p90_ms']:8.1f} ms | "
+              f"p99 {r['p99_ms']:8.1f} ms | {r['widgets']} widgets / {r['elementos']} elementos | "
+              f"pico {r['pico_memoria_mb']:.1f} MB")
+        print("         " + ", ".join(f"{p} {ms:.0f}" for p, ms in r["mediana_por_passo_ms"].items()))
+
+    if args.salvar_base:
+        with open(args.base, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "streamlit": st.__version__,
+                       "resultados": resultados}, f, indent=2, ensure_ascii=False)
+        print(f"referência gravada em {args.base}")
+        return 0
+
+    if not os.path.exists(args.base):
+        print(f"sem referência em {args.base}; rode com --salvar-base para criar")
+        return 0
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)["resultados"]
+    regressoes = comparar(resultados, base, args.tolerancia)
+    for linha in regressoes:
+        print("REGRESSÃO " + linha)
+    if not regressoes:
+        print(f"sem regressões em relação a {args.base} (tolerância {args.tolerancia:.0%})")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Busca, paginação e reabertura no armazém de orçamentos com muitos registros.
+
+Popula um banco temporário com N orçamentos (3 itens cada, gravados pela
+fila em lotes) e mede as consultas que a tela de orçamentos salvos faz.
+
+Uso: python benchmarks/bench_armazem.py [n_orcamentos] [caminho_db]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pricing  # noqa: E402
+from armazem import ArmazemOrcamentos  # noqa: E402
+
+CLIENTES = ["Acme", "Bravo Log", "Casa Verde", "Delta Têxtil", "Eletro Sul", "Fazenda Boa Vista", "Grupo Ômega"]
+CONSULTORES = ["Ana", "Bruno", "Carla", "Diego"]
+
+
+def _itens(rnd):
+    metragens = list(pricing.WS_METRAGENS)
+    opcoes = [
+        lambda: pricing.preco_consultoria(rnd.randint(1, 40), "Suporte"),
+        lambda: pricing.preco_implementacao(rnd.randint(0, 30), "Melhoria"),
+        lambda: pricing.preco_survey(rnd.randint(1, 15), rnd.choice(metragens), "Prédio"),
+        lambda: pricing.preco_design(rnd.randint(1, 60), "Híbrida", "Projeto"),
+        lambda: pricing.preco_gestao_industrial(rnd.randint(1, 400), "PCP"),
+        lambda: pricing.preco_curso(pricing.CURSOS_OPCOES[0]),
+    ]
+    itens = [rnd.choice(opcoes)() for _ in range(3)]
+    if rnd.random() < 0.01:
+        itens.append(pricing.preco_equipamentos())
+    return itens
+
+
+def _medir(funcao, repeticoes=50):
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(tempos), max(tempos)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    caminho = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.mkdtemp(), "bench.db")
+    rnd = random.Random(7)
+    armazem = ArmazemOrcamentos(caminho)
+
+    faltam = n - armazem.contar()
+    if faltam > 0:
+        t0 = time.perf_counter()
+        futuros = []
+        for i in range(faltam):
+            itens = _itens(rnd)
+            fin = pricing.total_com_financeiros(pricing.total_itens(itens), 500.0, 12.5, 10.0)
+            cabecalho = dict(
+                cliente_nome=f"{rnd.choice(CLIENTES)} {i % 997}",
+                consultor_nome=rnd.choice(CONSULTORES),
+            )
+            futuros.append(armazem.salvar(itens, cabecalho, fin, "texto " * 200))
+        t_fila = time.perf_counter() - t0
+        futuros[-1].result()
+        t_total = time.perf_counter() - t0
+        print(f"{faltam} orçamentos: enfileirar {t_fila / faltam * 1e6:.1f} µs cada, "
+              f"gravados em {t_total:.1f} s ({faltam / t_total:,.0f}/s)")
+
+    ultimo = armazem.buscar(limite=1)[0][0]["id"]
+    _, cursor_fundo = armazem.buscar(limite=n - 40)
+    consultas = {
+        "primeira página": lambda: armazem.buscar(limite=20),
+        "página profunda (cursor)": lambda: armazem.buscar(limite=20, cursor=cursor_fundo),
+        "cliente por prefixo": lambda: armazem.buscar(cliente="casa verde 1", limite=20),
+        "consultor": lambda: armazem.buscar(consultor="carla", limite=20),
+        "serviço comum": lambda: armazem.buscar(servico=pricing.SERVICO_SURVEY, limite=20),
+        "serviço raro": lambda: armazem.buscar(servico=pricing.SERVICO_EQUIPAMENTOS, limite=20),
+        "reabrir orçamento": lambda: armazem.carregar(ultimo),
+    }
+    print(f"banco com {armazem.contar()} orçamentos ({caminho})")
+    for nome, funcao in consultas.items():
+        mediana, maximo = _medir(funcao)
+        print(f"{nome:>26}: mediana {mediana:6.2f} ms, máx {maximo:6.2f} ms")
+    armazem.fechar()
+
+
+if __name__ == "__main__":
+    main()
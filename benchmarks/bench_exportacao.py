@@ -0,0 +1,139 @@
+"""Relatórios sobre o histórico: TXT interpretado por regex vs exportação colunar.
+
+Popula um banco temporário com N orçamentos (3–6 itens, TXT completo
+gravado como no app), exporta com exportacao.py e mede três relatórios:
+receita por serviço, média de andares dos Wireless Surveys e
+distribuição da margem. "TXT" lê a coluna texto e interpreta com regex
+(como era feito); "parquet"/"arrow" leem só as colunas necessárias das
+partes exportadas. Mede também a exportação completa e a incremental.
+
+Uso: python benchmarks/bench_exportacao.py [n_orcamentos]
+"""
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pyarrow.compute as pc  # noqa: E402
+import pyarrow.dataset as ds  # noqa: E402
+
+import documento  # noqa: E402
+import exportacao  # noqa: E402
+import pricing  # noqa: E402
+from armazem import ArmazemOrcamentos  # noqa: E402
+from orcamento import Orcamento  # noqa: E402
+
+# Interpretação do TXT (o caminho antigo)
+_ITEM = re.compile(r"^Item \d+: (.+)\nDescrição/Resumo: .*\nDetalhes: (.*)\nSubtotal: R\$ ([\d.,]+)$", re.M)
+_ANDARES = re.compile(r"Andares: (\d+)")
+_MARGEM = re.compile(r"^MARGEM \(([\d.]+)%\)", re.M)
+
+
+def _itens(rnd):
+    metragens = list(pricing.WS_METRAGENS)
+    opcoes = [
+        lambda: pricing.preco_consultoria(rnd.randint(1, 40), "Suporte e melhorias na rede"),
+        lambda: pricing.preco_implementacao(rnd.randint(0, 30), "Ampliação da rede wireless"),
+        lambda: pricing.preco_survey(rnd.randint(1, 15), rnd.choice(metragens), "Prédio administrativo"),
+        lambda: pricing.preco_design(rnd.randint(1, 60), rnd.choice(["Wireless", "Cabeada", "Híbrida"]), "Projeto"),
+        lambda: pricing.preco_gestao_industrial(rnd.randint(1, 400), "PCP e redução de custos"),
+    ]
+    return [rnd.choice(opcoes)() for _ in range(rnd.randint(3, 6))]
+
+
+def _popular(armazem, n, rnd):
+    futuros = []
+    for i in range(n):
+        orc = Orcamento(_itens(rnd))
+        fin = orc.financeiro(rnd.choice([0, 500, 1500]), rnd.choice([0, 8, 12.5]), rnd.choice([0, 5, 8, 10, 15]))
+        cabecalho = dict(cliente_nome=f"Cliente {i % 500}", consultor_nome="Ana", observacoes_finais="")
+        futuros.append(armazem.salvar(orc.itens, cabecalho, fin, documento.gerar_txt(orc.itens, fin, **cabecalho)))
+    futuros[-1].result()
+
+
+def relatorios_txt(caminho):
+    receita, andares, margens = defaultdict(int), [], Counter()
+    conn = sqlite3.connect(caminho)
+    for (texto,) in conn.execute("SELECT texto FROM orcamentos"):
+        for servico, detalhes, subtotal in _ITEM.findall(texto):
+            base = servico.partition(" — ")[0]
+            receita[base] += int(subtotal.replace(".", "").replace(",", ""))
+            if base == pricing.SERVICO_SURVEY:
+                andares.append(int(_ANDARES.search(detalhes).group(1)))
+        margens[float(_MARGEM.search(texto).group(1))] += 1
+    conn.close()
+    return dict(receita), sum(andares) / len(andares), dict(margens)
+
+
+def relatorios_colunar(destino, formato):
+    formato_ds = "ipc" if formato == "arrow" else formato
+    itens = ds.dataset(os.path.join(destino, "itens"), format=formato_ds)
+    receita = itens.to_table(columns=["servico", "subtotal_centavos"]).group_by("servico").aggregate(
+        [("subtotal_centavos", "sum")])
+    surveys = itens.to_table(columns=["andares"], filter=pc.field("servico") == pricing.SERVICO_SURVEY)
+    orcamentos = ds.dataset(os.path.join(destino, "orcamentos"), format=formato_ds)
+    margens = orcamentos.to_table(columns=["margem_pct"]).group_by("margem_pct").aggregate([("margem_pct", "count")])
+    return (
+        dict(zip(receita["servico"].to_pylist(), receita["subtotal_centavos_sum"].to_pylist())),
+        pc.mean(surveys["andares"]).as_py(),
+        dict(zip(margens["margem_pct"].to_pylist(), margens["margem_pct_count"].to_pylist())),
+    )
+
+
+def _tempo(fn, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        resultado = fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor * 1000, resultado
+
+
+def _tamanho(pasta):
+    return sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(pasta) for f in fs) / 2**20
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    pasta = tempfile.mkdtemp()
+    caminho = os.path.join(pasta, "bench.db")
+    rnd = random.Random(7)
+    armazem = ArmazemOrcamentos(caminho)
+    t0 = time.perf_counter()
+    _popular(armazem, n, rnd)
+    print(f"{n} orçamentos gravados em {time.perf_counter() - t0:.1f} s; banco {os.path.getsize(caminho) / 2**20:.0f} MiB")
+
+    ms, base = _tempo(lambda: relatorios_txt(caminho))
+    print(f"{'TXT + regex':>16}: relatórios {ms:8.1f} ms")
+    futuro = datetime.now() + timedelta(minutes=5)
+    for formato in exportacao.FORMATOS:
+        destino = os.path.join(pasta, formato)
+        t0 = time.perf_counter()
+        resumo = exportacao.exportar(destino, formato, armazem, ate=futuro)
+        t_export = time.perf_counter() - t0
+        linha = f"{formato:>16}: exportação {t_export * 1000:8.1f} ms ({resumo['itens']} itens, {_tamanho(destino):5.1f} MiB)"
+        if formato != "csv":
+            ms, resultado = _tempo(lambda: relatorios_colunar(destino, formato))
+            assert resultado == base, (resultado, base)
+            linha += f" | relatórios {ms:8.1f} ms"
+        print(linha)
+
+    # Incremental: 1% de orçamentos novos só gera uma parte nova
+    _popular(armazem, max(1, n // 100), rnd)
+    t0 = time.perf_counter()
+    resumo = exportacao.exportar(os.path.join(pasta, "parquet"), "parquet", armazem, ate=futuro + timedelta(minutes=1))
+    print(f"incremental: {resumo['orcamentos']} orçamentos novos em {(time.perf_counter() - t0) * 1000:.1f} ms "
+          f"({resumo['partes']} parte nova)")
+    armazem.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Micro-benchmark do formatador pt-BR: format_brl antigo (float + 3 replaces) vs dinheiro.
+
+Para valores exatos em centavos as saídas são idênticas. Com fração de
+centavo (1.115, 0.125) o novo arredonda meio para longe do zero, como as
+contas ("R$ 1,12"); o antigo seguia o double mais próximo ("R$ 1,11").
+"Cache frio" limpa o cache a cada rodada: é o custo de um valor inédito.
+
+Uso: python benchmarks/bench_format_brl.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dinheiro  # noqa: E402
+import pricing  # noqa: E402
+
+
+def format_brl_antigo(valor: float) -> str:
+    s = f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"R$ {s}"
+
+
+def main():
+    random.seed(7)
+    # Valores típicos de um rerun: constantes de preço (repetidas) e totais variados
+    repetidos = [pricing.HORA_CONSULTORIA, pricing.IMPL_ANALISE_FIXA, pricing.WS_ANALISE_FIXA,
+                 pricing.WS_ADD_POR_ANDAR, pricing.DESIGN_ANALISE_FIXA] * 200
+    variados = [random.randint(0, 10**9) / 100 for _ in range(1000)]
+    variados_c = [dinheiro.centavos(v) for v in variados]
+
+    negativos = [-v for v in variados[:100]]
+    for v in repetidos + variados + negativos:
+        assert format_brl_antigo(v) == dinheiro.format_brl(v), v
+    for c in variados_c:
+        assert format_brl_antigo(c / 100) == dinheiro.format_centavos(c), c
+    assert dinheiro.format_brl(1.115) == "R$ 1,12" and format_brl_antigo(1.115) == "R$ 1,11"
+
+    assert dinheiro.format_brl(0.125) == "R$ 0,13" and dinheiro.centavos(0.125) == 13
+
+    def frio(funcao, valores):
+        funcao.cache_clear()
+        return [funcao(v) for v in valores]
+
+    # Um rerun formata de novo os mesmos valores: repetidos e variados saem do cache
+    casos = [
+        ("antigo, valores repetidos", lambda: [format_brl_antigo(v) for v in repetidos]),
+        ("novo, valores repetidos", lambda: [dinheiro.format_brl(v) for v in repetidos]),
+        ("antigo, valores variados", lambda: [format_brl_antigo(v) for v in variados]),
+        ("novo, valores variados", lambda: [dinheiro.format_brl(v) for v in variados]),
+        ("novo, variados (cache frio)", lambda: frio(dinheiro.format_brl, variados)),
+        ("novo, centavos int", lambda: [dinheiro.format_centavos(c) for c in variados_c]),
+        ("novo, centavos int (cache frio)", lambda: frio(dinheiro.format_centavos, variados_c)),
+    ]
+    for nome, fn in casos:
+        # Melhor de 7 medições: a mediana oscila muito em máquina compartilhada
+        n, _ = timeit.Timer(fn).autorange()
+        total = min(timeit.repeat(fn, number=n, repeat=7))
+        por_chamada = total / n / 1000 * 1e9
+        print(f"{nome:>32}: {por_chamada:7.0f} ns/chamada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Latência de uma interação no formulário de Consultoria com um orçamento grande.
+
+Compara o rerun completo do script (o que toda interação custava antes
+dos fragmentos) com o rerun só do fragmento do formulário de serviço.
+O AppTest executa sempre o app inteiro, então o rerun de fragmento é
+disparado diretamente no ScriptRunner, como o servidor faz.
+
+Uso: python benchmarks/bench_fragmentos.py [n_itens] [repeticoes]
+"""
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import streamlit.testing.v1.local_script_runner as lsr  # noqa: E402
+from streamlit.runtime.fragment import MemoryFragmentStorage  # noqa: E402
+from streamlit.runtime.scriptrunner.script_requests import RerunData  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.element_tree import parse_tree_from_messages  # noqa: E402
+
+import pricing  # noqa: E402
+from orcamento import Orcamento  # noqa: E402
+
+# Fragmentos registrados no rerun completo ficam disponíveis para os próximos
+_storage = MemoryFragmentStorage()
+lsr.MemoryFragmentStorage = lambda: _storage
+_fila_fragmentos = []
+_run_original = lsr.LocalScriptRunner.run
+
+
+def _run(self, widget_state=None, query_params=None, timeout=3, page_hash=""):
+    if not _fila_fragmentos:
+        return _run_original(self, widget_state, query_params, timeout, page_hash)
+    self.request_rerun(RerunData(widget_states=widget_state, fragment_id_queue=list(_fila_fragmentos)))
+    if not self._script_thread:
+        self.start()
+    lsr.require_widgets_deltas(self, timeout)
+    return parse_tree_from_messages(self.forward_msgs())
+
+
+lsr.LocalScriptRunner.run = _run
+
+
+def _id_fragmento(nome):
+    for fid, fn in _storage._fragments.items():
+        for cel in fn.__closure__ or ():
+            if getattr(cel.cell_contents, "__name__", None) == nome:
+                return fid
+    raise LookupError(nome)
+
+
+def _medir(at, repeticoes, fragmento=None):
+    tempos = []
+    for r in range(repeticoes):
+        horas = next(n for n in at.number_input if n.label == "Horas necessárias")
+        horas.set_value(5 + r % 20)
+        _fila_fragmentos[:] = [fragmento] if fragmento else []
+        t0 = time.perf_counter()
+        at.run()
+        tempos.append((time.perf_counter() - t0) * 1000)
+        _fila_fragmentos.clear()
+        if fragmento:
+            # Volta a árvore completa para localizar os widgets na próxima rodada
+            at.run()
+    return tempos
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    itens = [pricing.preco_consultoria(4 + i % 8, f"Site {i}: " + "escopo " * 60) for i in range(n)]
+    at = AppTest.from_file(os.path.join(RAIZ, "quote.py"), default_timeout=60)
+    at.session_state["orcamento"] = Orcamento(itens)
+    at.run()
+    at.selectbox[0].set_value(pricing.SERVICO_CONSULTORIA)
+    at.run()
+    assert not at.exception, at.exception
+
+    completo = _medir(at, repeticoes)
+    fragmento = _medir(at, repeticoes, _id_fragmento("secao_servico"))
+
+    print(f"orçamento com {n} itens, {repeticoes} interações em 'Horas necessárias'")
+    for nome, tempos in (("rerun completo", completo), ("rerun do fragmento", fragmento)):
+        print(f"{nome:>20}: mediana {statistics.median(tempos):7.1f} ms, máx {max(tempos):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compara a precificação item a item (pricing) com a versão em lote (pricing_lote).
+
+Uso: python benchmarks/bench_lote.py [n_itens]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pricing  # noqa: E402
+import pricing_lote  # noqa: E402
+
+
+def gerar_carteira(n, seed=42):
+    rng = np.random.default_rng(seed)
+    codigos = rng.choice(pricing_lote.CODIGOS, size=n)
+    horas = rng.integers(1, 40, size=n)
+    andares = rng.integers(1, 20, size=n)
+    metragem = rng.choice(list(pricing.WS_METRAGENS), size=n)
+    funcionarios = rng.integers(1, 400, size=n)
+    return codigos, horas, andares, metragem, funcionarios
+
+
+def subtotal_escalar(codigo, horas, andares, metragem, funcionarios):
+    if codigo == "consultoria":
+        return pricing.preco_consultoria(horas)["subtotal"]
+    if codigo == "implementacao":
+        return pricing.preco_implementacao(horas)["subtotal"]
+    if codigo == "survey":
+        return pricing.custos_survey(andares, metragem)[2]
+    if codigo == "design":
+        return pricing.preco_design(horas, "Wireless")["subtotal"]
+    if codigo == "gestao":
+        return pricing.preco_gestao_industrial(funcionarios)["subtotal"]
+    return 0.0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    codigos, horas, andares, metragem, funcionarios = gerar_carteira(n)
+    linhas = list(zip(codigos.tolist(), horas.tolist(), andares.tolist(),
+                      metragem.tolist(), funcionarios.tolist()))
+
+    t0 = time.perf_counter()
+    escalar = [subtotal_escalar(*linha) for linha in linhas]
+    fin_escalar = [pricing.total_com_financeiros(s, 500.0, 12.5, 7.5) for s in escalar]
+    t_escalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    lote = pricing_lote.subtotais_lote(codigos, horas, andares, metragem, funcionarios)
+    fin_lote = pricing_lote.total_com_financeiros_lote(lote, 500.0, 12.5, 7.5)
+    t_lote = time.perf_counter() - t0
+
+    assert np.array_equal(np.array(escalar), lote), "subtotais divergentes"
+    assert np.array_equal(np.array([f["total"] for f in fin_escalar]), fin_lote["total"]), "totais divergentes"
+
+    print(f"itens: {n}")
+    print(f"item a item: {t_escalar:.3f} s ({n / t_escalar:,.0f} itens/s)")
+    print(f"lote NumPy:  {t_lote:.3f} s ({n / t_lote:,.0f} itens/s)")
+    print(f"ganho: {t_escalar / t_lote:.1f}x (resultados idênticos)")
+
+
+if __name__ == "__main__":
+    main()
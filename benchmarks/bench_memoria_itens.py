@@ -0,0 +1,71 @@
+"""Memória por item de um orçamento de 1.000 itens: dict + deepcopy vs ItemOrcamento.
+
+Cenário: 100 itens distintos (descrições de ~500 caracteres), depois
+duplicados até 1.000 itens, como num orçamento multi-site.
+
+Uso: python benchmarks/bench_memoria_itens.py
+"""
+import os
+import sys
+import tracemalloc
+from copy import deepcopy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pricing  # noqa: E402
+from orcamento import HISTORICO_MAX, Orcamento  # noqa: E402
+
+N_DISTINTOS = 100
+N_TOTAL = 1000
+
+
+def descricao(i):
+    return (f"Site {i:04d}: " + "levantamento de cobertura e capacidade da rede wireless " * 10)[:500]
+
+
+def medir(construir):
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    objeto = construir()
+    depois = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(s.size_diff for s in depois.compare_to(antes, "filename"))
+    return objeto, total
+
+
+def com_dicts():
+    # Comportamento anterior: itens dict e duplicação por deepcopy
+    itens = [pricing.preco_consultoria(4 + i % 8, descricao(i)).como_dict() for i in range(N_DISTINTOS)]
+    while len(itens) < N_TOTAL:
+        itens.append(deepcopy(itens[len(itens) % N_DISTINTOS]))
+    return itens
+
+
+def com_itens():
+    orc = Orcamento(pricing.preco_consultoria(4 + i % 8, descricao(i)) for i in range(N_DISTINTOS))
+    while len(orc) < N_TOTAL:
+        orc.duplicate_item(len(orc) % N_DISTINTOS)
+    return orc
+
+
+def so_versao_atual():
+    # Mesmos itens numa única versão, sem o histórico de desfazer das 900 duplicações
+    distintos = [pricing.preco_consultoria(4 + i % 8, descricao(i)) for i in range(N_DISTINTOS)]
+    return Orcamento(distintos[i % N_DISTINTOS] for i in range(N_TOTAL))
+
+
+def main():
+    _, antes = medir(com_dicts)
+    _, depois = medir(so_versao_atual)
+    _, com_historico = medir(com_itens)
+    print(f"orçamento com {N_TOTAL} itens ({N_DISTINTOS} distintos + duplicatas)")
+    print(f"dict + deepcopy:  {antes:>9,} bytes ({antes / N_TOTAL:,.0f} bytes/item)")
+    print(f"ItemOrcamento:    {depois:>9,} bytes ({depois / N_TOTAL:,.0f} bytes/item)")
+    print(f"redução: {1 - depois / antes:.0%}")
+    historico = com_historico - depois
+    print(f"histórico de desfazer ({N_TOTAL - N_DISTINTOS} duplicações, até {HISTORICO_MAX} versões): "
+          f"+{historico:,} bytes ({historico / HISTORICO_MAX:,.0f} bytes/versão)")
+
+
+if __name__ == "__main__":
+    main()
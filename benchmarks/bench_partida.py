@@ -0,0 +1,92 @@
+"""Partida a frio e custo de CPU por rerun do quote.py.
+
+Cada amostra roda num processo novo (partida a frio de verdade) e mede:
+- primeira sessão: primeiro run do script (importações + primeira pintura);
+- sessão nova no mesmo processo: o que cada usuário seguinte paga;
+- CPU por rerun (process_time) numa sequência de reruns comuns;
+- mediana das seções "tema" e "cabecalho" (métricas do app) nos reruns.
+
+Uso: python benchmarks/bench_partida.py [amostras]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RERUNS = 30
+
+
+def _amostra():
+    sys.path.insert(0, RAIZ)
+    os.environ["TANKAR_BANCO"] = os.path.join(tempfile.mkdtemp(), "partida.db")
+    os.environ["TANKAR_METRICAS_PORTA"] = "0"
+    os.environ["TANKAR_RERUN_LENTO_MS"] = "1e9"
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import metricas
+    t_import = time.perf_counter() - t0
+
+    # Guarda as seções de cada rerun concluído
+    reruns = []
+    concluir = metricas.Rerun.concluir
+
+    def _concluir(self):
+        if not self._concluido:
+            self.etapa(None)
+            reruns.append(dict(self.secoes))
+        concluir(self)
+
+    metricas.Rerun.concluir = _concluir
+
+    def sessao():
+        at = AppTest.from_file(os.path.join(RAIZ, "quote.py"), default_timeout=60)
+        t = time.perf_counter()
+        at.run()
+        return at, time.perf_counter() - t
+
+    _, primeira = sessao()
+    at, nova = sessao()
+    cpu = time.process_time()
+    for i in range(RERUNS):
+        at.sidebar.radio[0].set_value("Claro" if i % 2 else "Escuro")
+        at.run()
+    cpu = (time.process_time() - cpu) / RERUNS
+
+    # O primeiro rerun paga importações preguiçosas do Streamlit (~35 ms no
+    # primeiro widget), por isso a mediana
+    secoes = {
+        secao: statistics.median(r.get(secao, 0.0) for r in reruns) * 1000
+        for secao in ("tema", "cabecalho")
+    }
+    print(json.dumps({
+        "import_ms": t_import * 1000,
+        "primeira_sessao_ms": primeira * 1000,
+        "sessao_nova_ms": nova * 1000,
+        "cpu_por_rerun_ms": cpu * 1000,
+        "tema_ms": secoes.get("tema"),
+        "cabecalho_ms": secoes.get("cabecalho"),
+    }))
+
+
+def main():
+    amostras = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    resultados = []
+    for _ in range(amostras):
+        saida = subprocess.run([sys.executable, __file__, "--amostra"], capture_output=True, text=True, check=True)
+        resultados.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    print(f"{amostras} processos novos, {RERUNS} reruns (troca de tema) cada — medianas:")
+    for chave in resultados[0]:
+        valores = [r[chave] for r in resultados if r[chave] is not None]
+        if valores:
+            print(f"{chave:>20}: {statistics.median(valores):8.2f}")
+
+
+if __name__ == "__main__":
+    if "--amostra" in sys.argv:
+        _amostra()
+    else:
+        main()
@@ -0,0 +1,86 @@
+"""Geração do PDF do orçamento: direto e pelo pool de processos.
+
+Mede, para orçamentos de 10 e 500 itens:
+- geração a frio (inclui montar fontes, logo e modelo) e a quente, no processo;
+- pelo pool: tempo que o app fica preso no submit e latência até o PDF
+  ficar pronto, com o pool ainda frio (primeiro pedido) e já aquecido.
+
+Uso: python benchmarks/bench_pdf.py [repeticoes]
+"""
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pricing  # noqa: E402
+import documento_pdf  # noqa: E402
+from orcamento import Orcamento  # noqa: E402
+
+TAMANHOS = (10, 500)
+CABECALHO = {
+    "cliente_nome": "Cliente Benchmark", "cliente_contato": "compras@cliente.com.br",
+    "consultor_nome": "Consultor Benchmark", "validade_dias": 15,
+    "observacoes_finais": "Valores válidos para execução em horário comercial — deslocamento incluso.",
+}
+
+
+def _itens(n):
+    metragens = list(pricing.WS_METRAGENS)
+    fabricas = [
+        lambda i: pricing.preco_consultoria(2 + i % 30, f"Site {i}: suporte e melhorias na rede"),
+        lambda i: pricing.preco_implementacao(i % 12, f"Site {i}: ampliação da rede wireless"),
+        lambda i: pricing.preco_survey(1 + i % 14, metragens[i % len(metragens)], f"Prédio {i}"),
+        lambda i: pricing.preco_design(4 + i % 40, "Híbrida", f"Projeto {i}"),
+        lambda i: pricing.preco_gestao_industrial(10 + i % 300, f"Planta {i}", ["Redução de custos"]),
+        lambda i: pricing.preco_curso(pricing.CURSOS_OPCOES[i % len(pricing.CURSOS_OPCOES)], f"Turma {i}"),
+        lambda i: pricing.preco_equipamentos(),
+    ]
+    return [fabricas[i % len(fabricas)](i) for i in range(n)]
+
+
+def _fin(itens):
+    return Orcamento(itens).financeiro(1500.0, 12.5, 8.0)
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    casos = {n: _itens(n) for n in TAMANHOS}
+
+    print("no processo (ms):")
+    for n, itens in casos.items():
+        documento_pdf._recursos.cache_clear()
+        t = time.perf_counter()
+        pdf = documento_pdf.gerar_pdf(itens, _fin(itens), **CABECALHO)
+        frio = (time.perf_counter() - t) * 1000
+        quentes = []
+        for _ in range(repeticoes):
+            t = time.perf_counter()
+            documento_pdf.gerar_pdf(itens, _fin(itens), **CABECALHO)
+            quentes.append((time.perf_counter() - t) * 1000)
+        print(f"  N={n:>4}: frio {frio:7.2f} | quente mediana {statistics.median(quentes):7.2f} "
+              f"| {pdf.count(b'/Type /Page ')} páginas, {len(pdf) / 1024:.1f} KiB")
+
+    print(f"pelo pool ({documento_pdf.WORKERS} processos, ms):")
+    t = time.perf_counter()
+    futuro = documento_pdf.gerar_pdf_em_segundo_plano(casos[10], _fin(casos[10]), **CABECALHO)
+    submit = (time.perf_counter() - t) * 1000
+    futuro.result()
+    print(f"  primeiro pedido (pool frio): submit {submit:.2f} | pronto em {(time.perf_counter() - t) * 1000:.1f}")
+    for n, itens in casos.items():
+        submits, prontos = [], []
+        for _ in range(repeticoes):
+            t = time.perf_counter()
+            futuro = documento_pdf.gerar_pdf_em_segundo_plano(itens, _fin(itens), **CABECALHO)
+            submits.append((time.perf_counter() - t) * 1000)
+            futuro.result()
+            prontos.append((time.perf_counter() - t) * 1000)
+        print(f"  N={n:>4}: submit mediana {statistics.median(submits):6.2f} "
+              f"| pronto mediana {statistics.median(prontos):7.2f}")
+    documento_pdf.pool_pdf().shutdown()
+
+
+if __name__ == "__main__":
+    main()
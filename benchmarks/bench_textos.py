@@ -0,0 +1,92 @@
+"""Sugestão de textos já usados (índice FTS5 do armazém) com muitos textos.
+
+Indexa N descrições distintas (~300–500 caracteres, vocabulário de
+orçamentos de rede e gestão) espalhadas pelos serviços, pela mesma fila
+que inclui itens no app, e mede a busca por serviço: consulta vazia
+(últimos usados), uma palavra, início de palavra com 1–3 letras e
+várias palavras.
+
+Uso: python benchmarks/bench_textos.py [n_textos] [caminho_db]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pricing  # noqa: E402
+from pricing import ItemOrcamento  # noqa: E402
+from armazem import TEXTOS_OBSERVACOES, ArmazemOrcamentos  # noqa: E402
+
+SERVICOS = [pricing.SERVICO_CONSULTORIA, pricing.SERVICO_IMPLEMENTACAO, pricing.SERVICO_SURVEY,
+            pricing.SERVICO_DESIGN, pricing.SERVICO_GESTAO, TEXTOS_OBSERVACOES]
+PALAVRAS = (
+    "rede wireless cabeada híbrida cobertura capacidade access points switches roteadores firewall "
+    "vlan segmentação servidor backup monitoramento suporte melhoria ampliação prédio andar galpão "
+    "escritório fábrica estoque pcp processos custos dashboard indicadores treinamento equipe cliente "
+    "levantamento relatório projeto instalação configuração migração links internet redundância "
+    "segurança câmeras controle acesso laboratório auditório depósito recepção refeitório diretoria"
+).split()
+CONSULTAS = [
+    ("vazia", ""),
+    ("1 palavra", "wireless"),
+    ("prefixo 1 letra", "r"),
+    ("prefixo 3 letras", "cob"),
+    ("3 palavras", "rede galpão ampl"),
+    ("palavra inteira", "wireless "),
+    ("sem resultado", "inexistente"),
+]
+
+
+def _texto(rnd, i):
+    palavras = [rnd.choice(PALAVRAS) for _ in range(rnd.randint(45, 75))]
+    return f"Site {i}: " + " ".join(palavras)
+
+
+def _medir(funcao, repeticoes=50):
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(tempos), max(tempos)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    caminho = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.mkdtemp(), "bench_textos.db")
+    rnd = random.Random(7)
+    armazem = ArmazemOrcamentos(caminho)
+
+    with armazem.conexao() as conn:
+        faltam = n - conn.execute("SELECT count(*) FROM textos").fetchone()[0]
+    if faltam > 0:
+        t0 = time.perf_counter()
+        futuros = [
+            armazem.registrar_textos([ItemOrcamento(rnd.choice(SERVICOS), _texto(rnd, i), "", 0.0)])
+            for i in range(faltam)
+        ]
+        futuros[-1].result()
+        segundos = time.perf_counter() - t0
+        print(f"indexados {faltam} textos em {segundos:.1f} s ({faltam / segundos:,.0f}/s)")
+    print(f"banco: {os.path.getsize(caminho) / 2**20:.0f} MiB")
+
+    # Incluir um item no app: indexar uma descrição (fila + transação)
+    item = ItemOrcamento(pricing.SERVICO_DESIGN, _texto(rnd, -1), "", 0.0)
+    mediana, pior = _medir(lambda: armazem.registrar_textos([item]).result())
+    print(f"{'incluir 1 texto':>18}: mediana {mediana:6.2f} ms | pior {pior:6.2f} ms")
+    for servico in (pricing.SERVICO_DESIGN, TEXTOS_OBSERVACOES):
+        print(servico)
+        for nome, consulta in CONSULTAS:
+            achados = len(armazem.sugerir_textos(consulta, servico))
+            mediana, pior = _medir(lambda: armazem.sugerir_textos(consulta, servico))
+            print(f"{nome:>18}: mediana {mediana:6.2f} ms | pior {pior:6.2f} ms | {achados} sugestões")
+    armazem.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Memória e tempo do histórico de versões do orçamento (desfazer/refazer).
+
+Para orçamentos de 1.000 e 10.000 itens, faz 200 alterações (inclui,
+duplica e exclui) e mede a memória das versões guardadas:
+- Orcamento (lista persistente, compartilha o que não mudou);
+- cópia da lista de itens a cada versão (histórico ingênuo, sem deepcopy).
+
+Mede também o custo de cada alteração, de ler um item por índice e de
+percorrer o orçamento inteiro, comparado à lista comum.
+
+Uso: python benchmarks/bench_versoes.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pricing  # noqa: E402
+from orcamento import Orcamento  # noqa: E402
+
+TAMANHOS = (1000, 10000)
+ALTERACOES = 200
+
+
+def _itens(n):
+    return [pricing.preco_consultoria(1 + i % 40, f"Site {i}: suporte e melhorias na rede") for i in range(n)]
+
+
+def _roteiro(n, rnd):
+    # (operação, índice) sem depender do estado: o índice é reduzido ao tamanho na hora
+    return [(rnd.choice(("incluir", "duplicar", "excluir")), rnd.randrange(n)) for _ in range(ALTERACOES)]
+
+
+def com_orcamento(itens, roteiro):
+    orc = Orcamento(itens)
+    novo = pricing.preco_design(8, "Híbrida", "Projeto")
+    for op, i in roteiro:
+        if op == "incluir":
+            orc.add_item(novo)
+        elif op == "duplicar":
+            orc.duplicate_item(i % len(orc))
+        else:
+            orc.delete_item(i % len(orc))
+    return orc
+
+
+def com_copias(itens, roteiro):
+    atual = list(itens)
+    historico = [atual]
+    novo = pricing.preco_design(8, "Híbrida", "Projeto")
+    for op, i in roteiro:
+        atual = list(atual)
+        if op == "incluir":
+            atual.append(novo)
+        elif op == "duplicar":
+            atual.append(atual[i % len(atual)])
+        else:
+            del atual[i % len(atual)]
+        historico.append(atual)
+    return historico
+
+
+def _memoria(fn, *args):
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = fn(*args)
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, depois - antes
+
+
+def _tempo(fn, repeticoes=5):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t)
+    return melhor
+
+
+def main():
+    rnd = random.Random(7)
+    print(f"{ALTERACOES} alterações por orçamento; memória além dos próprios itens")
+    for n in TAMANHOS:
+        itens = _itens(n)
+        roteiro = _roteiro(n, rnd)
+        orc, mem_orc = _memoria(com_orcamento, itens, roteiro)
+        historico, mem_copias = _memoria(com_copias, itens, roteiro)
+        assert list(orc) == historico[-1]
+        print(f"N={n:>6}: versões persistentes {mem_orc / 1024:9.1f} KiB | cópias {mem_copias / 1024:9.1f} KiB "
+              f"| {mem_copias / mem_orc:5.1f}x menos")
+
+        lista = historico[-1]
+        t_alt = (_tempo(lambda: com_orcamento(itens, roteiro)) - _tempo(lambda: Orcamento(itens))) / ALTERACOES
+        indices = [rnd.randrange(len(lista)) for _ in range(1000)]
+        t_ler = _tempo(lambda: [orc[i] for i in indices]) / 1000
+        t_ler_lista = _tempo(lambda: [lista[i] for i in indices]) / 1000
+        t_iter = _tempo(lambda: sum(1 for _ in orc))
+        t_iter_lista = _tempo(lambda: sum(1 for _ in lista))
+        t_desfazer = _tempo(lambda: (orc.desfazer(), orc.refazer()), 50) / 2
+        print(f"          alteração {t_alt * 1e6:6.1f} µs | desfazer {t_desfazer * 1e6:5.2f} µs")
+        print(f"          item por índice {t_ler * 1e6:5.2f} µs (lista {t_ler_lista * 1e6:5.2f}) | "
+              f"percorrer tudo {t_iter * 1000:6.2f} ms (lista {t_iter_lista * 1000:6.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Teste de carga da API de precificação (api.py).
+
+Abre C conexões keep-alive e dispara pedidos em sequência em cada uma
+durante D segundos; mede requisições/s e latência (p50/p90/p99) por
+endpoint. Sem --url, sobe uma instância local da API num subprocesso.
+
+Uso:
+    python benchmarks/carga_api.py                         # /precificar e /documento
+    python benchmarks/carga_api.py -c 64 -d 10 --endpoint /documento
+    python benchmarks/carga_api.py --url http://127.0.0.1:8765
+    python benchmarks/carga_api.py --lote 1                # sem micro-lotes, para comparar
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PEDIDO = {
+    "cliente_nome": "Cliente Carga", "consultor_nome": "Consultor Carga", "validade_dias": 15,
+    "impostos": 12.5, "margem": 8, "despesas": 1500,
+    "itens": [
+        {"servico": "consultoria", "horas": 12, "descricao": "Suporte e melhorias na rede"},
+        {"servico": "implementacao", "horas": 6, "descricao": "Ampliação da rede wireless"},
+        {"servico": "survey", "andares": 12, "metragem": "200–300 m² (+R$ 3.500)", "descricao": "Prédio A"},
+        {"servico": "design", "horas": 20, "tipo": "Híbrida", "descricao": "Projeto do campus"},
+        {"servico": "gestao", "funcionarios": 150, "opcoes": "Redução de custos"},
+    ],
+}
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+async def _cliente(host, porta, requisicao, fim, latencias, erros):
+    reader, writer = await asyncio.open_connection(host, porta)
+    try:
+        while time.perf_counter() < fim:
+            t0 = time.perf_counter()
+            writer.write(requisicao)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            tamanho = 0
+            while True:
+                linha = await reader.readline()
+                if linha in (b"\r\n", b""):
+                    break
+                if linha.lower().startswith(b"content-length:"):
+                    tamanho = int(linha.split(b":")[1])
+            await reader.readexactly(tamanho)
+            if status == 200:
+                latencias.append(time.perf_counter() - t0)
+            else:
+                erros.append(status)
+    finally:
+        writer.close()
+
+
+async def carga(host, porta, endpoint, conexoes, duracao):
+    corpo = json.dumps(PEDIDO, ensure_ascii=False).encode("utf-8")
+    requisicao = (
+        f"POST {endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(corpo)}\r\n\r\n".encode("latin-1") + corpo
+    )
+    latencias, erros = [], []
+    t0 = time.perf_counter()
+    fim = t0 + duracao
+    await asyncio.gather(*(_cliente(host, porta, requisicao, fim, latencias, erros) for _ in range(conexoes)))
+    return latencias, erros, time.perf_counter() - t0
+
+
+def _subir_api(porta, argumentos):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(RAIZ, "api.py"), "--porta", str(porta), *argumentos],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    prazo = time.time() + 15
+    while time.time() < prazo:
+        try:
+            socket.create_connection(("127.0.0.1", porta), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("API não subiu")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--url", help="API já em execução (padrão: sobe uma local)")
+    ap.add_argument("--endpoint", action="append", help="endpoint(s) a testar")
+    ap.add_argument("-c", "--conexoes", type=int, default=32)
+    ap.add_argument("-d", "--duracao", type=float, default=5.0, help="segundos por endpoint")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="processos da API local")
+    ap.add_argument("--lote", type=int, default=None, help="pedidos por micro-lote na API local")
+    args = ap.parse_args()
+
+    proc = None
+    if args.url:
+        partes = urlsplit(args.url)
+        host, porta = partes.hostname, partes.port or 80
+    else:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            porta = s.getsockname()[1]
+        host = "127.0.0.1"
+        argumentos = []
+        if args.workers:
+            argumentos += ["-j", str(args.workers)]
+        if args.lote:
+            argumentos += ["--lote", str(args.lote)]
+        proc = _subir_api(porta, argumentos)
+
+    try:
+        print(f"{args.conexoes} conexões, {args.duracao:.0f} s por endpoint")
+        for endpoint in args.endpoint or ["/precificar", "/documento"]:
+            asyncio.run(carga(host, porta, endpoint, args.conexoes, 0.5))  # aquecimento
+            latencias, erros, segundos = asyncio.run(carga(host, porta, endpoint, args.conexoes, args.duracao))
+            ms = [x * 1000 for x in latencias]
+            print(
+                f"{endpoint:>12}: {len(latencias) / segundos:8.0f} req/s | p50 {_percentil(ms, 50):6.2f} ms | "
+                f"p90 {_percentil(ms, 90):6.2f} ms | p99 {_percentil(ms, 99):6.2f} ms | "
+                f"{len(latencias)} ok, {len(erros)} erros"
+            )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# =========================
+# Catálogo de preços (arquivo versionado + recarga a quente)
+# =========================
+# Os preços vêm de catalogo_precos.json (ou do arquivo em TANKAR_CATALOGO)
+# e são compilados uma vez em estruturas de consulta com bisect. O
+# catálogo é compartilhado pelo processo inteiro; quando o mtime do
+# arquivo muda, um novo Catalogo é montado e trocado de uma vez. Quem
+# já pegou a referência antiga (um rerun em andamento) segue com ela.
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+_LOGGER = logging.getLogger(__name__)
+
+CAMINHO_PADRAO = os.environ.get(
+    "TANKAR_CATALOGO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogo_precos.json")
+)
+# Intervalo mínimo entre verificações de mtime (segundos)
+INTERVALO_VERIFICACAO = 1.0
+
+class CatalogoInvalido(ValueError):
+    pass
+
+class Catalogo:
+    __slots__ = (
+        "versao", "hora_consultoria", "hora_design",
+        "impl_analise_fixa", "impl_hora_adicional",
+        "ws_analise_fixa", "ws_add_por_andar", "ws_limite_andares", "ws_acima_limite",
+        "ws_metragens", "_ws_limites_m2", "_ws_rotulos",
+        "design_analise_fixa", "gi_faixas", "_gi_inicios", "cursos_opcoes",
+    )
+
+    def __init__(self, dados: dict):
+        try:
+            self.versao = str(dados["versao"])
+            self.hora_consultoria = float(dados["consultoria"]["hora"])
+            self.impl_analise_fixa = float(dados["implementacao"]["analise_fixa"])
+            self.impl_hora_adicional = float(dados["implementacao"]["hora_adicional"])
+
+            survey = dados["survey"]
+            self.ws_analise_fixa = float(survey["analise_fixa"])
+            self.ws_add_por_andar = float(survey["por_andar"])
+            self.ws_limite_andares = int(survey["limite_andares"])
+            self.ws_acima_limite = float(survey["acima_do_limite"])
+            metragens = survey["metragens"]
+            self.ws_metragens = {m["rotulo"]: float(m["por_andar"]) for m in metragens}
+            self._ws_rotulos = [m["rotulo"] for m in metragens]
+            self._ws_limites_m2 = [float(m["ate_m2"]) for m in metragens if m.get("ate_m2") is not None]
+
+            self.design_analise_fixa = float(dados["design"]["analise_fixa"])
+            self.hora_design = float(dados["design"]["hora"])
+
+            faixas = sorted(dados["gestao_industrial"]["faixas"], key=lambda f: f["de"])
+            self.gi_faixas = [
+                (int(f["de"]), int(f["ate"]) if f.get("ate") is not None else 10**9, float(f["preco"]))
+                for f in faixas
+            ]
+            self._gi_inicios = [f[0] for f in self.gi_faixas]
+            self.cursos_opcoes = list(dados["cursos"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise CatalogoInvalido(f"Catálogo de preços inválido: {e!r}") from e
+
+        if not self.gi_faixas or not self.ws_metragens:
+            raise CatalogoInvalido("Catálogo de preços sem faixas de Gestão Industrial ou de metragem")
+        if len(self._ws_limites_m2) != len(self._ws_rotulos) - 1 or self._ws_limites_m2 != sorted(self._ws_limites_m2):
+            raise CatalogoInvalido("Metragens: só a última faixa pode ficar sem 'ate_m2', em ordem crescente")
+
+    # --- consultas compiladas ---
+    def preco_gestao(self, num_func: int) -> float:
+        i = bisect_right(self._gi_inicios, num_func) - 1
+        if i >= 0 and num_func <= self.gi_faixas[i][1]:
+            return self.gi_faixas[i][2]
+        # Fora de qualquer faixa: vale a última (mesma regra de sempre)
+        return self.gi_faixas[-1][2]
+
+    def custo_andares(self, qtd_andares: int) -> float:
+        if qtd_andares > self.ws_limite_andares:
+            return self.ws_acima_limite
+        return qtd_andares * self.ws_add_por_andar
+
+    def faixa_metragem(self, area_m2: float) -> str:
+        # Rótulo da faixa que cobre a área por andar (até o limite, inclusive).
+        # Os rótulos descrevem as áreas que caem em cada faixa: a primeira
+        # começa em zero e a última logo acima do limite da penúltima.
+        return self._ws_rotulos[bisect_left(self._ws_limites_m2, area_m2)]
+
+def carregar_catalogo(caminho: str = CAMINHO_PADRAO) -> Catalogo:
+    with open(caminho, encoding="utf-8") as f:
+        return Catalogo(json.load(f))
+
+# =========================
+# Catálogo compartilhado do processo
+# =========================
+_lock = threading.Lock()
+_atual = None
+_mtime = None
+_verificado = 0.0
+
+def _recarregar_se_mudou(caminho: str):
+    global _atual, _mtime, _verificado
+    _verificado = time.monotonic()
+    mtime = os.stat(caminho).st_mtime_ns
+    if mtime != _mtime:
+        novo = carregar_catalogo(caminho)
+        # Troca atômica: uma única atribuição de referência
+        _atual, _mtime = novo, mtime
+        _LOGGER.info("Catálogo de preços carregado: versão %s", novo.versao)
+
+def catalogo_atual() -> Catalogo:
+    """Catálogo vigente; relê o arquivo se o mtime mudou.
+
+    Só uma thread verifica/recarrega por vez e as demais não esperam:
+    seguem com o catálogo que já estava carregado. Se o arquivo novo
+    for inválido, o catálogo anterior continua valendo.
+    """
+    if _atual is None:
+        with _lock:
+            if _atual is None:
+                _recarregar_se_mudou(CAMINHO_PADRAO)
+        return _atual
+    if time.monotonic() - _verificado >= INTERVALO_VERIFICACAO and _lock.acquire(blocking=False):
+        try:
+            _recarregar_se_mudou(CAMINHO_PADRAO)
+        except (OSError, CatalogoInvalido, json.JSONDecodeError) as e:
+            _LOGGER.warning("Mantendo catálogo %s; falha ao recarregar: %s", _atual.versao, e)
+        finally:
+            _lock.release()
+    return _atual
@@ -0,0 +1,59 @@
+# =========================
+# Dinheiro em centavos inteiros
+# =========================
+# Valores monetários são guardados como int de centavos: somas e
+# percentuais ficam exatos. Toda conversão arredonda meio para longe do
+# zero, como dividir_arredondando. O formatador pt-BR parte dos centavos
+# inteiros e é memoizado, já que os mesmos valores (preços de tabela,
+# subtotais) aparecem a cada rerun.
+
+from functools import lru_cache
+
+# Folga relativa somada antes de arredondar: cobre o ruído do double
+# (0.285 * 100 == 28.499999999999996), milhares de vezes menor que 1 centavo
+FOLGA_RUIDO = 1e-13
+
+def arredondar(valor: float) -> int:
+    # Meio para longe do zero (12,5 -> 13; -12,5 -> -13); round() levaria ao par
+    a = valor if valor >= 0 else -valor
+    n = int(a + 0.5 + a * FOLGA_RUIDO)
+    return n if valor >= 0 else -n
+
+def centavos(valor) -> int:
+    if isinstance(valor, int):
+        return valor * 100
+    return arredondar(float(valor) * 100)
+
+def pontos_base(pct) -> int:
+    # Percentual em centésimos de ponto (12,5% -> 1250)
+    return arredondar(float(pct) * 100)
+
+def dividir_arredondando(numerador: int, denominador: int) -> int:
+    # Divisão inteira com arredondamento "meio para longe do zero" (0,5 centavo sobe)
+    q, r = divmod(abs(numerador), denominador)
+    if 2 * r >= denominador:
+        q += 1
+    return q if numerador >= 0 else -q
+
+def aplicar_pct(valor_c: int, pct_bp: int) -> int:
+    return dividir_arredondando(valor_c * pct_bp, 10000)
+
+def _formatar(valor_c: int) -> str:
+    # 123456789 -> "R$ 1.234.567,89". O agrupamento de milhar fica no
+    # format do int (com "_", trocado por "."); abaixo de R$ 1.000 nem isso.
+    if valor_c < 0:
+        reais, cent = divmod(-valor_c, 100)
+        return f"R$ -{reais:_},{cent:02d}".replace("_", ".")
+    reais, cent = divmod(valor_c, 100)
+    if reais < 1000:
+        return f"R$ {reais},{cent:02d}"
+    return f"R$ {reais:_},{cent:02d}".replace("_", ".")
+
+format_centavos = lru_cache(maxsize=4096)(_formatar)
+
+@lru_cache(maxsize=4096)
+def format_brl(valor) -> str:
+    # Memoizado pelo próprio valor: constantes como HORA_CONSULTORIA e
+    # subtotais repetidos saem do cache sem conversão. Arredonda como
+    # centavos() e as contas (1.115 -> "R$ 1,12", não o ".2f" do double)
+    return _formatar(centavos(valor))
@@ -0,0 +1,84 @@
+# =========================
+# Documento TXT do orçamento (sem Streamlit)
+# =========================
+from datetime import datetime, timedelta
+
+from pricing import APP_NAME, format_brl
+
+def data_validade_str(dias: int, agora: datetime = None) -> str:
+    dt = (agora or datetime.now()) + timedelta(days=max(1, int(dias)))
+    return dt.strftime("%d/%m/%Y")
+
+def nome_arquivo(agora: datetime = None, sufixo: str = "", extensao: str = "txt") -> str:
+    carimbo = (agora or datetime.now()).strftime('%Y%m%d_%H%M%S')
+    return f"orcamento_TANKAR_{carimbo}{sufixo}.{extensao}"
+
+def nome_arquivo_txt(agora: datetime = None, sufixo: str = "") -> str:
+    return nome_arquivo(agora, sufixo, "txt")
+
+def iter_txt(itens, fin: dict, cliente_nome: str = "", cliente_contato: str = "",
+             consultor_nome: str = "", validade_dias: int = 7,
+             observacoes_finais: str = "", agora: datetime = None):
+    """Gera o documento em pedaços (cabeçalho, um por item, rodapé).
+
+    "".join(iter_txt(...)) é exatamente o texto de gerar_txt(); assim
+    orçamentos muito grandes podem ser gravados sem montar a string toda.
+    """
+    agora = agora or datetime.now()
+    yield "\n".join([
+        f"{APP_NAME}",
+        f"Data/Hora: {agora.strftime('%d/%m/%Y %H:%M')}",
+        "-"*70,
+        f"Cliente: {cliente_nome or '(não informado)'}",
+        f"Contato: {cliente_contato or '(não informado)'}",
+        f"Consultor Tankar: {consultor_nome or '(não informado)'}",
+        f"Validade: {validade_dias} dias (até {data_validade_str(validade_dias, agora)})",
+        "-"*70
+    ])
+    for idx, it in enumerate(itens, 1):
+        yield "\n" + "\n".join([
+            f"Item {idx}: {it['servico']}",
+            f"Descrição/Resumo: {it.get('descricao','-')}",
+            f"Detalhes: {it.get('detalhes','-')}",
+            f"Subtotal: {format_brl(it['subtotal'])}",
+            "-"*70
+        ])
+    yield "\n" + "\n".join([
+        "Informações gerais do orçamento:",
+        observacoes_finais.strip() or "(sem observações)",
+        "-"*70,
+        f"SUBTOTAL ITENS: {format_brl(fin['subtotal'])}",
+        f"DESPESAS: {format_brl(fin['despesas'])}",
+        f"IMPOSTOS ({fin['impostos_pct']}%): {format_brl(fin['impostos_valor'])}",
+        f"MARGEM ({fin['margem_pct']}%): {format_brl(fin['margem_valor'])}",
+        f"TOTAL GERAL: {format_brl(fin['total'])}",
+        "",
+        "Observações:",
+        "- Itens com 'sob consulta' poderão sofrer alteração após análise técnica.",
+        "- Custos de transporte, quando aplicáveis, foram somados em 'Despesas' ou serão calculados separadamente.",
+        "- Validade conforme indicada acima."
+    ])
+
+def gerar_txt(itens, fin: dict, **cabecalho) -> str:
+    return "".join(iter_txt(itens, fin, **cabecalho))
+
+def escrever_txt(destino, itens, fin: dict, tamanho_bloco: int = 64 * 1024, **cabecalho) -> int:
+    """Grava o documento em UTF-8 num arquivo binário ou socket, em blocos.
+
+    `destino` pode ter write() (arquivo aberto em "wb", BytesIO) ou
+    sendall() (socket). Retorna o número de bytes gravados.
+    """
+    enviar = getattr(destino, "sendall", None) or destino.write
+    buffer, tamanho, total = [], 0, 0
+    for pedaco in iter_txt(itens, fin, **cabecalho):
+        dados = pedaco.encode("utf-8")
+        buffer.append(dados)
+        tamanho += len(dados)
+        if tamanho >= tamanho_bloco:
+            enviar(b"".join(buffer))
+            total += tamanho
+            buffer, tamanho = [], 0
+    if buffer:
+        enviar(b"".join(buffer))
+        total += tamanho
+    return total
@@ -0,0 +1,215 @@
+# =========================
+# Documento PDF do orçamento (sem Streamlit, sem dependências)
+# =========================
+# Mesmo conteúdo do TXT (documento.iter_txt), diagramado em A4 com a faixa
+# do cabeçalho e o logo em todas as páginas. O PDF é escrito direto: as
+# fontes são as padrão do PDF (Courier/Helvetica, em WinAnsi, nada a
+# embutir) e o logo entra como o próprio JPEG, então roda offline. Fontes,
+# logo e o modelo da página são montados uma vez por processo; a geração
+# roda num pool de processos para não segurar o rerun do app.
+
+import multiprocessing
+import os
+import textwrap
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import ativos
+import documento
+
+# Processos que geram PDFs em segundo plano
+WORKERS = int(os.environ.get("TANKAR_PDF_WORKERS", "2"))
+
+LARGURA, ALTURA = 595.28, 841.89  # A4 em pontos
+MARGEM = 40
+FAIXA_ALTURA = 60
+CORPO_TAMANHO = 9
+ENTRELINHA = 11.5
+# Courier tem largura fixa de 0,6 em: cabem COLUNAS caracteres por linha
+COLUNAS = int((LARGURA - 2 * MARGEM) / (CORPO_TAMANHO * 0.6))
+SEPARADOR = "-" * 70
+TITULOS = {"Informações gerais do orçamento:", "Observações:"}
+
+def _pdf_texto(texto: str) -> bytes:
+    # String literal do PDF em WinAnsi (cp1252 cobre acentos, "—", "–", "×", "²")
+    dados = texto.encode("cp1252", "replace")
+    return b"(" + dados.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def _dimensoes_jpeg(dados: bytes):
+    # Largura e altura lidas do marcador SOF do JPEG
+    i = 2
+    while i < len(dados):
+        marcador, tamanho = dados[i + 1], int.from_bytes(dados[i + 2:i + 4], "big")
+        if marcador in (0xC0, 0xC1, 0xC2):
+            altura = int.from_bytes(dados[i + 5:i + 7], "big")
+            largura = int.from_bytes(dados[i + 7:i + 9], "big")
+            return largura, altura
+        i += 2 + tamanho
+    raise ValueError("JPEG sem marcador SOF")
+
+def _objeto_stream(dicionario: bytes, dados: bytes) -> bytes:
+    return b"<<" + dicionario + b" /Length %d>>\nstream\n" % len(dados) + dados + b"\nendstream"
+
+# Objetos fixos do documento (numeração igual em todos os PDFs)
+_OBJ_CATALOGO, _OBJ_PAGINAS, _OBJ_RECURSOS = 1, 2, 3
+_OBJ_FONTES = {b"F1": 4, b"F2": 5, b"F3": 6, b"F4": 7}
+_OBJ_LOGO = 8
+_PRIMEIRO_LIVRE = 9
+
+@lru_cache(maxsize=1)
+def _recursos() -> dict:
+    """Fontes, logo e modelo da página, prontos em bytes."""
+    try:
+        with open(ativos.LOGO_CABECALHO, "rb") as f:
+            logo = f.read()
+    except OSError:
+        logo = ativos.reduzir_logo()
+    larg, alt = _dimensoes_jpeg(logo)
+
+    fontes = {
+        b"F1": b"Courier", b"F2": b"Courier-Bold",
+        b"F3": b"Helvetica-Bold", b"F4": b"Helvetica",
+    }
+    objetos = {
+        _OBJ_RECURSOS: (
+            b"<< /Font << " + b" ".join(b"/%s %d 0 R" % (n, _OBJ_FONTES[n]) for n in fontes)
+            + b" >> /XObject << /Logo %d 0 R >> >>" % _OBJ_LOGO
+        ),
+        _OBJ_LOGO: _objeto_stream(
+            b"/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+            b"/BitsPerComponent 8 /Filter /DCTDecode" % (larg, alt), logo
+        ),
+    }
+    for nome, base in fontes.items():
+        objetos[_OBJ_FONTES[nome]] = (
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base
+        )
+
+    # Faixa do cabeçalho: fundo azul, filete verde, logo e título
+    topo = ALTURA - MARGEM
+    logo_alt = FAIXA_ALTURA - 16
+    logo_larg = logo_alt * larg / alt
+    modelo = b"\n".join([
+        b"q 0.043 0.235 0.365 rg %.2f %.2f %.2f %d re f Q" % (MARGEM, topo - FAIXA_ALTURA, LARGURA - 2 * MARGEM, FAIXA_ALTURA),
+        b"q 0.043 0.518 0.341 rg %.2f %.2f %.2f 4 re f Q" % (MARGEM, topo - FAIXA_ALTURA, LARGURA - 2 * MARGEM),
+        b"q %.2f 0 0 %.2f %.2f %.2f cm /Logo Do Q" % (logo_larg, logo_alt, MARGEM + 10, topo - FAIXA_ALTURA + 10),
+        b"BT 1 1 1 rg /F3 16 Tf %.2f %.2f Td " % (MARGEM + logo_larg + 22, topo - 28) + _pdf_texto("TANKAR IT QUOTE TOOL") + b" Tj ET",
+        b"BT 1 1 1 rg /F4 9 Tf %.2f %.2f Td " % (MARGEM + logo_larg + 22, topo - 44) + _pdf_texto("Orçamentos Multisserviço") + b" Tj ET",
+    ])
+    return {"objetos": objetos, "modelo": modelo}
+
+def _linhas(itens, fin: dict, **cabecalho):
+    """(estilo, texto) na ordem do documento TXT."""
+    for n, bloco in enumerate(documento.iter_txt(itens, fin, **cabecalho)):
+        linhas = bloco.split("\n")
+        if n:
+            linhas = linhas[1:]  # blocos seguintes começam com "\n"
+        for j, linha in enumerate(linhas):
+            if linha == SEPARADOR:
+                yield "regua", ""
+                continue
+            if n == 0 and j == 0:
+                estilo = "titulo"
+            elif linha.startswith("TOTAL GERAL:"):
+                estilo = "total"
+            elif (n > 0 and j == 0) or linha in TITULOS:
+                estilo = "negrito"
+            else:
+                estilo = "normal"
+            if len(linha) <= COLUNAS:
+                yield estilo, linha
+            else:
+                for parte in textwrap.wrap(linha, COLUNAS, subsequent_indent="  ") or [""]:
+                    yield estilo, parte
+
+_FONTE = {"normal": b"/F1 9 Tf", "negrito": b"/F2 9 Tf", "titulo": b"/F3 12 Tf", "total": b"/F2 11 Tf"}
+_ALTURA_LINHA = {"titulo": 16, "total": 15, "regua": 8}
+
+def _paginar(linhas):
+    paginas, ops = [], []
+    y_inicio = ALTURA - MARGEM - FAIXA_ALTURA - 18
+    y = y_inicio
+    for estilo, texto in linhas:
+        altura = _ALTURA_LINHA.get(estilo, ENTRELINHA)
+        if y - altura < MARGEM + 20:
+            paginas.append(ops)
+            ops, y = [], y_inicio
+        y -= altura
+        if estilo == "regua":
+            ops.append(b"%.2f %.2f m %.2f %.2f l S" % (MARGEM, y + 4, LARGURA - MARGEM, y + 4))
+        elif texto:
+            ops.append(b"BT " + _FONTE[estilo] + b" %.2f %.2f Td " % (MARGEM, y) + _pdf_texto(texto) + b" Tj ET")
+    paginas.append(ops)
+    return paginas
+
+def gerar_pdf(itens, fin: dict, **cabecalho) -> bytes:
+    """PDF do orçamento; aceita os mesmos argumentos de documento.gerar_txt."""
+    recursos = _recursos()
+    paginas = _paginar(_linhas(itens, fin, **cabecalho))
+    total = len(paginas)
+
+    objetos = dict(recursos["objetos"])
+    kids = []
+    for i, ops in enumerate(paginas, 1):
+        num_pagina, num_conteudo = _PRIMEIRO_LIVRE + 2 * (i - 1), _PRIMEIRO_LIVRE + 2 * (i - 1) + 1
+        rodape = _pdf_texto(f"Página {i} de {total}")
+        conteudo = b"\n".join([
+            recursos["modelo"],
+            b"0.6 0.65 0.7 RG 0.5 w 0 0 0 rg",
+            *ops,
+            b"BT /F1 8 Tf %.2f %.2f Td " % (LARGURA - MARGEM - 4.8 * (len(rodape) - 2), MARGEM) + rodape + b" Tj ET",
+        ])
+        objetos[num_conteudo] = _objeto_stream(b"/Filter /FlateDecode", zlib.compress(conteudo, 6))
+        objetos[num_pagina] = (
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] /Resources %d 0 R /Contents %d 0 R >>"
+            % (_OBJ_PAGINAS, LARGURA, ALTURA, _OBJ_RECURSOS, num_conteudo)
+        )
+        kids.append(b"%d 0 R" % num_pagina)
+    objetos[_OBJ_CATALOGO] = b"<< /Type /Catalog /Pages %d 0 R >>" % _OBJ_PAGINAS
+    objetos[_OBJ_PAGINAS] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % total
+
+    saida = [b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"]
+    posicao = len(saida[0])
+    deslocamentos = []
+    for num in range(1, max(objetos) + 1):
+        deslocamentos.append(posicao)
+        obj = b"%d 0 obj\n" % num + objetos[num] + b"\nendobj\n"
+        saida.append(obj)
+        posicao += len(obj)
+    saida.append(b"xref\n0 %d\n0000000000 65535 f \n" % (len(deslocamentos) + 1))
+    saida.extend(b"%010d 00000 n \n" % d for d in deslocamentos)
+    saida.append(
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(deslocamentos) + 1, _OBJ_CATALOGO, posicao)
+    )
+    return b"".join(saida)
+
+def nome_arquivo_pdf(agora=None, sufixo: str = "") -> str:
+    return documento.nome_arquivo(agora, sufixo, "pdf")
+
+# =========================
+# Geração em segundo plano
+# =========================
+_pool = None
+_lock_pool = threading.Lock()
+
+def _aquecer():
+    # Cada processo do pool carrega fontes, logo e modelo uma única vez
+    _recursos()
+
+def pool_pdf() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _lock_pool:
+            if _pool is None:
+                # "spawn": o servidor do Streamlit tem várias threads e não deve ser copiado com fork
+                _pool = ProcessPoolExecutor(
+                    max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"), initializer=_aquecer
+                )
+    return _pool
+
+def gerar_pdf_em_segundo_plano(itens, fin: dict, **cabecalho):
+    """Enfileira a geração no pool e devolve um Future com os bytes do PDF."""
+    return pool_pdf().submit(gerar_pdf, list(itens), fin, **cabecalho)
@@ -0,0 +1,201 @@
+"""Exportação analítica do histórico de orçamentos (colunar, sem Streamlit).
+
+Grava os orçamentos salvos no armazém em duas tabelas, para que relatórios
+(receita por serviço, andares dos surveys, distribuição de margem) leiam
+só as colunas que usam em vez de interpretar o TXT:
+
+    <destino>/orcamentos/parte-NNNNNN.<ext>   um orçamento por linha, com o
+                                              financeiro em centavos
+    <destino>/itens/parte-NNNNNN.<ext>        um item por linha, com serviço,
+                                              variante e quantidades
+
+Formatos: Parquet (padrão), Arrow IPC (.arrow) ou CSV, que é o único
+disponível sem pyarrow. Cada execução só acrescenta partes novas com os
+orçamentos salvos desde a anterior (marca.json guarda até onde foi); as
+partes já gravadas não são reescritas. Orçamento regravado aparece de
+novo com atualizado_em maior: nas consultas vale a linha mais recente de
+cada orcamento_id.
+
+Leitura, por exemplo:
+    import pyarrow.dataset as ds
+    ds.dataset("analise/itens").to_table(columns=["servico", "subtotal_centavos"])
+
+Uso:
+    python exportacao.py analise/                  # Parquet
+    python exportacao.py analise_csv/ --formato csv
+"""
+import argparse
+import csv
+import json
+import os
+from datetime import datetime, timedelta
+
+import pricing
+from armazem import CAMINHO_PADRAO, ArmazemOrcamentos, armazem_padrao
+from dinheiro import pontos_base
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # sem pyarrow, só CSV
+    pa = None
+
+FORMATOS = ("parquet", "arrow", "csv")
+# Orçamentos por parte (os itens deles vão na parte de mesmo número)
+ORCAMENTOS_POR_PARTE = 50_000
+# Só entram orçamentos salvos há mais que isso: os mais recentes podem
+# ainda estar na fila da thread gravadora com um atualizado_em anterior
+ATRASO = timedelta(minutes=1)
+MARCA = "marca.json"
+
+# (coluna, tipo Arrow); o CSV grava os mesmos campos como texto
+_ORCAMENTOS = (
+    ("orcamento_id", "int64"), ("criado_em", "timestamp"), ("atualizado_em", "timestamp"),
+    ("cliente_nome", "string"), ("consultor_nome", "string"), ("validade_dias", "int32"),
+    ("n_itens", "int32"), ("subtotal_centavos", "int64"), ("despesas_centavos", "int64"),
+    ("impostos_pct", "float64"), ("impostos_centavos", "int64"),
+    ("margem_pct", "float64"), ("margem_centavos", "int64"), ("total_centavos", "int64"),
+)
+_ITENS = (
+    ("orcamento_id", "int64"), ("atualizado_em", "timestamp"), ("posicao", "int32"),
+    ("servico", "string"), ("variante", "string"), ("subtotal_centavos", "int64"),
+    ("horas", "int32"), ("andares", "int32"), ("funcionarios", "int32"),
+)
+
+def formato_padrao() -> str:
+    return "parquet" if pa is not None else "csv"
+
+def _paginas(conn, chave: tuple, corte: str):
+    # Páginas de orçamentos na ordem (atualizado_em, id), com os itens de cada página
+    while True:
+        orcamentos = conn.execute(
+            "SELECT id, criado_em, atualizado_em, cliente_nome, consultor_nome, validade_dias, n_itens, "
+            "subtotal_centavos, despesas_centavos, impostos_pct, margem_pct, total_centavos "
+            "FROM orcamentos WHERE (atualizado_em, id) > (?, ?) AND atualizado_em < ? "
+            "ORDER BY atualizado_em, id LIMIT ?",
+            (*chave, corte, ORCAMENTOS_POR_PARTE),
+        ).fetchall()
+        if not orcamentos:
+            return
+        ultima = (orcamentos[-1]["atualizado_em"], orcamentos[-1]["id"])
+        itens = conn.execute(
+            "SELECT o.id, o.atualizado_em, i.posicao, i.servico, i.subtotal_centavos, "
+            "i.horas, i.andares, i.funcionarios "
+            "FROM orcamentos o JOIN itens i ON i.orcamento_id = o.id "
+            "WHERE (o.atualizado_em, o.id) > (?, ?) AND (o.atualizado_em, o.id) <= (?, ?) "
+            "ORDER BY o.atualizado_em, o.id, i.posicao",
+            (*chave, *ultima),
+        ).fetchall()
+        yield orcamentos, itens, ultima
+        chave = ultima
+
+def _linhas_orcamentos(orcamentos):
+    for o in orcamentos:
+        # Impostos e margem em centavos pela mesma regra do documento
+        c = pricing.financeiros_centavos(
+            o["subtotal_centavos"], o["despesas_centavos"], pontos_base(o["impostos_pct"]), pontos_base(o["margem_pct"])
+        )
+        yield (
+            o["id"], o["criado_em"], o["atualizado_em"], o["cliente_nome"], o["consultor_nome"],
+            o["validade_dias"], o["n_itens"], o["subtotal_centavos"], o["despesas_centavos"],
+            o["impostos_pct"], c["impostos_valor"], o["margem_pct"], c["margem_valor"], o["total_centavos"],
+        )
+
+def _linhas_itens(itens):
+    for orcamento_id, atualizado_em, posicao, servico, subtotal_c, horas, andares, funcionarios in itens:
+        # "Design de Rede — Wireless" -> serviço base + variante
+        base, _, variante = servico.partition(" — ")
+        yield orcamento_id, atualizado_em, posicao, base, variante or None, subtotal_c, horas, andares, funcionarios
+
+def _coluna(valores, tipo: str):
+    if tipo == "timestamp":
+        return pa.array(valores, pa.string()).cast(pa.timestamp("s"))
+    return pa.array(valores, getattr(pa, tipo)())
+
+def _gravar_parte(caminho: str, colunas: tuple, linhas: list, formato: str):
+    # Grava ao lado e renomeia: uma parte nunca fica pela metade
+    temporario = caminho + ".tmp"
+    if formato == "csv":
+        with open(temporario, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(nome for nome, _ in colunas)
+            escritor.writerows(linhas)
+    else:
+        valores = list(zip(*linhas)) or [()] * len(colunas)
+        tabela = pa.table({nome: _coluna(v, tipo) for (nome, tipo), v in zip(colunas, valores)})
+        if formato == "parquet":
+            pq.write_table(tabela, temporario, compression="zstd")
+        else:
+            feather.write_feather(tabela, temporario, compression="zstd")
+    os.replace(temporario, caminho)
+
+def _ler_marca(destino: str) -> dict:
+    try:
+        with open(os.path.join(destino, MARCA), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"formato": None, "parte": 0, "atualizado_em": "", "id": 0}
+
+def _gravar_marca(destino: str, marca: dict):
+    caminho = os.path.join(destino, MARCA)
+    with open(caminho + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(marca, f, ensure_ascii=False, indent=2)
+    os.replace(caminho + ".tmp", caminho)
+
+def exportar(destino: str, formato: str = None, armazem: ArmazemOrcamentos = None,
+             ate: datetime = None) -> dict:
+    """Acrescenta em `destino` os orçamentos salvos desde a última exportação.
+
+    `ate` limita aos salvos antes desse instante (padrão: agora - ATRASO).
+    Retorna {"orcamentos": n, "itens": n, "partes": n}. Um destino fica
+    num formato só; trocar de formato pede outro destino.
+    """
+    formato = formato or formato_padrao()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato!r} (use {', '.join(FORMATOS)}).")
+    if formato != "csv" and pa is None:
+        raise ValueError(f"{formato} precisa do pyarrow; use formato='csv'.")
+    marca = _ler_marca(destino)
+    if marca["formato"] not in (None, formato):
+        raise ValueError(f"{destino} já tem exportação em {marca['formato']}.")
+    corte = (ate or datetime.now() - ATRASO).strftime("%Y-%m-%d %H:%M:%S")
+    for tabela in ("orcamentos", "itens"):
+        os.makedirs(os.path.join(destino, tabela), exist_ok=True)
+
+    resumo = {"orcamentos": 0, "itens": 0, "partes": 0}
+    with (armazem or armazem_padrao()).conexao() as conn:
+        # Uma transação de leitura: todas as páginas veem o mesmo estado do banco
+        conn.execute("BEGIN")
+        try:
+            for orcamentos, itens, ultima in _paginas(conn, (marca["atualizado_em"], marca["id"]), corte):
+                parte = f"parte-{marca['parte'] + 1:06d}.{formato}"
+                _gravar_parte(os.path.join(destino, "orcamentos", parte), _ORCAMENTOS,
+                              list(_linhas_orcamentos(orcamentos)), formato)
+                _gravar_parte(os.path.join(destino, "itens", parte), _ITENS, list(_linhas_itens(itens)), formato)
+                marca.update(formato=formato, parte=marca["parte"] + 1, atualizado_em=ultima[0], id=ultima[1])
+                _gravar_marca(destino, marca)
+                resumo["orcamentos"] += len(orcamentos)
+                resumo["itens"] += len(itens)
+                resumo["partes"] += 1
+        finally:
+            conn.execute("COMMIT")
+    return resumo
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta o histórico de orçamentos em formato colunar.")
+    parser.add_argument("destino", help="pasta da exportação (as execuções seguintes acrescentam nela)")
+    parser.add_argument("--formato", choices=FORMATOS, default=None, help=f"padrão: {formato_padrao()}")
+    parser.add_argument("--banco", default=CAMINHO_PADRAO, help="arquivo SQLite do armazém")
+    args = parser.parse_args(argv)
+    armazem = ArmazemOrcamentos(args.banco)
+    try:
+        resumo = exportar(args.destino, args.formato, armazem)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        armazem.fechar()
+    print(f"{resumo['orcamentos']} orçamentos e {resumo['itens']} itens em {resumo['partes']} parte(s) nova(s)")
+
+if __name__ == "__main__":
+    main()
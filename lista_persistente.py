@@ -0,0 +1,172 @@
+# =========================
+# Lista persistente (compartilhamento estrutural)
+# =========================
+# Árvore de tuplas com até RAMOS filhos por nó e o tamanho acumulado de
+# cada filho. Incluir, excluir ou trocar um elemento devolve uma lista
+# nova que copia só o caminho da raiz até a folha alterada (O(log n)
+# referências); o resto da árvore é compartilhado com a versão anterior.
+# Assim cada versão guardada custa proporcional à alteração, não ao
+# tamanho da lista.
+
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+RAMOS = 32
+
+class _No:
+    __slots__ = ("filhos", "fins")
+
+    def __init__(self, filhos: tuple, altura: int):
+        self.filhos = filhos
+        # Posição final (exclusiva) de cada filho dentro do nó; em array para
+        # não alocar um int por posição a cada cópia de caminho
+        if altura == 1:
+            self.fins = array("q", accumulate(len(f) for f in filhos))
+        else:
+            self.fins = array("q", accumulate(f.fins[-1] for f in filhos))
+
+def _grupos(nos: list, altura: int) -> list:
+    return [_No(tuple(nos[i:i + RAMOS]), altura) for i in range(0, len(nos), RAMOS)]
+
+def _filho(no: _No, i: int):
+    # (índice do filho que contém a posição i, posição inicial desse filho)
+    j = min(bisect_right(no.fins, i), len(no.filhos) - 1)
+    return j, (no.fins[j - 1] if j else 0)
+
+def _dividir(filhos: tuple, altura: int) -> tuple:
+    if len(filhos) <= RAMOS:
+        return (_No(filhos, altura),)
+    meio = len(filhos) // 2
+    return _No(filhos[:meio], altura), _No(filhos[meio:], altura)
+
+def _inserir(no, altura: int, i: int, valor) -> tuple:
+    # Devolve 1 nó (ou 2, se o nó passou de RAMOS e foi dividido)
+    if altura == 0:
+        folha = no[:i] + (valor,) + no[i:]
+        if len(folha) <= RAMOS:
+            return (folha,)
+        meio = len(folha) // 2
+        return folha[:meio], folha[meio:]
+    j, inicio = _filho(no, i)
+    novos = _inserir(no.filhos[j], altura - 1, i - inicio, valor)
+    return _dividir(no.filhos[:j] + novos + no.filhos[j + 1:], altura)
+
+def _remover(no, altura: int, i: int):
+    # Devolve o nó sem o elemento i (None se ficou vazio)
+    if altura == 0:
+        return no[:i] + no[i + 1:] or None
+    j, inicio = _filho(no, i)
+    novo = _remover(no.filhos[j], altura - 1, i - inicio)
+    if novo is None:
+        filhos = no.filhos[:j] + no.filhos[j + 1:]
+    elif altura == 1 and len(novo) < RAMOS // 4 and len(no.filhos) > 1:
+        # Folha pequena demais: junta com a vizinha quando cabe
+        k = j - 1 if j else j + 1
+        a, b = (no.filhos[k], novo) if k < j else (novo, no.filhos[k])
+        if len(a) + len(b) <= RAMOS:
+            inicio_par = min(j, k)
+            filhos = no.filhos[:inicio_par] + (a + b,) + no.filhos[inicio_par + 2:]
+        else:
+            filhos = no.filhos[:j] + (novo,) + no.filhos[j + 1:]
+    else:
+        filhos = no.filhos[:j] + (novo,) + no.filhos[j + 1:]
+    return _No(filhos, altura) if filhos else None
+
+def _substituir(no, altura: int, i: int, valor):
+    if altura == 0:
+        return no[:i] + (valor,) + no[i + 1:]
+    j, inicio = _filho(no, i)
+    filhos = no.filhos[:j] + (_substituir(no.filhos[j], altura - 1, i - inicio, valor),) + no.filhos[j + 1:]
+    return _No(filhos, altura)
+
+class ListaPersistente:
+    """Sequência imutável; as alterações devolvem uma lista nova."""
+    __slots__ = ("_raiz", "_altura", "_tamanho")
+
+    def __init__(self, raiz=(), altura: int = 0, tamanho: int = 0):
+        self._raiz = raiz
+        self._altura = altura
+        self._tamanho = tamanho
+
+    @classmethod
+    def de(cls, valores=()) -> "ListaPersistente":
+        valores = tuple(valores)
+        if len(valores) <= RAMOS:
+            return cls(valores, 0, len(valores))
+        nos = [valores[i:i + RAMOS] for i in range(0, len(valores), RAMOS)]
+        altura = 0
+        while len(nos) > 1:
+            altura += 1
+            nos = _grupos(nos, altura)
+        return cls(nos[0], altura, len(valores))
+
+    # --- leitura ---
+    def __len__(self):
+        return self._tamanho
+
+    def _folhas(self):
+        pilha = [(self._raiz, self._altura)]
+        while pilha:
+            no, altura = pilha.pop()
+            if altura == 0:
+                yield no
+            else:
+                pilha.extend((f, altura - 1) for f in reversed(no.filhos))
+
+    def __iter__(self):
+        for folha in self._folhas():
+            yield from folha
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self._tamanho))]
+        if i < 0:
+            i += self._tamanho
+        if not 0 <= i < self._tamanho:
+            raise IndexError("índice fora da lista")
+        no = self._raiz
+        for _ in range(self._altura):
+            j, inicio = _filho(no, i)
+            no, i = no.filhos[j], i - inicio
+        return no[i]
+
+    def __repr__(self):
+        return f"ListaPersistente({list(self)!r})"
+
+    # --- alterações (devolvem uma lista nova) ---
+    def inserir(self, i: int, valor) -> "ListaPersistente":
+        i = max(0, min(i, self._tamanho))
+        novos = _inserir(self._raiz, self._altura, i, valor)
+        if len(novos) == 1:
+            return ListaPersistente(novos[0], self._altura, self._tamanho + 1)
+        return ListaPersistente(_No(novos, self._altura + 1), self._altura + 1, self._tamanho + 1)
+
+    def anexar(self, valor) -> "ListaPersistente":
+        return self.inserir(self._tamanho, valor)
+
+    def estender(self, valores) -> "ListaPersistente":
+        lista = self
+        for valor in valores:
+            lista = lista.anexar(valor)
+        return lista
+
+    def remover(self, i: int) -> "ListaPersistente":
+        if i < 0:
+            i += self._tamanho
+        if not 0 <= i < self._tamanho:
+            raise IndexError("índice fora da lista")
+        raiz, altura = _remover(self._raiz, self._altura, i), self._altura
+        if raiz is None:
+            return ListaPersistente()
+        # Raiz com um filho só: desce um nível
+        while altura and len(raiz.filhos) == 1:
+            raiz, altura = raiz.filhos[0], altura - 1
+        return ListaPersistente(raiz, altura, self._tamanho - 1)
+
+    def substituir(self, i: int, valor) -> "ListaPersistente":
+        if i < 0:
+            i += self._tamanho
+        if not 0 <= i < self._tamanho:
+            raise IndexError("índice fora da lista")
+        return ListaPersistente(_substituir(self._raiz, self._altura, i, valor), self._altura, self._tamanho)
@@ -0,0 +1,178 @@
+# =========================
+# Métricas por rerun (sem Streamlit)
+# =========================
+# Cada rerun do app vira um Rerun: o script marca o início de cada seção
+# com etapa("nome") e o tempo entre marcas é atribuído à seção. Ao
+# concluir, os tempos entram em histogramas agregados do processo (texto
+# Prometheus em /metrics) e reruns acima do limite vão para o log com
+# sessão e quantidade de itens. Custo por marca: um perf_counter e uma
+# soma em dict.
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_LOGGER = logging.getLogger(__name__)
+
+# Reruns acima deste tempo (ms) são registrados no log
+LIMITE_LENTO_MS = float(os.environ.get("TANKAR_RERUN_LENTO_MS", "500"))
+# Porta local do /metrics ("0" desliga)
+PORTA_PADRAO = int(os.environ.get("TANKAR_METRICAS_PORTA", "9464"))
+# Limites superiores dos baldes, em segundos
+BALDES = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+def faixa_itens(n_itens: int) -> str:
+    # Rótulo de baixa cardinalidade para o tamanho do orçamento
+    if n_itens <= 10:
+        return "0-10"
+    if n_itens <= 100:
+        return "11-100"
+    if n_itens <= 1000:
+        return "101-1000"
+    return "1000+"
+
+class Histograma:
+    __slots__ = ("contagens", "soma", "total")
+
+    def __init__(self):
+        self.contagens = [0] * (len(BALDES) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, segundos: float):
+        self.contagens[bisect_left(BALDES, segundos)] += 1
+        self.soma += segundos
+        self.total += 1
+
+_lock = threading.Lock()
+# (nome da métrica, rótulos ordenados) -> Histograma
+_histogramas = {}
+_lentos = {}
+
+def _observar(metrica: str, rotulos: tuple, segundos: float):
+    chave = (metrica, rotulos)
+    h = _histogramas.get(chave)
+    if h is None:
+        h = _histogramas.setdefault(chave, Histograma())
+    h.observar(segundos)
+
+class Rerun:
+    """Tempos de um rerun do script (completo) ou de um fragmento."""
+    __slots__ = ("sessao", "tipo", "n_itens", "secoes", "_etapa", "_t", "_concluido")
+
+    def __init__(self, sessao: str, n_itens: int = 0, tipo: str = "completo"):
+        self.sessao = sessao
+        self.tipo = tipo
+        self.n_itens = n_itens
+        self.secoes = {}
+        self._etapa = None
+        self._t = time.perf_counter()
+        self._concluido = False
+
+    def etapa(self, nome):
+        # Fecha a seção em andamento e abre `nome` (None só fecha)
+        agora = time.perf_counter()
+        if self._etapa is not None:
+            self.secoes[self._etapa] = self.secoes.get(self._etapa, 0.0) + (agora - self._t)
+        self._etapa = nome
+        self._t = agora
+
+    def concluir(self):
+        if self._concluido:
+            return
+        self._concluido = True
+        self.etapa(None)
+        total = sum(self.secoes.values())
+        faixa = faixa_itens(self.n_itens)
+        with _lock:
+            for secao, segundos in self.secoes.items():
+                _observar("tankar_secao_segundos", (("secao", secao), ("tipo", self.tipo)), segundos)
+            _observar("tankar_rerun_segundos", (("itens", faixa), ("tipo", self.tipo)), total)
+            if total * 1000 >= LIMITE_LENTO_MS:
+                _lentos[self.tipo] = _lentos.get(self.tipo, 0) + 1
+        if total * 1000 >= LIMITE_LENTO_MS:
+            detalhe = ", ".join(f"{s} {t * 1000:.1f}" for s, t in sorted(self.secoes.items(), key=lambda x: -x[1]))
+            _LOGGER.warning(
+                "Rerun lento (%s): %.0f ms | sessão %s | %d itens | ms por seção: %s",
+                self.tipo, total * 1000, self.sessao, self.n_itens, detalhe,
+            )
+
+# =========================
+# Exportação Prometheus
+# =========================
+_AJUDA = {
+    "tankar_secao_segundos": "Duração de cada seção do quote.py por rerun",
+    "tankar_rerun_segundos": "Duração total do rerun por tamanho do orçamento",
+}
+
+def _rotulos_txt(rotulos) -> str:
+    return ",".join(f'{k}="{v}"' for k, v in rotulos)
+
+def texto_prometheus() -> str:
+    with _lock:
+        copia = sorted((k, list(h.contagens), h.soma, h.total) for k, h in _histogramas.items())
+        lentos = dict(_lentos)
+    linhas = []
+    metrica_atual = None
+    for (metrica, rotulos), contagens, soma, total in copia:
+        if metrica != metrica_atual:
+            metrica_atual = metrica
+            linhas.append(f"# HELP {metrica} {_AJUDA[metrica]}")
+            linhas.append(f"# TYPE {metrica} histogram")
+        base = _rotulos_txt(rotulos)
+        acumulado = 0
+        for limite, n in zip(BALDES + ("+Inf",), contagens):
+            acumulado += n
+            linhas.append(f'{metrica}_bucket{{{base},le="{limite}"}} {acumulado}')
+        linhas.append(f"{metrica}_sum{{{base}}} {soma:.6f}")
+        linhas.append(f"{metrica}_count{{{base}}} {total}")
+    linhas.append(f"# HELP tankar_reruns_lentos_total Reruns acima de {LIMITE_LENTO_MS:.0f} ms")
+    linhas.append("# TYPE tankar_reruns_lentos_total counter")
+    for tipo, n in sorted(lentos.items()):
+        linhas.append(f'tankar_reruns_lentos_total{{tipo="{tipo}"}} {n}')
+    return "\n".join(linhas) + "\n"
+
+class _Manipulador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        corpo = texto_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+def iniciar_servidor(porta: int = PORTA_PADRAO, endereco: str = "127.0.0.1"):
+    """Sobe o /metrics numa thread daemon; devolve o servidor ou None."""
+    if not porta:
+        return None
+    try:
+        servidor = ThreadingHTTPServer((endereco, porta), _Manipulador)
+    except OSError as e:
+        _LOGGER.warning("Endpoint de métricas indisponível em %s:%s: %s", endereco, porta, e)
+        return None
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="metricas-http", daemon=True).start()
+    _LOGGER.info("Métricas em http://%s:%s/metrics", endereco, servidor.server_port)
+    return servidor
+
+_servidor = None
+_servidor_iniciado = False
+
+def servidor_padrao():
+    # /metrics uma vez por processo, na porta de TANKAR_METRICAS_PORTA
+    global _servidor, _servidor_iniciado
+    if not _servidor_iniciado:
+        with _lock:
+            if not _servidor_iniciado:
+                _servidor = iniciar_servidor()
+                _servidor_iniciado = True
+    return _servidor
@@ -0,0 +1,212 @@
+# =========================
+# Orçamento com totais incrementais (sem Streamlit)
+# =========================
+# Mantém a lista de itens e o subtotal atualizados a cada alteração,
+# em vez de somar todos os itens a cada rerun. O resumo financeiro é
+# recalculado só quando os itens ou os parâmetros financeiros mudam.
+# Cada alteração guarda uma versão (lista persistente, que compartilha os
+# itens não alterados com as versões anteriores) para desfazer/refazer.
+
+from difflib import SequenceMatcher
+
+import pricing
+from lista_persistente import ListaPersistente
+from pricing import ItemOrcamento
+
+# Versões guardadas para desfazer (a mais antiga sai primeiro)
+HISTORICO_MAX = 200
+
+class Versao:
+    # A descrição fica como (modelo, argumentos) e só é formatada quando exibida.
+    # `numero` cresce a cada versão e não muda quando as antigas saem do histórico.
+    __slots__ = ("numero", "itens", "subtotal_c", "alteracao")
+
+    def __init__(self, numero: int, itens: ListaPersistente, subtotal_c: int, alteracao: tuple):
+        self.numero = numero
+        self.itens = itens
+        self.subtotal_c = subtotal_c
+        self.alteracao = alteracao
+
+    @property
+    def descricao(self) -> str:
+        modelo, *args = self.alteracao
+        return modelo.format(*args)
+
+class Orcamento:
+    def __init__(self, itens=()):
+        itens = [ItemOrcamento.de(item) for item in itens]
+        self._itens = ListaPersistente.de(itens)
+        self._subtotal_c = sum(item.centavos for item in itens)
+        self._versao = 0
+        self._fin_chave = None
+        self._fin = None
+        self._versoes = [Versao(0, self._itens, self._subtotal_c, ("Início",))]
+        self._atual = 0
+        self._proximo_numero = 1
+
+    # --- leitura ---
+    @property
+    def itens(self) -> ListaPersistente:
+        # Imutável: pode ser guardada ou enviada sem cópia; altere via métodos abaixo
+        return self._itens
+
+    @property
+    def subtotal(self) -> float:
+        return self._subtotal_c / 100
+
+    @property
+    def subtotal_centavos(self) -> int:
+        return self._subtotal_c
+
+    @property
+    def versao(self) -> int:
+        # Incrementa a cada alteração; serve de chave barata para caches
+        return self._versao
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __iter__(self):
+        return iter(self._itens)
+
+    def __getitem__(self, idx):
+        return self._itens[idx]
+
+    def financeiro(self, despesas=0.0, impostos_pct=0.0, margem_pct=0.0) -> dict:
+        chave = (self._versao, despesas, impostos_pct, margem_pct)
+        if chave != self._fin_chave:
+            self._fin = pricing.total_com_financeiros(
+                self.subtotal, despesas, impostos_pct, margem_pct, subtotal_centavos=self._subtotal_c
+            )
+            self._fin_chave = chave
+        return self._fin
+
+    # --- alterações (cada uma vira uma versão) ---
+    def _alterado(self, itens: ListaPersistente, subtotal_c: int, *alteracao):
+        self._itens = itens
+        self._subtotal_c = subtotal_c
+        self._versao += 1
+        # Alteração nova descarta o que podia ser refeito
+        del self._versoes[self._atual + 1:]
+        self._versoes.append(Versao(self._proximo_numero, itens, subtotal_c, alteracao))
+        self._proximo_numero += 1
+        if len(self._versoes) > HISTORICO_MAX:
+            del self._versoes[0]
+        self._atual = len(self._versoes) - 1
+
+    def add_item(self, item):
+        item = ItemOrcamento.de(item)
+        self._alterado(
+            self._itens.anexar(item), self._subtotal_c + item.centavos,
+            "Incluir item {}: {}", len(self._itens) + 1, item.servico,
+        )
+
+    def add_itens(self, itens):
+        # Vários itens numa única alteração (uma versão nova só)
+        novos = [ItemOrcamento.de(item) for item in itens]
+        if novos:
+            self._alterado(
+                self._itens.estender(novos), self._subtotal_c + sum(item.centavos for item in novos),
+                "Incluir {} itens", len(novos),
+            )
+
+    def delete_item(self, idx: int):
+        if 0 <= idx < len(self._itens):
+            item = self._itens[idx]
+            self._alterado(
+                self._itens.remover(idx), self._subtotal_c - item.centavos,
+                "Excluir item {}: {}", idx + 1, item.servico,
+            )
+
+    def duplicate_item(self, idx: int):
+        if 0 <= idx < len(self._itens):
+            # Itens são imutáveis: a cópia compartilha o mesmo objeto
+            item = self._itens[idx]
+            self._alterado(
+                self._itens.anexar(item), self._subtotal_c + item.centavos, "Duplicar item {}: {}", idx + 1, item.servico
+            )
+
+    def limpar(self):
+        if self._itens:
+            self._alterado(ListaPersistente(), 0, "Limpar {} itens", len(self._itens))
+
+    # --- versões: desfazer, refazer, comparar ---
+    @property
+    def pode_desfazer(self) -> bool:
+        return self._atual > 0
+
+    @property
+    def pode_refazer(self) -> bool:
+        return self._atual < len(self._versoes) - 1
+
+    @property
+    def descricao_desfazer(self) -> str:
+        return self._versoes[self._atual].descricao if self.pode_desfazer else ""
+
+    @property
+    def descricao_refazer(self) -> str:
+        return self._versoes[self._atual + 1].descricao if self.pode_refazer else ""
+
+    @property
+    def versao_atual(self) -> int:
+        # Número da versão atual (o mesmo de versoes())
+        return self._versoes[self._atual].numero
+
+    def versoes(self) -> list:
+        # [(número, descrição, nº de itens, subtotal), ...] da mais antiga à mais recente
+        return [(v.numero, v.descricao, len(v.itens), v.subtotal_c / 100) for v in self._versoes]
+
+    def _indice(self, numero: int) -> int:
+        for i, v in enumerate(self._versoes):
+            if v.numero == numero:
+                return i
+        raise KeyError(f"versão {numero} não está no histórico")
+
+    def _ir_para(self, indice: int):
+        v = self._versoes[indice]
+        self._atual = indice
+        self._itens = v.itens
+        self._subtotal_c = v.subtotal_c
+        self._versao += 1
+
+    def desfazer(self):
+        if self.pode_desfazer:
+            self._ir_para(self._atual - 1)
+
+    def refazer(self):
+        if self.pode_refazer:
+            self._ir_para(self._atual + 1)
+
+    def restaurar(self, numero: int):
+        # Volta ao conteúdo de uma versão antiga como alteração nova (dá para desfazer)
+        v = self._versoes[self._indice(numero)]
+        self._alterado(v.itens, v.subtotal_c, "Restaurar versão {}", numero)
+
+    def diferencas(self, de: int, para: int = None) -> list:
+        """Itens excluídos e incluídos entre duas versões (pelos números de versoes()).
+
+        [("-", posição na versão `de`, item) ou ("+", posição na versão `para`, item), ...]
+        """
+        antes = self._versoes[self._indice(de)].itens
+        depois = self._itens if para is None else self._versoes[self._indice(para)].itens
+        return diferencas(antes, depois)
+
+def diferencas(antes, depois) -> list:
+    a, b = list(antes), list(depois)
+    # Itens são imutáveis e compartilhados entre versões: compara por identidade
+    ini = 0
+    while ini < len(a) and ini < len(b) and a[ini] is b[ini]:
+        ini += 1
+    fim_a, fim_b = len(a), len(b)
+    while fim_a > ini and fim_b > ini and a[fim_a - 1] is b[fim_b - 1]:
+        fim_a -= 1
+        fim_b -= 1
+    ids_a = [id(x) for x in a[ini:fim_a]]
+    ids_b = [id(x) for x in b[ini:fim_b]]
+    saida = []
+    for op, i1, i2, j1, j2 in SequenceMatcher(None, ids_a, ids_b, autojunk=False).get_opcodes():
+        if op in ("delete", "replace"):
+            saida.extend(("-", ini + i, a[ini + i]) for i in range(i1, i2))
+        if op in ("insert", "replace"):
+            saida.extend(("+", ini + j, b[ini + j]) for j in range(j1, j2))
+    return saida
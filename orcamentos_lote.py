@@ -0,0 +1,357 @@
+"""Geração de orçamentos em lote a partir de CSV/JSONL.
+
+Lê os pedidos em streaming, precifica com pricing.py e grava os mesmos
+documentos TXT do app (um arquivo por orçamento ou um único ZIP),
+usando um pool de processos. A memória fica limitada pela janela de
+lotes em andamento, não pelo tamanho da entrada.
+
+Formatos de entrada:
+
+- JSONL: um orçamento por linha, com os campos do cabeçalho e a lista
+  "itens" (cada item com "servico" e os campos abaixo).
+- CSV: um item por linha; linhas consecutivas com a mesma coluna
+  "orcamento" formam um orçamento (a entrada deve vir agrupada). Sem a
+  coluna "orcamento", cada linha é um orçamento.
+
+Campos do cabeçalho: cliente_nome, cliente_contato, consultor_nome,
+validade_dias, observacoes_finais, despesas, impostos, margem.
+Campos do item: servico (consultoria, implementacao, survey, design,
+gestao, cursos, equipamentos), descricao, horas, andares, metragem,
+tipo, funcionarios, curso, opcoes (separadas por ";"). No survey, "area"
+(m² por andar) escolhe a faixa de metragem quando "metragem" não vem.
+
+Números aceitam vírgula decimal. Quantidades são inteiras e seguem os
+mínimos do app (horas ≥ 1, ou ≥ 0 na implementação; andares e
+funcionários ≥ 1); despesas, impostos e margem são ≥ 0.
+
+Um orçamento com erro (serviço ou metragem desconhecidos, número
+inválido ou abaixo do mínimo) é ignorado e listado com a linha de origem; os demais seguem.
+Nomes de arquivo repetidos (mesmo "orcamento" em linhas não consecutivas,
+ou ids que só diferem em caracteres removidos do nome) ganham "-2", "-3"...
+
+Uso:
+    python orcamentos_lote.py pedidos.csv --saida pasta/
+    python orcamentos_lote.py pedidos.jsonl --zip orcamentos.zip -j 8
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+
+import documento
+import pricing
+from catalogo import catalogo_atual
+
+CAMPOS_CABECALHO = (
+    "cliente_nome", "cliente_contato", "consultor_nome", "validade_dias",
+    "observacoes_finais", "despesas", "impostos", "margem",
+)
+
+# =========================
+# Leitura (streaming)
+# =========================
+# Os leitores geram (linha de origem, pedido); uma linha de JSON inválido
+# vira um pedido com "erro", relatado como os demais erros
+def _ler_jsonl(arquivo):
+    for n, linha in enumerate(arquivo, 1):
+        if linha.strip():
+            try:
+                pedido = json.loads(linha)
+            except ValueError as e:
+                pedido = {"erro": f"JSON inválido: {e}"}
+            if isinstance(pedido, dict):
+                pedido.setdefault("orcamento", str(n))
+            yield n, pedido
+
+def _pedido_csv(chave: str, linhas: list) -> dict:
+    pedido = {c: linhas[0][c] for c in CAMPOS_CABECALHO if linhas[0].get(c) not in (None, "")}
+    pedido["orcamento"] = chave
+    pedido["itens"] = linhas
+    return pedido
+
+def _ler_csv(arquivo):
+    leitor = csv.DictReader(arquivo)
+    if "orcamento" not in (leitor.fieldnames or ()):
+        for linha in leitor:
+            yield leitor.line_num, _pedido_csv(str(leitor.line_num), [linha])
+        return
+    chave, inicio, grupo = None, 0, []
+    for linha in leitor:
+        if grupo and linha["orcamento"] != chave:
+            yield inicio, _pedido_csv(chave, grupo)
+            grupo = []
+        if not grupo:
+            chave, inicio = linha["orcamento"], leitor.line_num
+        grupo.append(linha)
+    if grupo:
+        yield inicio, _pedido_csv(chave, grupo)
+
+def ler_pedidos(caminho: str):
+    """Gera (linha de origem, pedido) do CSV/JSONL, sem carregar o arquivo todo."""
+    formato = "jsonl" if caminho.endswith((".jsonl", ".ndjson")) else "csv"
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        yield from (_ler_jsonl(arquivo) if formato == "jsonl" else _ler_csv(arquivo))
+
+# =========================
+# Precificação e renderização
+# =========================
+def _numero(registro: dict, campo: str, padrao: float = 0.0, minimo: float = None) -> float:
+    # Aceita vírgula decimal ("2,5"), comum em planilhas pt-BR
+    valor = registro.get(campo)
+    if valor in (None, ""):
+        return padrao
+    try:
+        if isinstance(valor, bool):
+            raise TypeError
+        n = float(valor.replace(",", ".")) if isinstance(valor, str) else float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{campo}' deve ser um número: {valor!r}") from None
+    if not math.isfinite(n):
+        raise ValueError(f"'{campo}' deve ser um número: {valor!r}")
+    if minimo is not None and n < minimo:
+        raise ValueError(f"'{campo}' deve ser no mínimo {minimo}: {valor!r}")
+    return n
+
+def _inteiro(registro: dict, campo: str, padrao: int, minimo: int) -> int:
+    # Quantidades são inteiras como no app: "2,5" horas é erro, não 2
+    n = _numero(registro, campo, padrao, minimo)
+    if n != int(n):
+        raise ValueError(f"'{campo}' deve ser um número inteiro: {registro.get(campo)!r}")
+    return int(n)
+
+def _texto(registro: dict, campo: str) -> str:
+    # Campo de texto opcional; JSON com número/lista no lugar vira erro do pedido
+    valor = registro.get(campo)
+    if valor is None:
+        return ""
+    if not isinstance(valor, str):
+        raise TypeError(f"'{campo}' deve ser texto")
+    return valor
+
+def _opcoes(valor):
+    if isinstance(valor, (list, tuple)):
+        if not all(isinstance(o, str) for o in valor):
+            raise TypeError("'opcoes' deve ser texto ou lista de textos")
+        return list(valor)
+    if valor is not None and not isinstance(valor, str):
+        raise TypeError("'opcoes' deve ser texto ou lista de textos")
+    return [o.strip() for o in (valor or "").split(";") if o.strip()]
+
+def item_de_registro(reg: dict, catalogo=None) -> dict:
+    if not isinstance(reg, dict):
+        raise TypeError("Cada item deve ser um objeto")
+    cat = catalogo or catalogo_atual()
+    codigo = _texto(reg, "servico").strip()
+    descricao = _texto(reg, "descricao")
+    if codigo == "consultoria":
+        equipamentos = _opcoes(reg.get("opcoes"))
+        return pricing.preco_consultoria(_inteiro(reg, "horas", 1, 1), descricao, bool(equipamentos), equipamentos, cat)
+    if codigo == "implementacao":
+        return pricing.preco_implementacao(_inteiro(reg, "horas", 0, 0), descricao, cat)
+    if codigo == "survey":
+        metragem = _texto(reg, "metragem")
+        if not metragem and reg.get("area") not in (None, ""):
+            metragem = cat.faixa_metragem(_numero(reg, "area", minimo=0))
+        if metragem not in cat.ws_metragens:
+            raise ValueError(f"Metragem desconhecida: {metragem!r} (use uma de {list(cat.ws_metragens)} ou 'area')")
+        return pricing.preco_survey(_inteiro(reg, "andares", 1, 1), metragem, descricao, cat)
+    if codigo == "design":
+        return pricing.preco_design(_inteiro(reg, "horas", 1, 1), _texto(reg, "tipo") or "Wireless", descricao, cat)
+    if codigo == "gestao":
+        return pricing.preco_gestao_industrial(
+            _inteiro(reg, "funcionarios", 1, 1), descricao, _opcoes(reg.get("opcoes")), cat
+        )
+    if codigo == "cursos":
+        return pricing.preco_curso(_texto(reg, "curso") or cat.cursos_opcoes[0], descricao, cat)
+    if codigo == "equipamentos":
+        return pricing.preco_equipamentos(cat)
+    raise ValueError(f"Serviço desconhecido: {codigo!r}")
+
+def validar_pedido(pedido) -> dict:
+    """Confere o cabeçalho de um pedido (CLI e API) e devolve os campos já convertidos.
+
+    Textos devem ser texto; despesas, impostos e margem, números ≥ 0;
+    validade_dias, inteiro ≥ 1 (os mesmos mínimos do app). Os itens são
+    conferidos por item_de_registro. Erros: ValueError/TypeError com o
+    nome do campo.
+    """
+    if not isinstance(pedido, dict) or not isinstance(pedido.get("itens", []), list):
+        raise ValueError("O pedido deve ser um objeto JSON com a lista 'itens'")
+    campos = {c: _texto(pedido, c) for c in ("cliente_nome", "cliente_contato", "consultor_nome", "observacoes_finais")}
+    campos["validade_dias"] = _inteiro(pedido, "validade_dias", 7, 1)
+    for campo in ("despesas", "impostos", "margem"):
+        campos[campo] = _numero(pedido, campo, 0.0, 0)
+    return campos
+
+def precificar_pedido(pedido: dict, catalogo=None):
+    # (itens, financeiro) de um pedido, todos os itens com o mesmo catálogo
+    campos = validar_pedido(pedido)
+    cat = catalogo or catalogo_atual()
+    itens = [item_de_registro(reg, cat) for reg in pedido.get("itens", [])]
+    fin = pricing.total_com_financeiros(
+        pricing.total_itens(itens), campos["despesas"], campos["impostos"], campos["margem"]
+    )
+    return itens, fin
+
+def renderizar_pedido(pedido: dict, agora: datetime, precificado: tuple = None):
+    # `precificado`: o (itens, financeiro) de precificar_pedido, se já calculado
+    itens, fin = precificado or precificar_pedido(pedido)
+    campos = validar_pedido(pedido)
+    txt = documento.gerar_txt(
+        itens, fin,
+        cliente_nome=campos["cliente_nome"],
+        cliente_contato=campos["cliente_contato"],
+        consultor_nome=campos["consultor_nome"],
+        validade_dias=campos["validade_dias"],
+        observacoes_finais=campos["observacoes_finais"],
+        agora=agora,
+    )
+    sufixo = "_" + "".join(c for c in str(pedido["orcamento"]) if c.isalnum() or c in "-_")
+    return documento.nome_arquivo_txt(agora, sufixo), txt.encode("utf-8"), len(itens)
+
+def _mensagem_erro(e: Exception) -> str:
+    if isinstance(e, KeyError):
+        return f"valor desconhecido {e}"
+    return str(e) or type(e).__name__
+
+def _renderizar_lote(pedidos, agora):
+    # Executado no worker: devolve (nome, conteúdo, n_itens, segundos) por
+    # orçamento e (linha, orcamento, mensagem) por orçamento com erro
+    saida, erros = [], []
+    for linha, pedido in pedidos:
+        t0 = time.perf_counter()
+        try:
+            if not isinstance(pedido, dict):
+                raise TypeError("O pedido deve ser um objeto JSON")
+            if "erro" in pedido:
+                raise ValueError(pedido["erro"])
+            nome, dados, n_itens = renderizar_pedido(pedido, agora)
+        except Exception as e:
+            orcamento = pedido.get("orcamento") if isinstance(pedido, dict) else None
+            erros.append((linha, orcamento, _mensagem_erro(e)))
+            continue
+        saida.append((nome, dados, n_itens, time.perf_counter() - t0))
+    return saida, erros
+
+def _nome_livre(nome: str, usados: set) -> str:
+    # Mesmo orçamento em linhas não consecutivas ou ids iguais depois de
+    # limpos para o nome ("a/b" e "ab") não sobrescrevem um ao outro
+    base, ext = os.path.splitext(nome)
+    n = 1
+    while nome in usados:
+        n += 1
+        nome = f"{base}-{n}{ext}"
+    usados.add(nome)
+    return nome
+
+# =========================
+# Execução
+# =========================
+def _lotes(iteravel, tamanho):
+    it = iter(iteravel)
+    while True:
+        bloco = list(islice(it, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+def processar(pedidos, gravar, workers=None, tamanho_lote=32, agora=None, erro=None):
+    """Renderiza os pedidos (linha, pedido) no pool e chama gravar(nome, dados) para cada um.
+
+    No máximo 4 lotes por worker ficam em andamento, então a memória não
+    cresce com o tamanho da entrada. Orçamentos com erro não são gravados:
+    vão para erro(linha, orcamento, mensagem), se dado. Retorna
+    (estatísticas (nome, bytes, n_itens, segundos) por arquivo, nº de erros).
+    """
+    agora = agora or datetime.now()
+    workers = workers or os.cpu_count() or 1
+    janela = workers * 4
+    stats = []
+    usados = set()
+    n_erros = 0
+
+    def coletar(feitos):
+        nonlocal n_erros
+        for fut in feitos:
+            saida, erros = fut.result()
+            for nome, dados, n_itens, seg in saida:
+                nome = _nome_livre(nome, usados)
+                gravar(nome, dados)
+                stats.append((nome, len(dados), n_itens, seg))
+            n_erros += len(erros)
+            if erro is not None:
+                for registro in erros:
+                    erro(*registro)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendentes = set()
+        for bloco in _lotes(pedidos, tamanho_lote):
+            if len(pendentes) >= janela:
+                feitos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                coletar(feitos)
+            pendentes.add(pool.submit(_renderizar_lote, bloco, agora))
+        coletar(wait(pendentes).done)
+    return stats, n_erros
+
+def _relatar_erro(linha, orcamento, mensagem, saida=sys.stderr):
+    print(f"linha {linha} (orçamento {orcamento!r}): {mensagem} — ignorado", file=saida)
+
+def _relatorio(stats, segundos, verboso=False, n_erros=0, saida=sys.stderr):
+    if verboso:
+        for nome, n_bytes, n_itens, seg in stats:
+            print(f"{nome}: {n_itens} itens, {n_bytes} bytes, {seg * 1000:.2f} ms", file=saida)
+    if n_erros:
+        print(f"{n_erros} orçamento(s) com erro, não gerados (ver acima).", file=saida)
+    if not stats:
+        print("Nenhum orçamento processado.", file=saida)
+        return
+    tempos = [s[3] * 1000 for s in stats]
+    total_bytes = sum(s[1] for s in stats)
+    total_itens = sum(s[2] for s in stats)
+    print(
+        f"{len(stats)} orçamentos / {total_itens} itens / {total_bytes / 1e6:.2f} MB em {segundos:.2f} s\n"
+        f"  vazão: {len(stats) / segundos:,.0f} orçamentos/s, {total_itens / segundos:,.0f} itens/s, "
+        f"{total_bytes / 1e6 / segundos:.2f} MB/s\n"
+        f"  por arquivo (ms): média {statistics.fmean(tempos):.2f}, "
+        f"mediana {statistics.median(tempos):.2f}, máx {max(tempos):.2f}",
+        file=saida,
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera orçamentos TANKAR em lote a partir de CSV/JSONL.")
+    parser.add_argument("entrada", help="arquivo .csv ou .jsonl com os pedidos")
+    destino = parser.add_mutually_exclusive_group(required=True)
+    destino.add_argument("--saida", help="pasta onde gravar os arquivos .txt")
+    destino.add_argument("--zip", help="arquivo .zip único com todos os .txt")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--lote", type=int, default=32, help="orçamentos por tarefa enviada ao pool")
+    parser.add_argument("-v", "--verboso", action="store_true", help="lista estatísticas de cada arquivo")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.zip:
+        with zipfile.ZipFile(args.zip, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            stats, n_erros = processar(ler_pedidos(args.entrada), zf.writestr, args.workers, args.lote,
+                                       erro=_relatar_erro)
+    else:
+        os.makedirs(args.saida, exist_ok=True)
+
+        def gravar(nome, dados):
+            with open(os.path.join(args.saida, nome), "wb") as f:
+                f.write(dados)
+
+        stats, n_erros = processar(ler_pedidos(args.entrada), gravar, args.workers, args.lote, erro=_relatar_erro)
+    _relatorio(stats, time.perf_counter() - t0, args.verboso, n_erros)
+    if n_erros:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
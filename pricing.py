@@ -0,0 +1,296 @@
+# =========================
+# Motor de preços (sem Streamlit)
+# =========================
+# Regras de preço de cada serviço, puras e importáveis fora do app.
+# O quote.py chama estas funções para montar os itens e os totais;
+# jobs de back-office podem importar este módulo diretamente.
+
+import sys
+
+from catalogo import catalogo_atual
+from dinheiro import aplicar_pct, centavos, format_brl, pontos_base
+
+APP_NAME = "TANKAR IT QUOTE TOOL"
+
+# =========================
+# Constantes de preço
+# =========================
+# Os preços vêm do catálogo (catalogo_precos.json, recarregado a quente).
+# Os nomes antigos (HORA_CONSULTORIA, WS_METRAGENS, GI_FAIXAS...) continuam
+# disponíveis como atributos do módulo e refletem o catálogo vigente.
+_CONSTANTES = {
+    "HORA_CONSULTORIA": "hora_consultoria",
+    "HORA_DESIGN": "hora_design",
+    "IMPL_ANALISE_FIXA": "impl_analise_fixa",
+    "IMPL_HORA_ADICIONAL": "impl_hora_adicional",
+    "WS_ANALISE_FIXA": "ws_analise_fixa",
+    "WS_ADD_POR_ANDAR": "ws_add_por_andar",
+    "WS_LIMITE_ANDARES": "ws_limite_andares",
+    "WS_ACIMA_10_ANDARES": "ws_acima_limite",
+    "WS_METRAGENS": "ws_metragens",
+    "DESIGN_ANALISE_FIXA": "design_analise_fixa",
+    "GI_FAIXAS": "gi_faixas",
+    "CURSOS_OPCOES": "cursos_opcoes",
+}
+
+def __getattr__(nome):
+    if nome in _CONSTANTES:
+        return getattr(catalogo_atual(), _CONSTANTES[nome])
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+# Nomes dos serviços (iguais aos exibidos no seletor do app)
+SERVICO_CONSULTORIA = "Consultoria em Infraestrutura / Redes / Melhorias e Suporte"
+SERVICO_IMPLEMENTACAO = "Implementação ou Melhoria de Rede Wireless"
+SERVICO_SURVEY = "Wireless Survey"
+SERVICO_DESIGN = "Design de Rede (Wireless/Cabeada/Híbrida)"
+SERVICO_GESTAO = "Gestão Industrial"
+SERVICO_CURSOS = "Cursos e Treinamentos"
+SERVICO_EQUIPAMENTOS = "Venda de Equipamentos"
+# Na ordem em que aparecem para o usuário
+SERVICOS = (
+    SERVICO_CONSULTORIA, SERVICO_IMPLEMENTACAO, SERVICO_SURVEY, SERVICO_DESIGN,
+    SERVICO_GESTAO, SERVICO_CURSOS, SERVICO_EQUIPAMENTOS,
+)
+
+# =========================
+# Item do orçamento
+# =========================
+# Quantidades de cada item guardadas à parte do texto de detalhes
+MEDIDAS = ("horas", "andares", "funcionarios")
+
+class ItemOrcamento:
+    # Imutável e com __slots__: duplicar um item é só repetir a referência,
+    # sem copiar os textos de descrição/detalhes. Aceita acesso no estilo
+    # dict (item["subtotal"], item.get("descricao")) usado pelo restante do app.
+    # O subtotal é guardado em centavos inteiros. As quantidades usadas no
+    # preço (MEDIDAS) ficam em campos próprios, None quando não se aplicam.
+    __slots__ = ("servico", "descricao", "detalhes", "centavos", "horas", "andares", "funcionarios")
+    _CAMPOS = ("servico", "descricao", "detalhes", "subtotal", "horas", "andares", "funcionarios")
+
+    def __init__(self, servico: str, descricao: str, detalhes: str, subtotal: float,
+                 horas: int = None, andares: int = None, funcionarios: int = None):
+        _set = object.__setattr__
+        _set(self, "servico", sys.intern(servico))
+        _set(self, "descricao", descricao)
+        _set(self, "detalhes", detalhes)
+        _set(self, "centavos", centavos(subtotal))
+        _set(self, "horas", None if horas is None else int(horas))
+        _set(self, "andares", None if andares is None else int(andares))
+        _set(self, "funcionarios", None if funcionarios is None else int(funcionarios))
+
+    @property
+    def subtotal(self) -> float:
+        return self.centavos / 100
+
+    @classmethod
+    def de(cls, item) -> "ItemOrcamento":
+        if isinstance(item, cls):
+            return item
+        return cls(
+            item["servico"], item.get("descricao", ""), item.get("detalhes", ""), item["subtotal"],
+            *(item.get(m) for m in MEDIDAS),
+        )
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("ItemOrcamento é imutável")
+
+    __delattr__ = __setattr__
+
+    def __getitem__(self, chave):
+        try:
+            return getattr(self, chave)
+        except (AttributeError, TypeError):
+            raise KeyError(chave) from None
+
+    def get(self, chave, padrao=None):
+        return getattr(self, chave, padrao)
+
+    def keys(self):
+        return self._CAMPOS
+
+    def como_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self._CAMPOS}
+
+    def __eq__(self, outro):
+        if not isinstance(outro, ItemOrcamento):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(outro, k) for k in self.__slots__)
+
+    def __hash__(self):
+        return hash((self.servico, self.descricao, self.detalhes, self.centavos, self.horas, self.andares,
+                     self.funcionarios))
+
+    def __repr__(self):
+        return f"ItemOrcamento(servico={self.servico!r}, subtotal={self.subtotal!r})"
+
+    def __reduce__(self):
+        return (ItemOrcamento, (self.servico, self.descricao, self.detalhes, self.subtotal,
+                                self.horas, self.andares, self.funcionarios))
+
+# =========================
+# Precificadores por serviço
+# =========================
+# Todos aceitam `catalogo` para que uma tela (ou um lote) use um único
+# snapshot de preços; sem ele, vale o catálogo vigente.
+def preco_consultoria(horas: int, resumo: str = "", pretende_equip: bool = False, equipamentos=(),
+                      catalogo=None) -> ItemOrcamento:
+    cat = catalogo or catalogo_atual()
+    subtotal = float(horas) * cat.hora_consultoria
+    detalhes = f"Horas: {horas} × {format_brl(cat.hora_consultoria)}"
+    if pretende_equip:
+        eq = ", ".join(equipamentos) if equipamentos else "(não especificado)"
+        detalhes += f" | Interesse em equipamentos: {eq}"
+    return ItemOrcamento(SERVICO_CONSULTORIA, resumo.strip(), detalhes, subtotal, horas=horas)
+
+def preco_implementacao(horas_adic: int, resumo: str = "", catalogo=None) -> ItemOrcamento:
+    cat = catalogo or catalogo_atual()
+    subtotal = cat.impl_analise_fixa + horas_adic * cat.impl_hora_adicional
+    detalhes = (
+        f"Análise inicial {format_brl(cat.impl_analise_fixa)} | "
+        f"Horas adic.: {horas_adic} × {format_brl(cat.impl_hora_adicional)} | "
+        "Transporte separado"
+    )
+    return ItemOrcamento(SERVICO_IMPLEMENTACAO, resumo.strip(), detalhes, subtotal, horas=horas_adic)
+
+def custos_survey(qtd_andares: int, metragem_op: str, catalogo=None):
+    """Retorna (custo_andares, custo_metragem_total, subtotal) de um survey.
+
+    Acima do limite de andares (10) o custo de andares é fixo;
+    a metragem continua somando por andar.
+    """
+    cat = catalogo or catalogo_atual()
+    custo_andares = cat.custo_andares(qtd_andares)
+    custo_metragem_total = qtd_andares * cat.ws_metragens[metragem_op]
+    subtotal = cat.ws_analise_fixa + custo_andares + custo_metragem_total
+    return custo_andares, custo_metragem_total, subtotal
+
+def _detalhe_andares(qtd_andares: int, custo_andares: float, cat) -> str:
+    if qtd_andares > cat.ws_limite_andares:
+        return f"Andares: {qtd_andares} (faixa >{cat.ws_limite_andares}) = {format_brl(cat.ws_acima_limite)}"
+    return f"Andares: {qtd_andares} × {format_brl(cat.ws_add_por_andar)} = {format_brl(custo_andares)}"
+
+def preco_survey(qtd_andares: int, metragem_op: str, resumo: str = "", catalogo=None) -> ItemOrcamento:
+    cat = catalogo or catalogo_atual()
+    custo_andares, custo_metragem_total, subtotal = custos_survey(qtd_andares, metragem_op, cat)
+    detalhes = [
+        f"Análise inicial {format_brl(cat.ws_analise_fixa)}",
+        _detalhe_andares(qtd_andares, custo_andares, cat),
+        f"Metragem: {metragem_op} × {qtd_andares} = {format_brl(custo_metragem_total)}",
+    ]
+    return ItemOrcamento(
+        SERVICO_SURVEY, (resumo or "").strip(), " | ".join(detalhes), subtotal, andares=qtd_andares
+    )
+
+def preco_survey_predio(andares_por_faixa: dict, resumo: str = "", catalogo=None) -> ItemOrcamento:
+    """Survey de um prédio cujos andares caem em faixas de metragem diferentes.
+
+    andares_por_faixa: rótulo da faixa -> quantidade de andares. O custo de
+    andares vale para o total do prédio (com o teto acima do limite) e a
+    metragem soma faixa a faixa.
+    """
+    cat = catalogo or catalogo_atual()
+    if len(andares_por_faixa) == 1:
+        (metragem_op, qtd_andares), = andares_por_faixa.items()
+        return preco_survey(qtd_andares, metragem_op, resumo, cat)
+    qtd_andares = sum(andares_por_faixa.values())
+    custo_andares = cat.custo_andares(qtd_andares)
+    custo_metragem_total = sum(n * cat.ws_metragens[faixa] for faixa, n in andares_por_faixa.items())
+    subtotal = cat.ws_analise_fixa + custo_andares + custo_metragem_total
+    detalhes = [
+        f"Análise inicial {format_brl(cat.ws_analise_fixa)}",
+        _detalhe_andares(qtd_andares, custo_andares, cat),
+        "Metragem: " + " + ".join(f"{faixa} × {n}" for faixa, n in andares_por_faixa.items())
+        + f" = {format_brl(custo_metragem_total)}",
+    ]
+    return ItemOrcamento(
+        SERVICO_SURVEY, (resumo or "").strip(), " | ".join(detalhes), subtotal, andares=qtd_andares
+    )
+
+def preco_design(horas: int, tipo: str, descricao: str = "", catalogo=None) -> ItemOrcamento:
+    cat = catalogo or catalogo_atual()
+    subtotal = cat.design_analise_fixa + horas * cat.hora_design
+    detalhes = (
+        f"Tipo: {tipo} | Análise inicial {format_brl(cat.design_analise_fixa)} | "
+        f"Horas: {horas} × {format_brl(cat.hora_design)}"
+    )
+    return ItemOrcamento(f"{SERVICO_DESIGN} — {tipo}", descricao.strip(), detalhes, subtotal, horas=horas)
+
+def preco_base_gestao(num_func: int, catalogo=None) -> float:
+    return (catalogo or catalogo_atual()).preco_gestao(num_func)
+
+def preco_gestao_industrial(num_func: int, resumo: str = "", servicos_gi=(), catalogo=None) -> ItemOrcamento:
+    detalhes = f"Serviços: {', '.join(servicos_gi) if servicos_gi else '(não especificado)'} | Funcionários: {num_func}"
+    return ItemOrcamento(
+        SERVICO_GESTAO, resumo.strip(), detalhes, preco_base_gestao(num_func, catalogo), funcionarios=num_func
+    )
+
+def preco_curso(curso: str, obs: str = "", catalogo=None) -> ItemOrcamento:
+    return ItemOrcamento(SERVICO_CURSOS, (obs or "").strip(), f"Curso: {curso} | Preço: sob consulta", 0.0)
+
+def preco_equipamentos(catalogo=None) -> ItemOrcamento:
+    return ItemOrcamento(
+        SERVICO_EQUIPAMENTOS,
+        "Venda de equipamento — anexar orçamento parceiro Lenovo.",
+        "Item sem valor neste documento (apenas referência).",
+        0.0
+    )
+
+# Códigos curtos -> precificador (usados por jobs e integrações)
+PRECIFICADORES = {
+    "consultoria": preco_consultoria,
+    "implementacao": preco_implementacao,
+    "survey": preco_survey,
+    "design": preco_design,
+    "gestao": preco_gestao_industrial,
+    "cursos": preco_curso,
+    "equipamentos": preco_equipamentos,
+}
+
+def precificar(codigo: str, **params) -> ItemOrcamento:
+    try:
+        fn = PRECIFICADORES[codigo]
+    except KeyError:
+        raise ValueError(f"Serviço desconhecido: {codigo!r}") from None
+    return fn(**params)
+
+# =========================
+# Totais
+# =========================
+def total_itens(itens) -> float:
+    return sum(centavos(i["subtotal"]) for i in itens) / 100
+
+def financeiros_centavos(subtotal_c: int, despesas_c: int = 0,
+                         impostos_bp: int = 0, margem_bp: int = 0) -> dict:
+    # Mesma regra de total_com_financeiros, em centavos e pontos-base
+    impostos_c = aplicar_pct(subtotal_c + despesas_c, impostos_bp)
+    margem_c = aplicar_pct(subtotal_c + despesas_c + impostos_c, margem_bp)
+    return {
+        "subtotal": subtotal_c,
+        "despesas": despesas_c,
+        "impostos_valor": impostos_c,
+        "margem_valor": margem_c,
+        "total": subtotal_c + despesas_c + impostos_c + margem_c,
+    }
+
+def total_com_financeiros(subtotal: float, despesas: float = 0.0,
+                          impostos_pct: float = 0.0, margem_pct: float = 0.0,
+                          subtotal_centavos: int = None) -> dict:
+    # Impostos sobre Subtotal + Despesas; margem após impostos. As contas são
+    # feitas em centavos inteiros (arredondando meio centavo para cima).
+    despesas = float(despesas) or 0.0
+    impostos_pct = float(impostos_pct) or 0.0
+    margem_pct = float(margem_pct) or 0.0
+    if subtotal_centavos is None:
+        subtotal_centavos = centavos(subtotal)
+
+    c = financeiros_centavos(subtotal_centavos, centavos(despesas), pontos_base(impostos_pct), pontos_base(margem_pct))
+    return {
+        "subtotal": c["subtotal"] / 100,
+        "despesas": c["despesas"] / 100,
+        "impostos_pct": impostos_pct,
+        "impostos_valor": c["impostos_valor"] / 100,
+        "margem_pct": margem_pct,
+        "margem_valor": c["margem_valor"] / 100,
+        "total": c["total"] / 100,
+        "centavos": c,
+    }
@@ -0,0 +1,163 @@
+# =========================
+# Precificação em lote (NumPy)
+# =========================
+# Mesmas fórmulas de pricing.py aplicadas a colunas inteiras de itens,
+# para reprecificar carteiras de orçamentos após mudança de tabela.
+# As operações seguem a mesma ordem das versões escalares, então os
+# resultados são idênticos bit a bit aos de pricing.precificar().
+
+import numpy as np
+
+import dinheiro
+import pricing
+from catalogo import catalogo_atual
+
+CODIGOS = tuple(pricing.PRECIFICADORES)
+
+def _coluna(valores, n, dtype, padrao=0):
+    if valores is None:
+        return np.full(n, padrao, dtype=dtype)
+    arr = np.asarray(valores, dtype=dtype)
+    if arr.shape != (n,):
+        raise ValueError(f"Coluna com tamanho {arr.shape}, esperado ({n},)")
+    return arr
+
+def _rotulos(valores) -> np.ndarray:
+    arr = np.asarray(valores)
+    return arr if arr.dtype.kind == "U" else arr.astype(str)
+
+def _metragem_valores(metragem, cat) -> np.ndarray:
+    # Rótulos das metragens do catálogo -> valor por andar (uma comparação por faixa)
+    valores = np.full(metragem.shape, np.nan)
+    for rotulo, valor in cat.ws_metragens.items():
+        valores[metragem == rotulo] = valor
+    invalidos = np.isnan(valores)
+    if invalidos.any():
+        raise ValueError(f"Metragem desconhecida: {str(metragem[invalidos][0])!r}")
+    return valores
+
+def preco_base_gestao_lote(funcionarios, catalogo=None) -> np.ndarray:
+    # Mesma busca de Catalogo.preco_gestao, vetorizada com searchsorted
+    faixas = (catalogo or catalogo_atual()).gi_faixas
+    inicios = np.array([f[0] for f in faixas])
+    fins = np.array([f[1] for f in faixas])
+    precos = np.array([f[2] for f in faixas])
+    n = np.asarray(funcionarios)
+    i = np.searchsorted(inicios, n, side="right") - 1
+    dentro = (i >= 0) & (n <= fins[np.maximum(i, 0)])
+    return np.where(dentro, precos[np.maximum(i, 0)], precos[-1])
+
+def subtotais_lote(codigos, horas=None, andares=None, metragem=None, funcionarios=None,
+                   catalogo=None) -> np.ndarray:
+    # Um único snapshot do catálogo para o lote inteiro
+    cat = catalogo or catalogo_atual()
+    codigos = _rotulos(codigos)
+    n = codigos.shape[0]
+    conhecidos = np.zeros(n, dtype=bool)
+    for codigo in CODIGOS:
+        conhecidos |= codigos == codigo
+    if not conhecidos.all():
+        raise ValueError(f"Serviço desconhecido: {str(codigos[~conhecidos][0])!r}")
+
+    horas = _coluna(horas, n, np.int64)
+    andares = _coluna(andares, n, np.int64)
+    funcionarios = _coluna(funcionarios, n, np.int64, padrao=1)
+
+    subtotal = np.zeros(n)
+
+    m = codigos == "consultoria"
+    subtotal[m] = horas[m].astype(np.float64) * cat.hora_consultoria
+
+    m = codigos == "implementacao"
+    subtotal[m] = cat.impl_analise_fixa + horas[m] * cat.impl_hora_adicional
+
+    m = codigos == "survey"
+    if m.any():
+        if metragem is None:
+            raise ValueError("Coluna 'metragem' é obrigatória para itens de survey")
+        qtd = andares[m]
+        custo_andares = np.where(qtd > cat.ws_limite_andares, cat.ws_acima_limite, qtd * cat.ws_add_por_andar)
+        custo_metragem = qtd * _metragem_valores(_rotulos(metragem)[m], cat)
+        subtotal[m] = cat.ws_analise_fixa + custo_andares + custo_metragem
+
+    m = codigos == "design"
+    subtotal[m] = cat.design_analise_fixa + horas[m] * cat.hora_design
+
+    m = codigos == "gestao"
+    subtotal[m] = preco_base_gestao_lote(funcionarios[m], cat)
+
+    # cursos e equipamentos ficam em 0.0 (sob consulta / só referência)
+    return subtotal
+
+def subtotais_por_orcamento(orcamento_idx, subtotais, n_orcamentos=None) -> np.ndarray:
+    # Soma os itens de cada orçamento (índices 0..n-1), na ordem dos itens
+    return np.bincount(np.asarray(orcamento_idx), weights=subtotais, minlength=n_orcamentos or 0)
+
+def _centavos_lote(valores) -> np.ndarray:
+    # Igual a dinheiro.centavos: sem o ruído do double, meio para longe do zero
+    x = np.asarray(valores, dtype=np.float64) * 100
+    a = np.abs(x)
+    n = np.floor(a + 0.5 + a * dinheiro.FOLGA_RUIDO)
+    return np.copysign(n, x).astype(np.int64)
+
+def _aplicar_pct_lote(valor_c, pct_bp) -> np.ndarray:
+    # Igual a dinheiro.aplicar_pct: meio centavo arredonda para longe do zero
+    n = valor_c * pct_bp
+    q, r = np.divmod(np.abs(n), 10000)
+    q = q + (2 * r >= 10000)
+    return np.where(n >= 0, q, -q)
+
+def total_com_financeiros_lote(subtotal, despesas=0.0, impostos_pct=0.0, margem_pct=0.0) -> dict:
+    subtotal = np.asarray(subtotal, dtype=np.float64)
+    forma = subtotal.shape
+    impostos_pct = np.broadcast_to(np.asarray(impostos_pct, dtype=np.float64), forma)
+    margem_pct = np.broadcast_to(np.asarray(margem_pct, dtype=np.float64), forma)
+
+    subtotal_c = _centavos_lote(subtotal)
+    despesas_c = np.broadcast_to(_centavos_lote(despesas), forma)
+    impostos_c = _aplicar_pct_lote(subtotal_c + despesas_c, _centavos_lote(impostos_pct))
+    margem_c = _aplicar_pct_lote(subtotal_c + despesas_c + impostos_c, _centavos_lote(margem_pct))
+    total_c = subtotal_c + despesas_c + impostos_c + margem_c
+    return {
+        "subtotal": subtotal_c / 100,
+        "despesas": despesas_c / 100,
+        "impostos_pct": impostos_pct,
+        "impostos_valor": impostos_c / 100,
+        "margem_pct": margem_pct,
+        "margem_valor": margem_c / 100,
+        "total": total_c / 100,
+        "centavos": {
+            "subtotal": subtotal_c,
+            "despesas": despesas_c,
+            "impostos_valor": impostos_c,
+            "margem_valor": margem_c,
+            "total": total_c,
+        },
+    }
+
+# =========================
+# Simulação financeira (e se…)
+# =========================
+def grade_totais(subtotal_c: int, despesas, impostos_pct, margem_pct) -> np.ndarray:
+    # TOTAL GERAL em centavos para todas as combinações, com eixos
+    # (despesas, impostos, margem); mesma regra de pricing.financeiros_centavos
+    base_c = np.int64(subtotal_c) + _centavos_lote(despesas).reshape(-1, 1, 1)
+    com_impostos_c = base_c + _aplicar_pct_lote(base_c, _centavos_lote(impostos_pct).reshape(1, -1, 1))
+    return com_impostos_c + _aplicar_pct_lote(com_impostos_c, _centavos_lote(margem_pct).reshape(1, 1, -1))
+
+def margem_para_total(subtotal_c: int, total_alvo_c: int, despesas, impostos_pct) -> np.ndarray:
+    """Menor margem (%, duas casas) cujo TOTAL GERAL alcança o alvo.
+
+    Eixos (despesas, impostos). NaN onde o total já passa do alvo com margem
+    zero; inf onde a base (subtotal + despesas + impostos) é zero, e então
+    nenhuma margem alcança o alvo.
+    """
+    base_c = np.int64(subtotal_c) + _centavos_lote(despesas).reshape(-1, 1)
+    com_impostos_c = base_c + _aplicar_pct_lote(base_c, _centavos_lote(impostos_pct).reshape(1, -1))
+    falta_c = np.int64(total_alvo_c) - com_impostos_c
+    # Meio centavo arredonda para cima: margem >= falta <=> com_impostos * bp >= falta * 10000 - 5000
+    limite = falta_c * 10000 - 5000
+    bp = -(-limite // np.maximum(com_impostos_c, 1))
+    bp = np.where(falta_c > 0, bp, 0)
+    margem = np.where(falta_c < 0, np.nan, bp / 100)
+    return np.where((falta_c > 0) & (com_impostos_c <= 0), np.inf, margem)
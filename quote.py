@@ -1,7 +1,20 @@
-import re
+import functools
+import math
 import streamlit as st
-from datetime import datetime, timedelta
-from copy import deepcopy
+from datetime import datetime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import documento
+import documento_pdf
+from ativos import card_implementacao, card_survey, css_tema, html_cabecalho
+import metricas
+from armazem import TEXTOS_OBSERVACOES, armazem_padrao
+from orcamento import Orcamento
+import pricing
+import survey_lote
+from catalogo import catalogo_atual
+from dinheiro import centavos, format_centavos
+from pricing import format_brl
 
 # =========================
 # Config da página
@@ -12,58 +25,48 @@ st.set_page_config(
     layout="centered"
 )
 
-APP_NAME = "TANKAR IT QUOTE TOOL"
+# =========================
+# Métricas do rerun (tempo por seção, ver metricas.py)
+# =========================
+metricas.servidor_padrao()
+_ctx = get_script_run_ctx()
+_rerun = metricas.Rerun(_ctx.session_id if _ctx else "")
+
+def cronometrado(nome: str):
+    # Seções em fragmento: num rerun completo a seção entra no rerun em
+    # andamento; num rerun só do fragmento, vira um Rerun próprio
+    def decorador(fn):
+        @functools.wraps(fn)
+        def secao(*args, **kwargs):
+            ctx = get_script_run_ctx()
+            so_fragmento = bool(ctx and ctx.fragment_ids_this_run)
+            if so_fragmento:
+                rerun = metricas.Rerun(ctx.session_id, len(st.session_state.orcamento), "fragmento")
+            else:
+                rerun = _rerun
+            rerun.etapa(nome)
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                # st.rerun() e erros encerram o script aqui
+                rerun.concluir()
+                raise
+            finally:
+                if so_fragmento:
+                    rerun.concluir()
+        return secao
+    return decorador
+
+_rerun.etapa("tema")
 
 # =========================
 # CSS (tema claro/escuro + padding superior maior p/ não “comer” o título)
 # =========================
 def inject_theme(dark: bool):
-    blue = "#0B3C5D"
-    green = "#0B8457"
-    bg_light = "#ffffff"
-    bg_dark = "#0f1420"
-    text_light = "#0B3C5D"
-    text_dark = "#e8eef3"
-    card_light = "#f9fbfd"
-    card_dark = "#151c2b"
-    border_light = "#e8eef3"
-    border_dark = "#22304a"
-
-    if dark:
-        app_bg = bg_dark; text = text_dark; card = card_dark; border = border_dark; hr = "#243251"
-    else:
-        app_bg = bg_light; text = text_light; card = card_light; border = border_light; hr = "#e6eef5"
-
-    st.markdown(f"""
-    <style>
-    .stApp {{ background: {app_bg}; }}
-    /* Aumenta o padding superior para o título não ficar colado no topo */
-    .block-container {{ padding-top: 2.2rem; }}
-
-    .header-band {{
-      background: linear-gradient(90deg, {blue}, {green});
-      border-radius: 16px; padding: 16px 18px; color: white; margin-bottom: 14px;
-      box-shadow: 0 4px 18px rgba(0,0,0,0.15);
-    }}
-    h1, h2, h3, h4, h5, h6, label, .stMarkdown p {{ color: {text}; }}
-    hr {{ border: 0; height: 1px; background: {hr}; margin: 0.8rem 0 1rem; }}
-    .card {{
-      border: 1px solid {border}; border-radius: 12px; padding: 12px 14px; background: {card};
-    }}
-    .badge {{
-      display: inline-block; padding: 2px 8px; border-radius: 999px;
-      background: {blue}; color: #fff; font-size: 12px; font-weight: 600;
-    }}
-    .stButton>button {{
-      background: {green}; color: white; border: 0; border-radius: 10px;
-      padding: 0.6rem 1.0rem; font-weight: 600;
-      box-shadow: 0 4px 12px rgba(11,132,87,0.25); transition: all .15s ease;
-    }}
-    .stButton>button:hover {{ filter: brightness(1.05); transform: translateY(-1px); }}
-    </style>
-    """, unsafe_allow_html=True)
-
-# Sidebar: apenas tema e totais financeiros (sem logo, sem PDF)
+    # CSS pronto por processo (ativos.py)
+    st.markdown(css_tema(dark), unsafe_allow_html=True)
+
+# Sidebar: apenas tema e totais financeiros (sem logo)
 with st.sidebar:
     st.markdown("### Aparência")
     tema = st.radio("Tema", options=["Claro", "Escuro"], index=1, horizontal=True)
@@ -73,48 +76,11 @@ with st.sidebar:
     st.markdown("### Opções financeiras (opcional)")
     # estados serão inicializados em init_state()
 
-# =========================
-# Constantes de preço
-# =========================
-HORA_CONSULTORIA = 200.0
-HORA_DESIGN = 200.0
-
-# Implementação/Melhoria Wireless
-IMPL_ANALISE_FIXA = 2280.0
-IMPL_HORA_ADICIONAL = 220.0
-
-# Wireless Survey
-WS_ANALISE_FIXA = 3000.0
-WS_ADD_POR_ANDAR = 1000.0
-WS_ACIMA_10_ANDARES = 20000.0
-WS_METRAGENS = {
-    "50–200 m² (+R$ 2.000)": 2000.0,
-    "200–300 m² (+R$ 3.500)": 3500.0,
-    "300–500 m² (+R$ 5.000)": 5000.0,
-    "Acima de 600 m² (+R$ 10.000)": 10000.0,
-}
-
-# Design (Wireless/Cabeada/Híbrida)
-DESIGN_ANALISE_FIXA = 2500.0
-
-# Gestão Industrial (por faixa de funcionários)
-GI_FAIXAS = [
-    (1, 100, 4899.0),
-    (101, 200, 6899.0),
-    (201, 10**9, 8899.0),  # acima de 200
-]
-
-CURSOS_OPCOES = [
-    "Curso de gerenciamento de rede interna",
-    "Curso de gestão de redes Wireless e identificação de problemas",
-    "Consulte engenharia",
-]
-
 # =========================
 # Estado & Helpers
 # =========================
 def init_state():
-    st.session_state.setdefault("itens", [])
+    st.session_state.setdefault("orcamento", Orcamento())
     st.session_state.setdefault("observacoes_finais", "")
     # Financeiro
     st.session_state.setdefault("finance_despesas", 0.0)
@@ -125,403 +91,599 @@ def init_state():
     st.session_state.setdefault("cliente_contato", "")
     st.session_state.setdefault("validade_dias", 7)
     st.session_state.setdefault("consultor_nome", "")
+    # Id no histórico (None = ainda não salvo ou clonado)
+    st.session_state.setdefault("orcamento_id", None)
 
+_rerun.etapa("estado")
 init_state()
+_rerun.n_itens = len(st.session_state.orcamento)
 
-def format_brl(valor: float) -> str:
-    # Usa apenas dígitos, vírgula e ponto simples para evitar caracteres estranhos
-    s = f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    return f"R$ {s}"
-
-def agora_br():
-    return datetime.now().strftime("%d/%m/%Y %H:%M")
-
-def data_validade_str(dias: int) -> str:
-    dt = datetime.now() + timedelta(days=max(1, int(dias)))
-    return dt.strftime("%d/%m/%Y")
-
-def add_item(item: dict):
-    st.session_state.itens.append(item)
+def add_item(item):
+    st.session_state.orcamento.add_item(item)
 
 def delete_item(idx: int):
-    if 0 <= idx < len(st.session_state.itens):
-        st.session_state.itens.pop(idx)
+    st.session_state.orcamento.delete_item(idx)
 
 def duplicate_item(idx: int):
-    if 0 <= idx < len(st.session_state.itens):
-        st.session_state.itens.append(deepcopy(st.session_state.itens[idx]))
+    st.session_state.orcamento.duplicate_item(idx)
 
 def total_itens():
-    return sum(i["subtotal"] for i in st.session_state.itens)
+    return st.session_state.orcamento.subtotal
 
 def total_com_financeiros():
-    subtotal = total_itens()
-    despesas = float(st.session_state.finance_despesas) or 0.0
-    impostos_pct = float(st.session_state.finance_impostos) or 0.0
-    margem_pct = float(st.session_state.finance_margem) or 0.0
-
-    base_impostos = subtotal + despesas
-    impostos = base_impostos * (impostos_pct / 100.0)
-    base_margem = subtotal + despesas + impostos
-    margem = base_margem * (margem_pct / 100.0)
-    total = subtotal + despesas + impostos + margem
-    return {
-        "subtotal": subtotal,
-        "despesas": despesas,
-        "impostos_pct": impostos_pct,
-        "impostos_valor": impostos,
-        "margem_pct": margem_pct,
-        "margem_valor": margem,
-        "total": total,
-    }
+    return st.session_state.orcamento.financeiro(
+        st.session_state.finance_despesas,
+        st.session_state.finance_impostos,
+        st.session_state.finance_margem,
+    )
+
+def _cabecalho_documento():
+    return dict(
+        cliente_nome=st.session_state.cliente_nome,
+        cliente_contato=st.session_state.cliente_contato,
+        consultor_nome=st.session_state.consultor_nome,
+        validade_dias=st.session_state.validade_dias,
+        observacoes_finais=st.session_state.observacoes_finais,
+    )
 
 def gerar_txt_final():
-    linhas = [
-        f"{APP_NAME}",
-        f"Data/Hora: {agora_br()}",
-        "-"*70,
-        f"Cliente: {st.session_state.cliente_nome or '(não informado)'}",
-        f"Contato: {st.session_state.cliente_contato or '(não informado)'}",
-        f"Consultor Tankar: {st.session_state.consultor_nome or '(não informado)'}",
-        f"Validade: {st.session_state.validade_dias} dias (até {data_validade_str(st.session_state.validade_dias)})",
-        "-"*70
-    ]
-    for idx, it in enumerate(st.session_state.itens, 1):
-        linhas += [
-            f"Item {idx}: {it['servico']}",
-            f"Descrição/Resumo: {it.get('descricao','-')}",
-            f"Detalhes: {it.get('detalhes','-')}",
-            f"Subtotal: {format_brl(it['subtotal'])}",
-            "-"*70
-        ]
-    fin = total_com_financeiros()
-    linhas += [
-        "Informações gerais do orçamento:",
-        st.session_state.observacoes_finais.strip() or "(sem observações)",
-        "-"*70,
-        f"SUBTOTAL ITENS: {format_brl(fin['subtotal'])}",
-        f"DESPESAS: {format_brl(fin['despesas'])}",
-        f"IMPOSTOS ({fin['impostos_pct']}%): {format_brl(fin['impostos_valor'])}",
-        f"MARGEM ({fin['margem_pct']}%): {format_brl(fin['margem_valor'])}",
-        f"TOTAL GERAL: {format_brl(fin['total'])}",
-        "",
-        "Observações:",
-        "- Itens com 'sob consulta' poderão sofrer alteração após análise técnica.",
-        "- Custos de transporte, quando aplicáveis, foram somados em 'Despesas' ou serão calculados separadamente.",
-        "- Validade conforme indicada acima."
-    ]
-    return "\n".join(linhas)
+    return documento.gerar_txt(st.session_state.orcamento.itens, total_com_financeiros(), **_cabecalho_documento())
+
+def impressao_digital(agora: datetime) -> tuple:
+    # Chave barata do estado exportado: versão do orçamento em vez dos itens,
+    # e data/hora no minuto (resolução que aparece no documento)
+    orcamento = st.session_state.orcamento
+    return (
+        id(orcamento), orcamento.versao,
+        tuple(_cabecalho_documento().values()),
+        st.session_state.finance_despesas, st.session_state.finance_impostos, st.session_state.finance_margem,
+        agora.strftime("%Y%m%d%H%M"),
+    )
+
+def txt_exportacao() -> bytes:
+    # Só regenera o documento quando a impressão digital muda
+    agora = datetime.now()
+    chave = impressao_digital(agora)
+    cache = st.session_state.get("export_cache")
+    if cache is None or cache[0] != chave:
+        dados = documento.gerar_txt(
+            st.session_state.orcamento.itens, total_com_financeiros(), agora=agora, **_cabecalho_documento()
+        ).encode("utf-8")
+        cache = st.session_state.export_cache = (chave, dados)
+    return cache[1]
+
+def _chave_pdf() -> tuple:
+    # Mesmo estado da exportação TXT, sem o minuto: o PDF traz a hora em que foi pedido
+    return impressao_digital(datetime.now())[:-1]
+
+def pedir_pdf():
+    agora = datetime.now()
+    futuro = documento_pdf.gerar_pdf_em_segundo_plano(
+        st.session_state.orcamento.itens, total_com_financeiros(), agora=agora, **_cabecalho_documento()
+    )
+    st.session_state.pdf_pedido = (_chave_pdf(), futuro, agora)
+
+def _secao_pdf(com_polling: bool):
+    pedido = st.session_state.get("pdf_pedido")
+    if pedido is None or pedido[0] != _chave_pdf():
+        st.button("🖨️ Gerar PDF", on_click=pedir_pdf)
+        return
+    _, futuro, agora = pedido
+    # O polling (run_every) só muda num rerun completo: liga enquanto o PDF
+    # está na fila e desliga quando fica pronto
+    if futuro.done() == com_polling:
+        st.rerun()
+    if not futuro.done():
+        st.caption("Gerando PDF em segundo plano…")
+    elif futuro.exception() is not None:
+        st.error(f"Não foi possível gerar o PDF: {futuro.exception()}")
+        st.button("🖨️ Gerar PDF novamente", on_click=pedir_pdf)
+    else:
+        st.download_button(
+            label="📕 Baixar .PDF",
+            file_name=documento_pdf.nome_arquivo_pdf(agora),
+            mime="application/pdf",
+            data=futuro.result(),
+        )
+
+# =========================
+# Histórico de orçamentos (SQLite)
+# =========================
+def salvar_orcamento(como_novo: bool = False):
+    # como_novo: grava outro registro mesmo com um orçamento já salvo na sessão
+    orcamento_id = None if como_novo else st.session_state.orcamento_id
+    pendente = st.session_state.get("salvamento")
+    if pendente is not None and orcamento_id is None and not como_novo:
+        # Gravação anterior ainda sem id: a nova vai depois dela e regrava o
+        # mesmo registro em vez de duplicar (sem esperar aqui)
+        orcamento_id = pendente
+    st.session_state.salvamento = armazem_padrao().salvar(
+        st.session_state.orcamento.itens, _cabecalho_documento(), total_com_financeiros(),
+        txt_exportacao().decode("utf-8"), orcamento_id,
+    )
+
+def _novo_registro():
+    # Itens limpos: o próximo salvamento cria outro registro em vez de
+    # sobrescrever o orçamento salvo antes
+    st.session_state.orcamento_id = None
+    st.session_state.pop("salvamento", None)
+
+def _abrir_orcamento(orcamento_id: int, clonar: bool):
+    dados = armazem_padrao().carregar(orcamento_id)
+    st.session_state.orcamento = Orcamento(dados["itens"])
+    for chave in ("cliente_nome", "cliente_contato", "consultor_nome", "validade_dias", "observacoes_finais"):
+        st.session_state[chave] = dados[chave]
+    st.session_state.finance_despesas = dados["despesas"]
+    st.session_state.finance_impostos = dados["impostos_pct"]
+    st.session_state.finance_margem = dados["margem_pct"]
+    st.session_state.orcamento_id = None if clonar else orcamento_id
+    st.session_state.pop("salvamento", None)
+    st.session_state.historico_aviso = (
+        f"Orçamento #{orcamento_id} clonado: salvar cria um novo registro." if clonar
+        else f"Orçamento #{orcamento_id} reaberto."
+    )
 
 # =========================
 # Cabeçalho visual
 # =========================
-st.markdown(
-    '<div class="header-band"><h2 style="margin:0;">TANKAR IT QUOTE TOOL</h2>'
-    '<div class="badge">Orçamentos Multisserviço</div></div>',
-    unsafe_allow_html=True
-)
-st.caption("Preencha os dados do orçamento, inclua os itens (um por vez) e exporte para TXT.")
+_rerun.etapa("cabecalho")
+st.markdown(html_cabecalho(), unsafe_allow_html=True)
+st.caption("Preencha os dados do orçamento, inclua os itens (um por vez) e exporte para TXT ou PDF.")
 
 # =========================
 # 0) Dados do Orçamento
 # =========================
 st.markdown("### 0) Dados do Orçamento")
-c1, c2 = st.columns([1,1])
-with c1:
-    st.session_state.cliente_nome = st.text_input("Nome do cliente*", value=st.session_state.cliente_nome)
-    st.session_state.validade_dias = st.number_input(
-        "Validade do orçamento (dias)*", min_value=1, step=1, value=int(st.session_state.validade_dias)
-    )
-with c2:
-    st.session_state.cliente_contato = st.text_input("Contato (email/telefone)", value=st.session_state.cliente_contato)
-    st.session_state.consultor_nome = st.text_input("Consultor Tankar*", value=st.session_state.consultor_nome)
+# Em formulário: os campos vão direto para o session_state (via key) só ao salvar
+with st.form("form_dados_orcamento", border=False):
+    c1, c2 = st.columns([1,1])
+    with c1:
+        st.text_input("Nome do cliente*", key="cliente_nome")
+        st.number_input("Validade do orçamento (dias)*", min_value=1, step=1, key="validade_dias")
+    with c2:
+        st.text_input("Contato (email/telefone)", key="cliente_contato")
+        st.text_input("Consultor Tankar*", key="consultor_nome")
+    st.form_submit_button("💾 Salvar dados do orçamento")
 
 st.markdown("<hr>", unsafe_allow_html=True)
 
 # =========================
 # 1) Escolha de Serviço
 # =========================
-SERVICOS = [
-    "— Selecione —",
-    "Consultoria em Infraestrutura / Redes / Melhorias e Suporte",
-    "Implementação ou Melhoria de Rede Wireless",
-    "Wireless Survey",
-    "Design de Rede (Wireless/Cabeada/Híbrida)",
-    "Gestão Industrial",
-    "Cursos e Treinamentos",
-    "Venda de Equipamentos",
-]
-st.markdown("### 1) Escolha o serviço")
-servico = st.selectbox("Serviço:", options=SERVICOS, index=0)
-st.markdown("<hr>", unsafe_allow_html=True)
-
-# =========================
-# 2) Formulários por Serviço
-# =========================
-if servico == "Consultoria em Infraestrutura / Redes / Melhorias e Suporte":
-    st.subheader("Consultoria (R$ 200/h)")
-    resumo = st.text_area("Resuma a solicitação do cliente (até 500 caracteres)", max_chars=500, height=120)
-    horas = st.number_input("Horas necessárias", min_value=1, step=1, value=4, help="Valor/hora fixo em R$ 200")
-    pretende_equip = st.radio("O cliente pretende adquirir equipamentos?", ["Não", "Sim"], horizontal=True) == "Sim"
-    equip_sel = []
-    if pretende_equip:
-        equip_sel = st.multiselect(
-            "Selecione os equipamentos de interesse (uma ou mais opções)",
-            options=[
-                "Access Points",
-                "Computadores / Laptops Lenovo",
-                "Servidores",
-                "Câmeras de segurança",
-            ]
+SERVICOS = ("— Selecione —",) + pricing.SERVICOS
+
+# Cada seção abaixo é um fragmento: interagir com um widget dela reexecuta
+# só a própria seção. Alterações que mudam itens ou totais pedem um rerun
+# completo para atualizar o resumo financeiro e a exportação.
+def incluir_item(item, aviso: str = "Item adicionado ao orçamento!"):
+    add_item(item)
+    # A descrição entra no índice de sugestões pela fila do armazém, sem esperar
+    armazem_padrao().registrar_textos([item])
+    st.session_state.aviso_item = aviso
+    st.rerun()
+
+def incluir_itens(itens, aviso: str):
+    itens = list(itens)
+    st.session_state.orcamento.add_itens(itens)
+    armazem_padrao().registrar_textos(itens)
+    st.session_state.aviso_item = aviso
+    st.rerun()
+
+# Textos já usados oferecidos por campo
+SUGESTOES_MAX = 5
+SUGESTAO_PREVIA = 200
+
+def _usar_texto(chave: str, texto: str, max_chars: int):
+    st.session_state[chave] = texto[:max_chars]
+
+def reaproveitar_texto(servico: str, chave: str, max_chars: int = 500):
+    # Fora do formulário, para a busca responder sem enviar o formulário.
+    # "Usar" copia o texto para o campo `chave` antes do próximo rerun.
+    with st.expander("🔎 Reaproveitar um texto já usado"):
+        consulta = st.text_input("Palavras ou início de palavras", key=f"{chave}_busca", placeholder="ex.: galpão ampl")
+        sugestoes = armazem_padrao().sugerir_textos(consulta, servico, SUGESTOES_MAX)
+        if not sugestoes:
+            st.caption("Nenhum texto encontrado.")
+        for i, texto in enumerate(sugestoes):
+            c1, c2 = st.columns([6, 1])
+            with c1:
+                st.caption(texto if len(texto) <= SUGESTAO_PREVIA else texto[:SUGESTAO_PREVIA] + "…")
+            with c2:
+                st.button("Usar", key=f"{chave}_usar_{i}", on_click=_usar_texto, args=(chave, texto, max_chars))
+
+def botoes_formulario():
+    # Os campos de cada serviço ficam num st.form: editar não dispara rerun.
+    # "Atualizar resumo" só reexecuta o fragmento para refazer a prévia.
+    b1, b2 = st.columns(2)
+    with b1:
+        st.form_submit_button("🔄 Atualizar resumo")
+    with b2:
+        return st.form_submit_button("➕ Incluir item")
+
+def survey_campus(cat):
+    st.caption(
+        "Uma linha por prédio: **prédio; andares; m² por andar**. Prédios com andares de áreas "
+        "diferentes podem ocupar várias linhas (os andares são somados)."
+    )
+    with st.form("form_survey_campus"):
+        texto = st.text_area(
+            "Cole a tabela (separada por ; , ou tabulação)", height=160,
+            placeholder="Prédio; Andares; m² por andar\nBloco A; 3; 450\nBloco A; 2; 800\nGalpão 2; 1; 2400",
         )
-    subtotal = float(horas) * HORA_CONSULTORIA
-
-    st.markdown("#### Resumo (parcial)")
-    st.markdown(f"- Horas: **{horas} h** × {format_brl(HORA_CONSULTORIA)} = **{format_brl(subtotal)}**")
-    st.markdown(f"- Interesse em equipamentos: **{'Sim' if pretende_equip else 'Não'}**")
-    if pretende_equip and equip_sel:
-        st.markdown(f"- Equipamentos: {', '.join(equip_sel)}")
+        arquivo = st.file_uploader("…ou envie um CSV", type=["csv", "txt"])
+        resumo = st.text_area("Observações / escopo (vale para todos os prédios, até 500 caracteres)", max_chars=500, height=80)
+
+        itens = {}
+        if arquivo is not None:
+            dados = arquivo.getvalue()
+            try:
+                texto = dados.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                texto = dados.decode("cp1252")
+        try:
+            itens = survey_lote.precificar_predios(survey_lote.ler_predios(texto), resumo, cat)
+        except ValueError as e:
+            st.error(str(e))
+
+        st.markdown("#### Resumo (parcial)")
+        if itens:
+            st.dataframe(
+                {
+                    "Prédio": list(itens),
+                    "Detalhes": [it.detalhes for it in itens.values()],
+                    "Subtotal": [format_centavos(it.centavos) for it in itens.values()],
+                },
+                hide_index=True, use_container_width=True,
+            )
+            st.markdown(
+                f"- Prédios: **{len(itens)}** → **{format_centavos(sum(it.centavos for it in itens.values()))}**"
+            )
+        else:
+            st.markdown("- Nenhum prédio informado.")
+        incluir = botoes_formulario()
 
-    if st.button("➕ Incluir item"):
-        if not resumo.strip():
-            st.warning("Informe o **resumo** antes de incluir.")
+    if incluir:
+        if not itens:
+            st.warning("Informe ao menos um prédio válido antes de incluir.")
         else:
-            detalhes = f"Horas: {horas} × {format_brl(HORA_CONSULTORIA)}"
+            incluir_itens(itens.values(), f"{len(itens)} prédio(s) adicionados ao orçamento!")
+
+@st.fragment
+@cronometrado("servico")
+def secao_servico():
+    # Um snapshot do catálogo por execução: prévia e item usam os mesmos preços
+    cat = catalogo_atual()
+    st.markdown("### 1) Escolha o serviço")
+    servico = st.selectbox("Serviço:", options=SERVICOS, index=0)
+    st.markdown("<hr>", unsafe_allow_html=True)
+
+    # Formulários por serviço
+    if servico == "Consultoria em Infraestrutura / Redes / Melhorias e Suporte":
+        st.subheader(f"Consultoria (R$ {cat.hora_consultoria:.0f}/h)")
+        # Fora do formulário porque mostra/oculta a lista de equipamentos
+        pretende_equip = st.radio("O cliente pretende adquirir equipamentos?", ["Não", "Sim"], horizontal=True) == "Sim"
+        reaproveitar_texto(servico, "resumo_consultoria")
+        with st.form("form_consultoria"):
+            resumo = st.text_area("Resuma a solicitação do cliente (até 500 caracteres)", max_chars=500, height=120,
+                                  key="resumo_consultoria")
+            horas = st.number_input("Horas necessárias", min_value=1, step=1, value=4, help=f"Valor/hora fixo em R$ {cat.hora_consultoria:.0f}")
+            equip_sel = []
             if pretende_equip:
-                eq = ", ".join(equip_sel) if equip_sel else "(não especificado)"
-                detalhes += f" | Interesse em equipamentos: {eq}"
-            add_item({
-                "servico": servico,
-                "descricao": resumo.strip(),
-                "detalhes": detalhes,
-                "subtotal": subtotal
-            })
-            st.success("Item adicionado ao orçamento!")
-
-elif servico == "Implementação ou Melhoria de Rede Wireless":
-    st.subheader("Implementação/Melhoria de Rede Wireless")
-    st.markdown(
-        f'<div class="card">Análise inicial obrigatória: <b>{format_brl(IMPL_ANALISE_FIXA)}</b>. '
-        f'Horas adicionais a <b>{format_brl(IMPL_HORA_ADICIONAL)}</b>. '
-        f'<br/><i>Custos de transporte serão calculados separadamente.</i></div>',
-        unsafe_allow_html=True
-    )
-    horas_adic = st.number_input("Horas adicionais", min_value=0, step=1, value=0)
-    resumo = st.text_area("Descreva a necessidade do cliente (até 500 caracteres)", max_chars=500, height=120)
-    subtotal = IMPL_ANALISE_FIXA + horas_adic * IMPL_HORA_ADICIONAL
-
-    st.markdown("#### Resumo (parcial)")
-    st.markdown(f"- Análise inicial: **{format_brl(IMPL_ANALISE_FIXA)}**")
-    st.markdown(f"- Horas adicionais: **{horas_adic} h × {format_brl(IMPL_HORA_ADICIONAL)}**")
-    st.markdown(f"- Subtotal: **{format_brl(subtotal)}**")
-    st.caption("Custos de transporte serão calculados separadamente.")
-
-    if st.button("➕ Incluir item"):
-        if not resumo.strip():
-            st.warning("Informe a **descrição/resumo** antes de incluir.")
+                equip_sel = st.multiselect(
+                    "Selecione os equipamentos de interesse (uma ou mais opções)",
+                    options=[
+                        "Access Points",
+                        "Computadores / Laptops Lenovo",
+                        "Servidores",
+                        "Câmeras de segurança",
+                    ]
+                )
+            item = pricing.preco_consultoria(horas, resumo, pretende_equip, equip_sel, catalogo=cat)
+
+            st.markdown("#### Resumo (parcial)")
+            st.markdown(f"- Horas: **{horas} h** × {format_brl(cat.hora_consultoria)} = **{format_brl(item['subtotal'])}**")
+            st.markdown(f"- Interesse em equipamentos: **{'Sim' if pretende_equip else 'Não'}**")
+            if pretende_equip and equip_sel:
+                st.markdown(f"- Equipamentos: {', '.join(equip_sel)}")
+            incluir = botoes_formulario()
+
+        if incluir:
+            if not resumo.strip():
+                st.warning("Informe o **resumo** antes de incluir.")
+            else:
+                incluir_item(item)
+
+    elif servico == "Implementação ou Melhoria de Rede Wireless":
+        st.subheader("Implementação/Melhoria de Rede Wireless")
+        st.markdown(card_implementacao(cat.impl_analise_fixa, cat.impl_hora_adicional), unsafe_allow_html=True)
+        reaproveitar_texto(servico, "resumo_implementacao")
+        with st.form("form_implementacao"):
+            horas_adic = st.number_input("Horas adicionais", min_value=0, step=1, value=0)
+            resumo = st.text_area("Descreva a necessidade do cliente (até 500 caracteres)", max_chars=500, height=120,
+                                  key="resumo_implementacao")
+            item = pricing.preco_implementacao(horas_adic, resumo, catalogo=cat)
+
+            st.markdown("#### Resumo (parcial)")
+            st.markdown(f"- Análise inicial: **{format_brl(cat.impl_analise_fixa)}**")
+            st.markdown(f"- Horas adicionais: **{horas_adic} h × {format_brl(cat.impl_hora_adicional)}**")
+            st.markdown(f"- Subtotal: **{format_brl(item['subtotal'])}**")
+            st.caption("Custos de transporte serão calculados separadamente.")
+            incluir = botoes_formulario()
+
+        if incluir:
+            if not resumo.strip():
+                st.warning("Informe a **descrição/resumo** antes de incluir.")
+            else:
+                incluir_item(item)
+
+    elif servico == "Wireless Survey":
+        st.subheader("Wireless Survey")
+        st.markdown(
+            card_survey(cat.ws_analise_fixa, cat.ws_add_por_andar, cat.ws_limite_andares, cat.ws_acima_limite),
+            unsafe_allow_html=True
+        )
+        if st.radio("Modo", ["Um prédio", "Vários prédios (campus)"], horizontal=True, key="survey_modo") != "Um prédio":
+            survey_campus(cat)
         else:
-            detalhes = (
-                f"Análise inicial {format_brl(IMPL_ANALISE_FIXA)} | "
-                f"Horas adic.: {horas_adic} × {format_brl(IMPL_HORA_ADICIONAL)} | "
-                "Transporte separado"
+            # Fora do formulário porque mostra/oculta a quantidade de andares
+            limite = cat.ws_limite_andares
+            acima_limite = f"Acima de {limite}"
+            andar_op = st.selectbox("Andares", options=[str(n) for n in range(1, limite + 1)] + [acima_limite])
+            reaproveitar_texto(servico, "resumo_survey")
+            with st.form("form_survey"):
+                col_a, col_b = st.columns(2)
+                with col_a:
+                    if andar_op == acima_limite:
+                        qtd_andares = st.number_input(f"Quantidade de andares (≥ {limite + 1})", min_value=limite + 1, step=1, value=limite + 1)
+                    else:
+                        qtd_andares = int(andar_op)
+                with col_b:
+                    metragem_op = st.selectbox("Metragem por andar (faixa)", options=list(cat.ws_metragens.keys()))
+
+                custo_metragem_por_andar = cat.ws_metragens[metragem_op]
+                custo_andares, custo_metragem_total, subtotal = pricing.custos_survey(qtd_andares, metragem_op, cat)
+
+                resumo = st.text_area("Observações / escopo do survey (até 500 caracteres)", max_chars=500, height=120,
+                                      key="resumo_survey")
+
+                st.markdown("#### Resumo (parcial)")
+                st.markdown(f"- Análise inicial: **{format_brl(cat.ws_analise_fixa)}**")
+                if andar_op == acima_limite:
+                    st.markdown(f"- Andares: **{qtd_andares}** → **{format_brl(cat.ws_acima_limite)}**")
+                else:
+                    st.markdown(f"- Andares: **{qtd_andares} × {format_brl(cat.ws_add_por_andar)} = {format_brl(custo_andares)}**")
+                st.markdown(
+                    f"- Metragem por andar: **{metragem_op}** → "
+                    f"**{qtd_andares} × {format_brl(custo_metragem_por_andar)} = {format_brl(custo_metragem_total)}**"
+                )
+                st.markdown(f"- Subtotal: **{format_brl(subtotal)}**")
+                incluir = botoes_formulario()
+
+            if incluir:
+                if qtd_andares <= 0:
+                    st.warning("Informe um número válido de andares.")
+                else:
+                    incluir_item(pricing.preco_survey(qtd_andares, metragem_op, resumo, catalogo=cat))
+
+    elif servico == "Design de Rede (Wireless/Cabeada/Híbrida)":
+        st.subheader("Design de Rede")
+        reaproveitar_texto(servico, "descricao_design")
+        with st.form("form_design"):
+            tipo = st.radio("Tipo de rede", options=["Wireless", "Cabeada", "Híbrida"], horizontal=True)
+            horas = st.number_input("Horas de projeto", min_value=1, step=1, value=8, help=f"R$ {cat.hora_design:.0f}/hora")
+            descricao = st.text_area("Descrição / Solicitação do cliente (até 500 caracteres)", max_chars=500, height=120,
+                                     key="descricao_design")
+            item = pricing.preco_design(horas, tipo, descricao, catalogo=cat)
+
+            st.markdown("#### Resumo (parcial)")
+            st.markdown(f"- Análise inicial c/ relatório: **{format_brl(cat.design_analise_fixa)}**")
+            st.markdown(f"- Horas: **{horas} × {format_brl(cat.hora_design)} = {format_brl(horas * cat.hora_design)}**")
+            st.markdown(f"- Subtotal: **{format_brl(item['subtotal'])}**")
+            incluir = botoes_formulario()
+
+        if incluir:
+            if not descricao.strip():
+                st.warning("Descreva a solicitação do cliente antes de incluir.")
+            else:
+                incluir_item(item)
+
+    elif servico == "Gestão Industrial":
+        st.subheader("Consultoria em Gestão Industrial")
+        reaproveitar_texto(servico, "resumo_gestao")
+        with st.form("form_gestao"):
+            servicos_gi = st.multiselect(
+                "Selecione os serviços (pode escolher mais de um)",
+                options=[
+                    "Gestão de estoques e PCP",
+                    "Otimização de processos",
+                    "Redução de custos",
+                    "Supply Chain e Vendas",
+                    "Criação de dashboard e indicadores",
+                    "Treinamentos (IE & ESG)",
+                ]
             )
-            add_item({
-                "servico": servico,
-                "descricao": resumo.strip(),
-                "detalhes": detalhes,
-                "subtotal": subtotal
-            })
-            st.success("Item adicionado ao orçamento!")
-
-elif servico == "Wireless Survey":
-    st.subheader("Wireless Survey")
-    st.markdown(
-        f'<div class="card">Base: <b>{format_brl(WS_ANALISE_FIXA)}</b>. '
-        f'Para prédios, some <b>{format_brl(WS_ADD_POR_ANDAR)}/andar</b> (1–10 andares) '
-        f'ou <b>{format_brl(WS_ACIMA_10_ANDARES)}</b> para mais de 10 andares. '
-        f'Metragem por andar também soma por andar.</div>',
-        unsafe_allow_html=True
-    )
-    col_a, col_b = st.columns(2)
-    with col_a:
-        andar_op = st.selectbox("Andares", options=[str(n) for n in range(1, 11)] + ["Acima de 10"])
-    with col_b:
-        metragem_op = st.selectbox("Metragem por andar (faixa)", options=list(WS_METRAGENS.keys()))
-
-    if andar_op == "Acima de 10":
-        qtd_andares = st.number_input("Quantidade de andares (≥ 11)", min_value=11, step=1, value=11)
-        custo_andares = WS_ACIMA_10_ANDARES
-    else:
-        qtd_andares = int(andar_op)
-        custo_andares = qtd_andares * WS_ADD_POR_ANDAR
-
-    custo_metragem_por_andar = WS_METRAGENS[metragem_op]
-    custo_metragem_total = qtd_andares * custo_metragem_por_andar
+            num_func = st.number_input("Número de funcionários", min_value=1, step=1, value=50)
+            resumo = st.text_area("Resumo da solicitação (até 500 caracteres)", max_chars=500, height=120,
+                                  key="resumo_gestao")
+
+            preco_base = pricing.preco_base_gestao(num_func, cat)
+
+            st.markdown("#### Resumo (parcial)")
+            st.markdown(f"- Serviços selecionados: {', '.join(servicos_gi) if servicos_gi else '(nenhum)'}")
+            st.markdown(f"- Funcionários: **{num_func}** → **{format_brl(preco_base)}**")
+            incluir = botoes_formulario()
+
+        if incluir:
+            if not resumo.strip():
+                st.warning("Resuma a solicitação antes de incluir.")
+            else:
+                incluir_item(pricing.preco_gestao_industrial(num_func, resumo, servicos_gi, catalogo=cat))
+
+    elif servico == "Cursos e Treinamentos":
+        st.subheader("Cursos e Treinamentos")
+        reaproveitar_texto(servico, "obs_cursos")
+        with st.form("form_cursos"):
+            curso = st.selectbox("Selecione o curso", options=cat.cursos_opcoes, index=0)
+            obs = st.text_area("Observações/escopo (opcional, até 500 caracteres)", max_chars=500, height=100,
+                               key="obs_cursos")
+            st.caption("⚠️ Valores não definidos — itens ficam **sob consulta**.")
+            incluir = st.form_submit_button("➕ Incluir item")
+        if incluir:
+            incluir_item(pricing.preco_curso(curso, obs), "Item adicionado (sob consulta).")
+
+    elif servico == "Venda de Equipamentos":
+        st.subheader("Venda de Equipamentos")
+        st.info("Venda de equipamento — Anexar orçamento parceiro Lenovo.")
+        if st.button("➕ Incluir item"):
+            incluir_item(pricing.preco_equipamentos())
+
+    aviso = st.session_state.pop("aviso_item", None)
+    if aviso:
+        st.success(aviso)
+
+secao_servico()
 
-    resumo = st.text_area("Observações / escopo do survey (até 500 caracteres)", max_chars=500, height=120)
-    subtotal = WS_ANALISE_FIXA + custo_andares + custo_metragem_total
-
-    st.markdown("#### Resumo (parcial)")
-    st.markdown(f"- Análise inicial: **{format_brl(WS_ANALISE_FIXA)}**")
-    if andar_op == "Acima de 10":
-        st.markdown(f"- Andares: **{qtd_andares}** → **{format_brl(WS_ACIMA_10_ANDARES)}**")
+# =========================
+# 3) Itens adicionados
+# =========================
+ITENS_POR_PAGINA = [10, 25, 50, 100]
+# Linhas de diferença mostradas ao comparar versões
+VERSOES_DIF_MAX = 100
+
+def _ir_para_item():
+    # Callback: roda antes do fragmento, então pode posicionar filtro e página
+    n = int(st.session_state.itens_ir_para)
+    st.session_state.itens_filtro = "Todos"
+    st.session_state.itens_pagina = (n - 1) // st.session_state.get("itens_por_pagina", ITENS_POR_PAGINA[0]) + 1
+    st.session_state.itens_destaque = n - 1
+
+def _voltar_primeira_pagina():
+    st.session_state.itens_pagina = 1
+
+def _ajustar_estado(chave, opcoes_ou_max, padrao):
+    # Mantém o valor de um widget válido depois que itens são removidos
+    valor = st.session_state.get(chave, padrao)
+    if isinstance(opcoes_ou_max, int):
+        st.session_state[chave] = min(max(1, int(valor)), opcoes_ou_max)
+    elif valor not in opcoes_ou_max:
+        st.session_state[chave] = padrao
+
+@st.fragment
+@cronometrado("itens")
+def secao_itens():
+    # Paginado: só os itens da página atual instanciam expander e botões;
+    # totais e exportação continuam cobrindo o orçamento inteiro.
+    st.markdown("### 2) Itens do orçamento")
+    orcamento = st.session_state.orcamento
+    # Sempre na tela (desabilitados quando não há o que desfazer) para não deslocar o layout
+    u1, u2, _ = st.columns([1, 1, 2])
+    with u1:
+        if st.button("↩️ Desfazer", key="desfazer", disabled=not orcamento.pode_desfazer,
+                     help=orcamento.descricao_desfazer or None):
+            orcamento.desfazer()
+            st.rerun()
+    with u2:
+        if st.button("↪️ Refazer", key="refazer", disabled=not orcamento.pode_refazer,
+                     help=orcamento.descricao_refazer or None):
+            orcamento.refazer()
+            st.rerun()
+    if not orcamento:
+        st.info("Nenhum item adicionado ainda. Selecione um serviço acima e clique em **Incluir item**.")
     else:
-        st.markdown(f"- Andares: **{qtd_andares} × {format_brl(WS_ADD_POR_ANDAR)} = {format_brl(custo_andares)}**")
-    st.markdown(
-        f"- Metragem por andar: **{metragem_op}** → "
-        f"**{qtd_andares} × {format_brl(custo_metragem_por_andar)} = {format_brl(custo_metragem_total)}**"
-    )
-    st.markdown(f"- Subtotal: **{format_brl(subtotal)}**")
-
-    if st.button("➕ Incluir item"):
-        if qtd_andares <= 0:
-            st.warning("Informe um número válido de andares.")
+        opcoes_filtro = ["Todos"] + sorted({it.servico for it in orcamento})
+        _ajustar_estado("itens_filtro", opcoes_filtro, "Todos")
+        _ajustar_estado("itens_ir_para", len(orcamento), 1)
+        f1, f2, f3 = st.columns([2, 1, 1])
+        with f1:
+            filtro = st.selectbox("Filtrar por serviço", options=opcoes_filtro, key="itens_filtro",
+                                  on_change=_voltar_primeira_pagina)
+        with f2:
+            por_pagina = st.selectbox("Itens por página", options=ITENS_POR_PAGINA, key="itens_por_pagina",
+                                      on_change=_voltar_primeira_pagina)
+        with f3:
+            st.number_input("Ir para o item nº", min_value=1, max_value=len(orcamento), step=1,
+                            key="itens_ir_para", on_change=_ir_para_item)
+
+        if filtro == "Todos":
+            visiveis = range(len(orcamento))
         else:
-            detalhes = [
-                f"Análise inicial {format_brl(WS_ANALISE_FIXA)}",
-                (f"Andares: {qtd_andares} (faixa >10) = {format_brl(WS_ACIMA_10_ANDARES)}"
-                 if andar_op == "Acima de 10" else
-                 f"Andares: {qtd_andares} × {format_brl(WS_ADD_POR_ANDAR)} = {format_brl(custo_andares)}"),
-                f"Metragem: {metragem_op} × {qtd_andares} = {format_brl(custo_metragem_total)}",
-            ]
-            add_item({
-                "servico": servico,
-                "descricao": (resumo or "").strip(),
-                "detalhes": " | ".join(detalhes),
-                "subtotal": subtotal
-            })
-            st.success("Item adicionado ao orçamento!")
-
-elif servico == "Design de Rede (Wireless/Cabeada/Híbrida)":
-    st.subheader("Design de Rede")
-    tipo = st.radio("Tipo de rede", options=["Wireless", "Cabeada", "Híbrida"], horizontal=True)
-    horas = st.number_input("Horas de projeto", min_value=1, step=1, value=8, help=f"R$ {HORA_DESIGN:.0f}/hora")
-    descricao = st.text_area("Descrição / Solicitação do cliente (até 500 caracteres)", max_chars=500, height=120)
-    subtotal = DESIGN_ANALISE_FIXA + horas * HORA_DESIGN
-
-    st.markdown("#### Resumo (parcial)")
-    st.markdown(f"- Análise inicial c/ relatório: **{format_brl(DESIGN_ANALISE_FIXA)}**")
-    st.markdown(f"- Horas: **{horas} × {format_brl(HORA_DESIGN)} = {format_brl(horas * HORA_DESIGN)}**")
-    st.markdown(f"- Subtotal: **{format_brl(subtotal)}**")
-
-    if st.button("➕ Incluir item"):
-        if not descricao.strip():
-            st.warning("Descreva a solicitação do cliente antes de incluir.")
+            visiveis = [i for i, it in enumerate(orcamento) if it.servico == filtro]
+        n_paginas = max(1, -(-len(visiveis) // por_pagina))
+        _ajustar_estado("itens_pagina", n_paginas, 1)
+        if n_paginas > 1:
+            pagina = st.number_input(f"Página (de {n_paginas})", min_value=1, max_value=n_paginas,
+                                     step=1, key="itens_pagina")
         else:
-            detalhes = (
-                f"Tipo: {tipo} | Análise inicial {format_brl(DESIGN_ANALISE_FIXA)} | "
-                f"Horas: {horas} × {format_brl(HORA_DESIGN)}"
+            pagina = 1
+        ini = (pagina - 1) * por_pagina
+        pagina_idx = visiveis[ini:ini + por_pagina]
+        if len(visiveis) > por_pagina or filtro != "Todos":
+            st.caption(f"Mostrando {ini + 1}–{ini + len(pagina_idx)} de {len(visiveis)} itens"
+                       f" (orçamento com {len(orcamento)} itens).")
+
+        destaque = st.session_state.pop("itens_destaque", None)
+        for i in pagina_idx:
+            it = orcamento[i]
+            with st.expander(f"Item {i+1}: {it['servico']} — {format_brl(it['subtotal'])}", expanded=(i == destaque)):
+                st.markdown(f"**Descrição/Resumo:** {it.get('descricao','-') or '-'}")
+                st.markdown(f"**Detalhes:** {it.get('detalhes','-')}")
+                st.markdown(f"**Subtotal:** {format_brl(it['subtotal'])}")
+                c1, c2 = st.columns(2)
+                with c1:
+                    if st.button(f"📄 Duplicar item {i+1}", key=f"dup_{i}"):
+                        duplicate_item(i)
+                        st.rerun()
+                with c2:
+                    if st.button(f"🗑️ Excluir item {i+1}", key=f"del_{i}"):
+                        delete_item(i)
+                        st.rerun()
+
+        colA, colB = st.columns([1,1])
+        with colA:
+            st.markdown(f"#### SUBTOTAL ITENS: {format_brl(total_itens())}")
+        with colB:
+            if st.button("🧹 Limpar todos os itens"):
+                st.session_state.orcamento.limpar()
+                _novo_registro()
+                st.rerun()
+
+    versoes = {numero: resto for numero, *resto in orcamento.versoes()}
+    if len(versoes) > 1:
+        if st.session_state.get("versao_comparar") not in versoes:
+            # A versão escolhida saiu do histórico (limite de versões)
+            st.session_state.pop("versao_comparar", None)
+        with st.expander("🕘 Versões do orçamento"):
+            atual = orcamento.versao_atual
+            escolha = st.selectbox(
+                "Comparar a versão atual com", options=list(versoes), index=None, key="versao_comparar",
+                placeholder="Escolha uma versão",
+                format_func=lambda v: (f"v{v} — {versoes[v][0]} ({versoes[v][1]} itens, {format_brl(versoes[v][2])})"
+                                       + (" · atual" if v == atual else "")),
             )
-            add_item({
-                "servico": f"{servico} — {tipo}",
-                "descricao": descricao.strip(),
-                "detalhes": detalhes,
-                "subtotal": subtotal
-            })
-            st.success("Item adicionado ao orçamento!")
-
-elif servico == "Gestão Industrial":
-    st.subheader("Consultoria em Gestão Industrial")
-    servicos_gi = st.multiselect(
-        "Selecione os serviços (pode escolher mais de um)",
-        options=[
-            "Gestão de estoques e PCP",
-            "Otimização de processos",
-            "Redução de custos",
-            "Supply Chain e Vendas",
-            "Criação de dashboard e indicadores",
-            "Treinamentos (IE & ESG)",
-        ]
-    )
-    num_func = st.number_input("Número de funcionários", min_value=1, step=1, value=50)
-    resumo = st.text_area("Resumo da solicitação (até 500 caracteres)", max_chars=500, height=120)
-
-    preco_base = None
-    for ini, fim, preco in GI_FAIXAS:
-        if ini <= num_func <= fim:
-            preco_base = preco
-            break
-    if preco_base is None:
-        preco_base = GI_FAIXAS[-1][2]
-
-    st.markdown("#### Resumo (parcial)")
-    st.markdown(f"- Serviços selecionados: {', '.join(servicos_gi) if servicos_gi else '(nenhum)'}")
-    st.markdown(f"- Funcionários: **{num_func}** → **{format_brl(preco_base)}**")
-
-    if st.button("➕ Incluir item"):
-        if not resumo.strip():
-            st.warning("Resuma a solicitação antes de incluir.")
-        else:
-            detalhes = f"Serviços: {', '.join(servicos_gi) if servicos_gi else '(não especificado)'} | Funcionários: {num_func}"
-            add_item({
-                "servico": servico,
-                "descricao": resumo.strip(),
-                "detalhes": detalhes,
-                "subtotal": preco_base
-            })
-            st.success("Item adicionado ao orçamento!")
-
-elif servico == "Cursos e Treinamentos":
-    st.subheader("Cursos e Treinamentos")
-    curso = st.selectbox("Selecione o curso", options=CURSOS_OPCOES, index=0)
-    obs = st.text_area("Observações/escopo (opcional, até 500 caracteres)", max_chars=500, height=100)
-    st.caption("⚠️ Valores não definidos — itens ficam **sob consulta**.")
-    subtotal = 0.0
-    if st.button("➕ Incluir item"):
-        add_item({
-            "servico": servico,
-            "descricao": (obs or "").strip(),
-            "detalhes": f"Curso: {curso} | Preço: sob consulta",
-            "subtotal": subtotal
-        })
-        st.success("Item adicionado (sob consulta).")
-
-elif servico == "Venda de Equipamentos":
-    st.subheader("Venda de Equipamentos")
-    st.info("Venda de equipamento — Anexar orçamento parceiro Lenovo.")
-    if st.button("➕ Incluir item"):
-        add_item({
-            "servico": servico,
-            "descricao": "Venda de equipamento — anexar orçamento parceiro Lenovo.",
-            "detalhes": "Item sem valor neste documento (apenas referência).",
-            "subtotal": 0.0
-        })
-        st.success("Item adicionado ao orçamento!")
-
-# =========================
-# 3) Itens adicionados
-# =========================
-st.markdown("### 2) Itens do orçamento")
-if not st.session_state.itens:
-    st.info("Nenhum item adicionado ainda. Selecione um serviço acima e clique em **Incluir item**.")
-else:
-    for i, it in enumerate(st.session_state.itens):
-        with st.expander(f"Item {i+1}: {it['servico']} — {format_brl(it['subtotal'])}", expanded=False):
-            st.markdown(f"**Descrição/Resumo:** {it.get('descricao','-') or '-'}")
-            st.markdown(f"**Detalhes:** {it.get('detalhes','-')}")
-            st.markdown(f"**Subtotal:** {format_brl(it['subtotal'])}")
-            c1, c2 = st.columns(2)
-            with c1:
-                if st.button(f"📄 Duplicar item {i+1}", key=f"dup_{i}"):
-                    duplicate_item(i)
-                    st.rerun()
-            with c2:
-                if st.button(f"🗑️ Excluir item {i+1}", key=f"del_{i}"):
-                    delete_item(i)
+            if escolha is not None and escolha != atual:
+                difs = orcamento.diferencas(escolha)
+                if difs:
+                    linhas = [
+                        f"- {'➕' if op == '+' else '➖'} Item {pos + 1}: {it.servico} — {format_brl(it.subtotal)}"
+                        for op, pos, it in difs[:VERSOES_DIF_MAX]
+                    ]
+                    st.markdown("\n".join(linhas))
+                    if len(difs) > VERSOES_DIF_MAX:
+                        st.caption(f"… e mais {len(difs) - VERSOES_DIF_MAX} diferenças.")
+                else:
+                    st.caption("Mesmos itens da versão atual.")
+                if st.button(f"Voltar para a versão v{escolha}", key="versao_restaurar"):
+                    orcamento.restaurar(escolha)
                     st.rerun()
 
-    colA, colB = st.columns([1,1])
-    with colA:
-        st.markdown(f"#### SUBTOTAL ITENS: {format_brl(total_itens())}")
-    with colB:
-        if st.button("🧹 Limpar todos os itens"):
-            st.session_state.itens = []
-            st.rerun()
+secao_itens()
 
 # =========================
 # 4) Observações + Finanças + Exportar TXT
 # =========================
+_rerun.etapa("observacoes")
 st.markdown("### 3) Informações gerais (até 1000 caracteres)")
+reaproveitar_texto(TEXTOS_OBSERVACOES, "observacoes_finais", max_chars=1000)
 st.session_state.observacoes_finais = st.text_area(
     "Inclua informações e condições gerais da solicitação:",
     value=st.session_state.observacoes_finais,
@@ -530,21 +692,33 @@ st.session_state.observacoes_finais = st.text_area(
 )
 
 # Financeiro na lateral
-with st.sidebar:
-    st.session_state.finance_despesas = st.number_input(
+def _financeiro_alterado():
+    st.session_state.finance_alterado = True
+
+@st.fragment
+@cronometrado("financeiro")
+def secao_financeiro():
+    st.number_input(
         "Despesas (R$) — viagens, hospedagem etc.",
-        min_value=0.0, step=100.0, value=float(st.session_state.finance_despesas)
+        min_value=0.0, step=100.0, key="finance_despesas", on_change=_financeiro_alterado
     )
-    st.session_state.finance_impostos = st.number_input(
+    st.number_input(
         "Impostos (%) — aplicados sobre Subtotal + Despesas",
-        min_value=0.0, step=0.5, value=float(st.session_state.finance_impostos)
+        min_value=0.0, step=0.5, key="finance_impostos", on_change=_financeiro_alterado
     )
-    st.session_state.finance_margem = st.number_input(
+    st.number_input(
         "Margem/Markup (%) — aplicada após impostos",
-        min_value=0.0, step=0.5, value=float(st.session_state.finance_margem)
+        min_value=0.0, step=0.5, key="finance_margem", on_change=_financeiro_alterado
     )
+    # O resumo e a exportação ficam no corpo da página: atualiza o app todo
+    if st.session_state.pop("finance_alterado", False):
+        st.rerun()
+
+with st.sidebar:
+    secao_financeiro()
 
 # Resumo financeiro no corpo — com TOTAL GERAL simples (ASCII)
+_rerun.etapa("resumo")
 st.markdown("### 4) Resumo financeiro")
 fin = total_com_financeiros()
 st.markdown(f"- Subtotal itens: **{format_brl(fin['subtotal'])}**")
@@ -553,19 +727,209 @@ st.markdown(f"- Impostos ({fin['impostos_pct']}%): **{format_brl(fin['impostos_v
 st.markdown(f"- Margem/Markup ({fin['margem_pct']}%): **{format_brl(fin['margem_valor'])}**")
 st.subheader(f"TOTAL GERAL: {format_brl(fin['total'])}")
 
+# Simulação: totais para uma grade de impostos × margem (× despesas) numa
+# passada só, e a margem necessária para chegar a um total desejado
+SIMULACAO_PASSOS = (0.25, 0.5, 1.0, 2.5, 5.0)
+SIMULACAO_MAX_CELULAS = 1500
+
+def _pct(valor: float) -> str:
+    return f"{valor:.2f}".rstrip("0").rstrip(".").replace(".", ",") + "%"
+
+def _faixa(inicio: float, fim: float, passo: float) -> list:
+    # Passos inteiros que cabem na faixa (a folga absorve o erro de ponto
+    # flutuante em divisões exatas como 7,5 / 2,5); nunca passa de `fim`
+    n = math.floor((fim - inicio) / passo + 1e-9) + 1
+    return [round(inicio + k * passo, 2) for k in range(n)]
+
+def _aplicar_margem(margem: float):
+    st.session_state.finance_margem = margem
+    _financeiro_alterado()
+
+@st.fragment
+@cronometrado("simulacao")
+def secao_simulacao():
+    if not st.toggle("🔎 Simular impostos e margem", key="simulacao_aberta"):
+        return
+    import pricing_lote  # NumPy só é carregado quando a simulação é aberta
+
+    impostos = float(st.session_state.finance_impostos)
+    margem = float(st.session_state.finance_margem)
+    base_impostos, base_margem = min(impostos, 95.0), min(margem, 90.0)
+    despesas = float(st.session_state.finance_despesas)
+    c1, c2, c3 = st.columns(3)
+    faixa_impostos = c1.slider(
+        "Impostos (%)", 0.0, 100.0, (max(0.0, base_impostos - 5), base_impostos + 5), step=0.25, key="sim_impostos"
+    )
+    faixa_margem = c2.slider(
+        "Margem/Markup (%)", 0.0, 100.0, (max(0.0, base_margem - 5), base_margem + 10), step=0.25, key="sim_margem"
+    )
+    passo = c3.select_slider("Passo (%)", options=SIMULACAO_PASSOS, value=1.0, key="sim_passo")
+    c1, c2 = st.columns(2)
+    variacao = c1.number_input(
+        "Variação de despesas (R$) — 0 compara só as atuais", min_value=0.0, step=100.0, key="sim_despesas_variacao"
+    )
+    alvo = c2.number_input("TOTAL GERAL desejado (R$)", min_value=0.0, step=100.0, key="sim_alvo")
+
+    grade_impostos = _faixa(*faixa_impostos, passo)
+    grade_margem = _faixa(*faixa_margem, passo)
+    if len(grade_impostos) * len(grade_margem) > SIMULACAO_MAX_CELULAS:
+        st.warning("Grade grande demais: aumente o passo ou estreite as faixas.")
+        return
+    grade_despesas = sorted({max(0.0, despesas + k * variacao) for k in (-2, -1, 0, 1, 2)})
+
+    subtotal_c = st.session_state.orcamento.subtotal_centavos
+    totais = pricing_lote.grade_totais(subtotal_c, grade_despesas, grade_impostos, grade_margem)
+    if len(grade_despesas) > 1:
+        d = st.radio(
+            "Despesas", range(len(grade_despesas)), index=grade_despesas.index(despesas), horizontal=True,
+            format_func=lambda i: format_brl(grade_despesas[i]), key="sim_despesas_escolha",
+        )
+    else:
+        d = 0
+    tabela = {"Impostos ↓ Margem →": [_pct(i) for i in grade_impostos]}
+    for j, m in enumerate(grade_margem):
+        tabela[_pct(m)] = [format_centavos(int(v)) for v in totais[d, :, j]]
+    st.dataframe(tabela, hide_index=True, use_container_width=True)
+
+    if alvo > 0:
+        alvo_c = centavos(alvo)
+        necessaria = float(pricing_lote.margem_para_total(subtotal_c, alvo_c, [despesas], [impostos])[0, 0])
+        if necessaria != necessaria:  # NaN
+            st.info(f"Com margem zero o TOTAL GERAL já passa de {format_brl(alvo)} (despesas e impostos atuais).")
+        elif math.isinf(necessaria):
+            st.info(
+                f"Sem subtotal nem despesas, nenhuma margem chega a {format_brl(alvo)}: "
+                "inclua itens ou despesas no orçamento."
+            )
+        else:
+            st.markdown(
+                f"Margem necessária para **{format_brl(alvo)}** com despesas e impostos atuais: **{_pct(necessaria)}**"
+            )
+            st.button(f"Aplicar margem de {_pct(necessaria)}", on_click=_aplicar_margem, args=(necessaria,))
+        margens = pricing_lote.margem_para_total(subtotal_c, alvo_c, grade_despesas, grade_impostos)
+        inversa = {"Despesas ↓ Impostos →": [format_brl(v) for v in grade_despesas]}
+        for j, i in enumerate(grade_impostos):
+            inversa[_pct(i)] = ["—" if m != m else "✕" if math.isinf(m) else _pct(m) for m in margens[:, j]]
+        st.caption(
+            "Margem necessária para o total desejado (— = já passa do total com margem zero; "
+            "✕ = sem subtotal nem despesas, nenhuma margem chega ao total)"
+        )
+        st.dataframe(inversa, hide_index=True, use_container_width=True)
+
+    # Margem aplicada: o resumo e a exportação ficam fora do fragmento
+    if st.session_state.pop("finance_alterado", False):
+        st.rerun()
+
+secao_simulacao()
+
 # Exportação TXT
-st.markdown("### 5) Exportar orçamento (TXT)")
-tem_itens = len(st.session_state.itens) > 0
+_rerun.etapa("exportacao")
+# Gravação no histórico já concluída: o id vale para os botões abaixo
+salvamento = st.session_state.get("salvamento")
+if salvamento is not None and salvamento.done():
+    del st.session_state["salvamento"]
+    if salvamento.exception() is not None:
+        st.error(f"Não foi possível salvar o orçamento: {salvamento.exception()}")
+    else:
+        st.session_state.orcamento_id = salvamento.result()
+st.markdown("### 5) Exportar orçamento (TXT / PDF)")
+tem_itens = len(st.session_state.orcamento) > 0
 dados_ok = bool(st.session_state.cliente_nome.strip()) and bool(st.session_state.consultor_nome.strip())
 if not tem_itens:
     st.info("Adicione pelo menos **um item** para habilitar a exportação.")
 elif not dados_ok:
     st.info("Preencha **Nome do cliente** e **Consultor Tankar** para habilitar a exportação.")
 else:
-    txt_content = gerar_txt_final()
     st.download_button(
         label="📄 Baixar .TXT",
-        file_name=f"orcamento_TANKAR_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+        file_name=documento.nome_arquivo_txt(),
         mime="text/plain",
-        data=txt_content.encode("utf-8")
+        data=txt_exportacao()
+    )
+    pedido_pdf = st.session_state.get("pdf_pedido")
+    pdf_pendente = pedido_pdf is not None and not pedido_pdf[1].done()
+    st.fragment(cronometrado("pdf")(_secao_pdf), run_every=1.0 if pdf_pendente else None)(pdf_pendente)
+    _rerun.etapa("exportacao")
+    if st.session_state.orcamento_id is None:
+        if st.button("🗄️ Salvar no histórico"):
+            salvar_orcamento()
+    else:
+        # Deixa claro qual registro será substituído antes de salvar
+        orcamento_id = st.session_state.orcamento_id
+        st.caption(f"Este orçamento está salvo como #{orcamento_id}: atualizar substitui aquele registro.")
+        c1, c2 = st.columns(2)
+        with c1:
+            if st.button(f"🗄️ Atualizar #{orcamento_id} no histórico"):
+                salvar_orcamento()
+        with c2:
+            if st.button("🆕 Salvar como novo orçamento"):
+                salvar_orcamento(como_novo=True)
+
+if st.session_state.get("salvamento") is not None:
+    st.caption("Salvando no histórico…")
+elif st.session_state.orcamento_id is not None:
+    st.caption(f"Salvo no histórico como #{st.session_state.orcamento_id}.")
+
+# =========================
+# 6) Orçamentos salvos
+# =========================
+HISTORICO_POR_PAGINA = 10
+HISTORICO_SERVICOS = ("Todos",) + pricing.SERVICOS
+
+def _historico_primeira_pagina():
+    st.session_state.historico_cursores = [None]
+
+@st.fragment
+@cronometrado("historico")
+def secao_historico():
+    st.markdown("### 6) Orçamentos salvos")
+    h1, h2, h3 = st.columns([2, 2, 2])
+    with h1:
+        cliente = st.text_input("Cliente (início do nome)", key="historico_cliente",
+                                on_change=_historico_primeira_pagina)
+    with h2:
+        consultor = st.text_input("Consultor", key="historico_consultor",
+                                  on_change=_historico_primeira_pagina)
+    with h3:
+        servico = st.selectbox("Com serviço", options=HISTORICO_SERVICOS, key="historico_servico",
+                               on_change=_historico_primeira_pagina)
+
+    # Pilha de cursores: o topo é o início da página atual
+    cursores = st.session_state.setdefault("historico_cursores", [None])
+    linhas, proximo = armazem_padrao().buscar(
+        cliente, consultor, "" if servico == "Todos" else servico,
+        limite=HISTORICO_POR_PAGINA, cursor=cursores[-1],
     )
+    if not linhas:
+        st.info("Nenhum orçamento salvo encontrado.")
+    for linha in linhas:
+        c1, c2, c3 = st.columns([5, 1, 1])
+        with c1:
+            st.markdown(
+                f"**#{linha['id']}** · {linha['criado_em']} · {linha['cliente_nome'] or '(sem cliente)'} · "
+                f"{linha['consultor_nome'] or '-'} · {linha['n_itens']} itens · "
+                f"**{format_centavos(linha['total_centavos'])}**"
+            )
+        with c2:
+            st.button("Reabrir", key=f"reabrir_{linha['id']}", on_click=_abrir_orcamento, args=(linha["id"], False))
+        with c3:
+            st.button("Clonar", key=f"clonar_{linha['id']}", on_click=_abrir_orcamento, args=(linha["id"], True))
+
+    p1, p2 = st.columns(2)
+    with p1:
+        if len(cursores) > 1 and st.button("← Mais recentes"):
+            cursores.pop()
+            st.rerun(scope="fragment")
+    with p2:
+        if proximo is not None and st.button("Mais antigos →"):
+            cursores.append(proximo)
+            st.rerun(scope="fragment")
+
+    # Reabrir/clonar troca o orçamento inteiro: atualiza o app todo
+    aviso = st.session_state.pop("historico_aviso", None)
+    if aviso:
+        st.session_state.aviso_item = aviso
+        st.rerun()
+
+secao_historico()
+_rerun.concluir()
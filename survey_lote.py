@@ -0,0 +1,96 @@
+# =========================
+# Wireless Survey em lote (campus com vários prédios, sem Streamlit)
+# =========================
+# Lê uma tabela colada ou um CSV com "prédio; andares; m² por andar". Um
+# prédio pode ocupar várias linhas (grupos de andares com áreas
+# diferentes). As linhas de um mesmo prédio são somadas, e o lote inteiro
+# é precificado com um único snapshot do catálogo, pelas regras de
+# pricing.preco_survey: custo de andares pelo total do prédio (com o teto
+# acima do limite) e metragem pela faixa da área de cada andar.
+
+import csv
+import math
+import re
+
+import pricing
+from catalogo import catalogo_atual
+
+# Um campus grande cabe folgado; acima disso é provável que o arquivo esteja errado
+MAX_LINHAS = 5000
+
+def _numero(texto: str) -> float:
+    # Aceita "1.250,5", "1250,5", "1.250" (milhar) e "1250.5"
+    t = texto.strip().lower().replace(" ", "").removesuffix("m²").removesuffix("m2")
+    if "," in t:
+        t = t.replace(".", "").replace(",", ".")
+    elif re.fullmatch(r"\d{1,3}(\.\d{3})+", t):
+        t = t.replace(".", "")
+    valor = float(t)
+    if not math.isfinite(valor):
+        raise ValueError(texto)
+    return valor
+
+def _inteiro(texto: str) -> int:
+    valor = _numero(texto)
+    if valor != int(valor):
+        raise ValueError
+    return int(valor)
+
+def ler_predios(texto: str) -> list:
+    """[(prédio, andares, área por andar em m²), ...] na ordem do texto.
+
+    Separador ";", "," ou tabulação; a primeira linha pode ser cabeçalho.
+    Erros de conteúdo levantam ValueError com o número da linha.
+    """
+    linhas = texto.splitlines()
+    if not texto.strip():
+        return []
+    if len(linhas) > MAX_LINHAS:
+        raise ValueError(f"Tabela com {len(linhas)} linhas; o limite é {MAX_LINHAS}.")
+    amostra = "\n".join([linha for linha in linhas if linha.strip()][:20])
+    try:
+        separador = csv.Sniffer().sniff(amostra, delimiters=";\t,").delimiter
+    except csv.Error:
+        separador = ";" if ";" in amostra else ("\t" if "\t" in amostra else ",")
+
+    predios = []
+    primeira = True
+    for n, campos in enumerate(csv.reader(linhas, delimiter=separador), 1):
+        campos = [c.strip() for c in campos]
+        if not any(campos):
+            continue
+        if len(campos) != 3:
+            raise ValueError(f"Linha {n}: esperado prédio; andares; m² por andar (veio {len(campos)} colunas).")
+        nome, andares, area = campos
+        cabecalho_possivel, primeira = primeira, False
+        try:
+            andares, area = _inteiro(andares), _numero(area)
+        except ValueError:
+            if cabecalho_possivel:
+                continue  # cabeçalho
+            raise ValueError(f"Linha {n}: andares e m² precisam ser números ({campos[1]!r}, {campos[2]!r}).") from None
+        if not nome:
+            raise ValueError(f"Linha {n}: informe o nome do prédio.")
+        if andares < 1 or area <= 0:
+            raise ValueError(f"Linha {n}: andares precisa ser ≥ 1 e m² maior que zero.")
+        predios.append((nome, andares, area))
+    return predios
+
+def agrupar_predios(predios, catalogo=None) -> dict:
+    # prédio -> {faixa de metragem: andares}, na ordem em que aparecem
+    cat = catalogo or catalogo_atual()
+    grupos = {}
+    for nome, andares, area in predios:
+        faixas = grupos.setdefault(nome, {})
+        faixa = cat.faixa_metragem(area)
+        faixas[faixa] = faixas.get(faixa, 0) + andares
+    return grupos
+
+def precificar_predios(predios, resumo: str = "", catalogo=None) -> dict:
+    """{prédio: ItemOrcamento de Wireless Survey}, todos com o mesmo catálogo."""
+    cat = catalogo or catalogo_atual()
+    resumo = (resumo or "").strip()
+    return {
+        nome: pricing.preco_survey_predio(faixas, f"{nome} — {resumo}" if resumo else nome, cat)
+        for nome, faixas in agrupar_predios(predios, cat).items()
+    }
@@ -0,0 +1,128 @@
+import sqlite3
+
+import pytest
+
+import armazem
+import pricing
+from armazem import ArmazemOrcamentos
+from catalogo import catalogo_atual
+
+# Itens da tabela `itens` antes da versão 2 do esquema (sem as colunas de quantidades)
+_COLUNAS_MEDIDAS = (
+    "    horas              INTEGER,\n",
+    "    andares            INTEGER,\n",
+    "    funcionarios       INTEGER,\n",
+)
+
+
+def _itens():
+    metragem = next(iter(catalogo_atual().ws_metragens))
+    return [
+        pricing.preco_consultoria(8, "diagnóstico de rede"),
+        pricing.preco_implementacao(2, "rollout"),
+        pricing.preco_survey(12, metragem, "prédio sede"),
+        pricing.preco_gestao_industrial(150, "planta"),
+        pricing.preco_design(10, "Design de Produto"),
+        pricing.preco_equipamentos(),
+    ]
+
+
+def _banco_antigo(caminho, user_version: int, itens):
+    esquema = armazem._ESQUEMA
+    for linha in _COLUNAS_MEDIDAS:
+        assert linha in esquema
+        esquema = esquema.replace(linha, "")
+    conn = sqlite3.connect(caminho)
+    conn.executescript(esquema)
+    cur = conn.execute(
+        "INSERT INTO orcamentos (criado_em, atualizado_em, cliente_nome, observacoes_finais, n_itens) "
+        "VALUES ('2025-01-02 10:00:00', '2025-01-02 10:00:00', 'ACME', 'pagamento em 30 dias', ?)",
+        (len(itens),),
+    )
+    conn.executemany(
+        "INSERT INTO itens (orcamento_id, posicao, servico, descricao, detalhes, subtotal_centavos) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(cur.lastrowid, pos, it.servico, it.descricao, it.detalhes, it.centavos) for pos, it in enumerate(itens)],
+    )
+    conn.execute(f"PRAGMA user_version = {user_version}")
+    conn.commit()
+    conn.close()
+    return cur.lastrowid
+
+
+@pytest.fixture
+def abrir():
+    abertos = []
+
+    def _abrir(caminho):
+        arm = ArmazemOrcamentos(str(caminho), tamanho_pool=1)
+        abertos.append(arm)
+        return arm
+
+    yield _abrir
+    for arm in abertos:
+        arm.fechar()
+
+
+def _medidas(itens):
+    return [(it.horas, it.andares, it.funcionarios) for it in itens]
+
+
+def test_migra_banco_v1_preenchendo_quantidades(tmp_path, abrir):
+    caminho = tmp_path / "v1.db"
+    itens = _itens()
+    orcamento_id = _banco_antigo(caminho, 1, itens)
+
+    arm = abrir(caminho)
+    with arm.conexao() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(itens)")}
+    assert set(pricing.MEDIDAS) <= colunas
+
+    carregados = arm.carregar(orcamento_id)["itens"]
+    assert carregados == itens
+    assert _medidas(carregados) == [(8, None, None), (2, None, None), (None, 12, None),
+                                    (None, None, 150), (10, None, None), (None, None, None)]
+
+
+def test_migra_banco_v0_indexando_textos(tmp_path, abrir):
+    caminho = tmp_path / "v0.db"
+    itens = _itens()
+    orcamento_id = _banco_antigo(caminho, 0, itens)
+
+    arm = abrir(caminho)
+    assert arm.sugerir_textos("diag", pricing.SERVICO_CONSULTORIA) == ["diagnóstico de rede"]
+    assert arm.sugerir_textos("pagamento", armazem.TEXTOS_OBSERVACOES) == ["pagamento em 30 dias"]
+    assert _medidas(arm.carregar(orcamento_id)["itens"]) == _medidas(itens)
+
+
+def test_abrir_de_novo_nao_migra_outra_vez(tmp_path, abrir):
+    caminho = tmp_path / "v1.db"
+    orcamento_id = _banco_antigo(caminho, 1, _itens())
+    abrir(caminho).fechar()
+    with sqlite3.connect(caminho) as conn:
+        conn.execute("UPDATE itens SET horas = 99 WHERE posicao = 0")
+    arm = abrir(caminho)
+    assert arm.carregar(orcamento_id)["itens"][0].horas == 99
+
+
+def test_salvar_e_carregar_mantem_quantidades(tmp_path, abrir):
+    arm = abrir(tmp_path / "novo.db")
+    itens = _itens()
+    fin = pricing.total_com_financeiros(pricing.total_itens(itens), 150.0, 10.0, 20.0)
+    cabecalho = {"cliente_nome": "ACME", "consultor_nome": "Ana", "validade_dias": 15}
+    orcamento_id = arm.salvar(itens, cabecalho, fin).result(timeout=10)
+
+    dados = arm.carregar(orcamento_id)
+    assert dados["itens"] == itens
+    assert _medidas(dados["itens"]) == _medidas(itens)
+    assert dados["total_centavos"] == fin["centavos"]["total"]
+    assert dados["despesas"] == 150.0
+    assert (dados["cliente_nome"], dados["validade_dias"]) == ("ACME", 15)
+
+    # Regravar substitui os itens e mantém a data de criação
+    arm.salvar(itens[:2], cabecalho, fin, orcamento_id=orcamento_id).result(timeout=10)
+    regravado = arm.carregar(orcamento_id)
+    assert regravado["itens"] == itens[:2]
+    assert regravado["criado_em"] == dados["criado_em"]
+    assert arm.contar() == 1
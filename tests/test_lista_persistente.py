@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from lista_persistente import RAMOS, ListaPersistente
+
+# Tamanhos em volta das trocas de altura da árvore (32 e 32 * 32)
+TAMANHOS = [0, 1, RAMOS - 1, RAMOS, RAMOS + 1, RAMOS**2 - 1, RAMOS**2, RAMOS**2 + 1, 2 * RAMOS**2 + 5]
+
+
+def _confere(lista: ListaPersistente, esperado: list):
+    assert len(lista) == len(esperado)
+    assert list(lista) == esperado
+    for i in (0, len(esperado) // 2, len(esperado) - 1, -1, -len(esperado)):
+        if esperado:
+            assert lista[i] == esperado[i]
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_de_igual_a_list(n):
+    valores = list(range(n))
+    lista = ListaPersistente.de(valores)
+    _confere(lista, valores)
+    assert [lista[i] for i in range(n)] == valores
+    assert lista[3:n - 2:7] == valores[3:n - 2:7]
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_anexar_um_a_um_igual_a_de(n):
+    lista = ListaPersistente()
+    for i in range(n):
+        lista = lista.anexar(i)
+    _confere(lista, list(range(n)))
+
+
+@pytest.mark.parametrize("semente", range(6))
+def test_operacoes_aleatorias_contra_list(semente):
+    rnd = random.Random(semente)
+    esperado = list(range(rnd.choice([0, RAMOS - 2, RAMOS**2 - 3])))
+    lista = ListaPersistente.de(esperado)
+    versoes = [(lista, list(esperado))]
+    for passo in range(3000):
+        op = rnd.random()
+        # Tende a crescer até passar de 1024 e depois a encolher até perto de zero
+        crescer = 0.65 if passo < 1500 else 0.3
+        if op < crescer or not esperado:
+            i = rnd.randint(0, len(esperado))
+            lista = lista.inserir(i, ("novo", passo))
+            esperado.insert(i, ("novo", passo))
+        elif op < crescer + 0.25:
+            i = rnd.randrange(len(esperado))
+            lista = lista.remover(i)
+            del esperado[i]
+        else:
+            i = rnd.randrange(len(esperado))
+            lista = lista.substituir(i, ("troca", passo))
+            esperado[i] = ("troca", passo)
+        if passo % 100 == 0:
+            _confere(lista, esperado)
+            versoes.append((lista, list(esperado)))
+    _confere(lista, esperado)
+    # Versões antigas continuam intactas (compartilham a estrutura, não a mudança)
+    for antiga, conteudo in versoes:
+        _confere(antiga, conteudo)
+
+
+def test_remover_tudo_desde_duas_alturas():
+    esperado = list(range(RAMOS**2 + 40))
+    lista = ListaPersistente.de(esperado)
+    rnd = random.Random(1)
+    while esperado:
+        i = rnd.randrange(len(esperado))
+        lista = lista.remover(i)
+        del esperado[i]
+        if len(esperado) % 97 == 0:
+            _confere(lista, esperado)
+    assert len(lista) == 0 and list(lista) == []
+    assert list(lista.anexar("x")) == ["x"]
+
+
+def test_indices_negativos_e_fora_da_lista():
+    lista = ListaPersistente.de(range(RAMOS + 5))
+    assert lista.remover(-1)[-1] == RAMOS + 3
+    assert lista.substituir(-2, "x")[-2] == "x"
+    for operacao in (lambda: lista[RAMOS + 5], lambda: lista[-(RAMOS + 6)],
+                     lambda: lista.remover(RAMOS + 5), lambda: lista.substituir(-(RAMOS + 6), 0)):
+        with pytest.raises(IndexError):
+            operacao()
+    with pytest.raises(IndexError):
+        ListaPersistente().remover(0)
+
+
+def test_inserir_fora_dos_limites_vai_para_as_pontas():
+    lista = ListaPersistente.de([1, 2, 3])
+    assert list(lista.inserir(-10, 0)) == [0, 1, 2, 3]
+    assert list(lista.inserir(99, 4)) == [1, 2, 3, 4]
+
+
+def test_estender():
+    lista = ListaPersistente.de(range(RAMOS - 1)).estender(range(RAMOS - 1, RAMOS**2 + 3))
+    _confere(lista, list(range(RAMOS**2 + 3)))
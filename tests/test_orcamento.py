@@ -0,0 +1,135 @@
+import pytest
+
+import orcamento
+import pricing
+from orcamento import Orcamento
+
+
+def _itens():
+    return [
+        pricing.preco_consultoria(8, "diagnóstico"),
+        pricing.preco_implementacao(2, "rollout"),
+        pricing.preco_design(10, "Design de Produto"),
+    ]
+
+
+def _soma_c(orc: Orcamento) -> int:
+    return sum(item.centavos for item in orc)
+
+
+def test_subtotal_acompanha_alteracoes():
+    a, b, c = _itens()
+    orc = Orcamento([a])
+    orc.add_item(b)
+    orc.add_itens([c, a])
+    orc.duplicate_item(1)
+    orc.delete_item(0)
+    assert list(orc) == [b, c, a, b]
+    assert orc.subtotal_centavos == _soma_c(orc)
+    # Índices fora da lista não criam versão
+    versao = orc.versao_atual
+    orc.delete_item(10)
+    orc.duplicate_item(-1)
+    orc.add_itens([])
+    assert orc.versao_atual == versao
+
+
+def test_desfazer_e_refazer_voltam_itens_e_subtotal():
+    a, b, c = _itens()
+    orc = Orcamento()
+    estados = [([], 0)]
+    for item in (a, b, c):
+        orc.add_item(item)
+        estados.append((list(orc), orc.subtotal_centavos))
+    for itens, subtotal_c in reversed(estados[:-1]):
+        orc.desfazer()
+        assert (list(orc), orc.subtotal_centavos) == (itens, subtotal_c)
+    assert not orc.pode_desfazer
+    orc.desfazer()
+    assert list(orc) == []
+    for itens, subtotal_c in estados[1:]:
+        orc.refazer()
+        assert (list(orc), orc.subtotal_centavos) == (itens, subtotal_c)
+    assert not orc.pode_refazer
+
+
+def test_desfazer_depois_de_limpar():
+    orc = Orcamento(_itens())
+    antes = list(orc)
+    orc.limpar()
+    assert len(orc) == 0 and orc.subtotal_centavos == 0
+    assert orc.descricao_desfazer == "Limpar 3 itens"
+    orc.desfazer()
+    assert list(orc) == antes
+    assert orc.subtotal_centavos == _soma_c(orc)
+    orc.refazer()
+    assert len(orc) == 0
+    # Limpar um orçamento vazio não cria versão
+    versao = orc.versao_atual
+    orc.limpar()
+    assert orc.versao_atual == versao
+
+
+def test_alteracao_nova_descarta_refazer():
+    a, b, c = _itens()
+    orc = Orcamento([a])
+    orc.add_item(b)
+    orc.desfazer()
+    assert orc.pode_refazer
+    orc.add_item(c)
+    assert not orc.pode_refazer
+    assert list(orc) == [a, c]
+    assert [n for n, *_ in orc.versoes()] == [0, 2]
+
+
+def test_financeiro_recalcula_apos_desfazer():
+    a, b, _ = _itens()
+    orc = Orcamento([a])
+    so_a = orc.financeiro(100.0, 10.0, 20.0)["total"]
+    orc.add_item(b)
+    com_b = orc.financeiro(100.0, 10.0, 20.0)["total"]
+    assert com_b > so_a
+    orc.desfazer()
+    assert orc.financeiro(100.0, 10.0, 20.0)["total"] == so_a
+
+
+def test_restaurar_e_diferencas():
+    a, b, c = _itens()
+    orc = Orcamento([a, b])
+    orc.delete_item(0)
+    orc.add_item(c)
+    assert orc.diferencas(0) == [("-", 0, a), ("+", 1, c)]
+    assert orc.diferencas(1, 2) == [("+", 1, c)]
+    orc.restaurar(0)
+    assert list(orc) == [a, b]
+    assert orc.descricao_desfazer == "Restaurar versão 0"
+    assert orc.diferencas(3) == []
+    # Restaurar é uma alteração nova: desfazer volta ao estado anterior
+    orc.desfazer()
+    assert list(orc) == [b, c]
+
+
+def test_diferencas_compara_por_identidade():
+    a, b, _ = _itens()
+    copia = pricing.ItemOrcamento.de(a.como_dict())
+    assert orcamento.diferencas([a, b], [copia, b]) == [("-", 0, a), ("+", 0, copia)]
+    assert orcamento.diferencas([a, b, a], [a, a]) == [("-", 1, b)]
+
+
+def test_historico_limitado_mantem_numeros(monkeypatch):
+    monkeypatch.setattr(orcamento, "HISTORICO_MAX", 5)
+    item = _itens()[0]
+    orc = Orcamento()
+    for _ in range(12):
+        orc.add_item(item)
+    numeros = [n for n, *_ in orc.versoes()]
+    assert numeros == [8, 9, 10, 11, 12]
+    assert orc.versao_atual == 12
+    with pytest.raises(KeyError):
+        orc.restaurar(3)
+    with pytest.raises(KeyError):
+        orc.diferencas(7)
+    for _ in range(10):
+        orc.desfazer()
+    assert orc.versao_atual == 8 and len(orc) == 8
+    assert orc.subtotal_centavos == 8 * item.centavos